@@ -0,0 +1,26 @@
+from datetime import date
+from fastapi import APIRouter, Depends, Query
+from sqlmodel import Session
+from typing import List, Optional
+
+from app.core.database import get_read_session
+from app.core.estadisticas import motor_estadisticas
+
+router = APIRouter(prefix="/estadisticas", tags=["Estadísticas"])
+
+@router.get("/")
+def consultar_estadisticas(
+    premio: Optional[str] = Query(None, description="Título del premio, ej. MAYOR"),
+    desde: Optional[date] = None,
+    hasta: Optional[date] = None,
+    cifras: int = Query(2, ge=1, le=4, description="Cifras finales para calientes, fríos y atrasados"),
+    top: int = Query(10, ge=1, le=100),
+    session: Session = Depends(get_read_session)
+):
+    motor_estadisticas.refrescar(session)
+    return motor_estadisticas.consultar(premio=premio, desde=desde, hasta=hasta, cifras=cifras, top=top)
+
+@router.get("/premios", response_model=List[str])
+def listar_premios_estadisticas(session: Session = Depends(get_read_session)):
+    motor_estadisticas.refrescar(session)
+    return motor_estadisticas.niveles()
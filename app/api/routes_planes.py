@@ -1,41 +1,139 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
+from starlette.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
 from sqlmodel import Session, select
-from typing import List
+from typing import List, Optional
 
-from app.core.database import get_session
+from app.core import config
+from app.core.cache import invalidar_catalogo
+from app.core.database import get_async_read_session, get_write_session, run_db
+from app.core.importacion import leer_csv, leer_json
+from app.core.http_cache import aplicar_encabezados, cache_control, calcular_etag, etag_coincide, no_modificado
+from app.core.paginacion import (
+    ENCABEZADO_CURSOR, LIMITE_MAXIMO, LIMITE_POR_DEFECTO, codificar_cursor, compactar, decodificar_cursor,
+    parsear_campos,
+)
+from app.crud import crud_plan, crud_version
 from app import models
 from app import schemas
 
 router = APIRouter(prefix="/planes", tags=["Planes"])
 
 @router.post("/", response_model=schemas.PlanRead)
-def crear_plan(plan_in: schemas.PlanCreate, session: Session = Depends(get_session)):
-    db_plan = models.PlanPremios(nombre=plan_in.nombre, descripcion=plan_in.descripcion)
-    session.add(db_plan)
+def crear_plan(plan_in: schemas.PlanCreate, session: Session = Depends(get_write_session)):
+    titulos = [p.titulo for p in plan_in.premios]
+    if len(set(titulos)) != len(titulos):
+        raise HTTPException(status_code=400, detail="Hay títulos de premio repetidos en el plan")
+
+    # Plan y premios en una sola transacción: si algo falla no queda un plan sin premios
+    plan = crud_plan.crear(session, [plan_in])[0]
+    crud_version.incrementar(session, "planes")
     session.commit()
-    session.refresh(db_plan)
+    invalidar_catalogo(plan["id"])
+    return plan
 
-    for premio_in in plan_in.premios:
-        db_premio = models.Premio(**premio_in.model_dump(), plan_id=db_plan.id)
-        session.add(db_premio)
+# --- IMPORTACIÓN MASIVA ---
+def _importar(session: Session, planes: List[schemas.PlanCreate]) -> dict:
+    # Todo el archivo en una transacción (un catálogo a medias es peor que ninguno), insertado
+    # en lotes de IMPORTACION_TAMANO_LOTE planes para acotar el tamaño de cada sentencia
+    ids, premios, lotes = [], 0, 0
+    try:
+        for inicio in range(0, len(planes), config.IMPORTACION_TAMANO_LOTE):
+            creados = crud_plan.crear(session, planes[inicio:inicio + config.IMPORTACION_TAMANO_LOTE])
+            ids += [p["id"] for p in creados]
+            premios += sum(len(p["premios"]) for p in creados)
+            lotes += 1
+        crud_version.incrementar(session, "planes")
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        raise HTTPException(status_code=500, detail=f"Error interno: {str(e)}")
+    invalidar_catalogo(*ids)
+    return {"ok": True, "planes": len(ids), "premios": premios, "lotes": lotes, "ids": ids}
 
-    session.commit()
-    session.refresh(db_plan)
-    return db_plan
+@router.post("/import", response_model=schemas.PlanImportRead)
+async def importar_planes(request: Request, session: Session = Depends(get_write_session)):
+    # El archivo va como cuerpo del request: Content-Type application/json (lista de planes o
+    # {"planes": [...]}) o text/csv con las columnas de app/core/importacion.COLUMNAS_CSV
+    tipo = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    contenido = await request.body()
+    if tipo == "text/csv":
+        planes, errores = leer_csv(contenido)
+    elif tipo in ("application/json", ""):
+        planes, errores = leer_json(contenido)
+    else:
+        raise HTTPException(status_code=415, detail="Use Content-Type application/json o text/csv")
+    if errores:
+        # Se valida el archivo completo antes de escribir: cualquier error rechaza la importación
+        raise HTTPException(status_code=400, detail={"message": "Importación rechazada", "errores": errores})
+    if not planes:
+        raise HTTPException(status_code=400, detail="El archivo no contiene planes")
+    return await run_in_threadpool(_importar, session, planes)
 
 @router.get("/", response_model=List[schemas.PlanRead])
-def listar_planes(session: Session = Depends(get_session)):
-    return session.exec(select(models.PlanPremios)).all()
+async def listar_planes(
+    request: Request,
+    response: Response,
+    limit: int = Query(LIMITE_POR_DEFECTO, ge=1, le=LIMITE_MAXIMO),
+    cursor: Optional[str] = Query(None, description=f"Valor del encabezado {ENCABEZADO_CURSOR} de la página anterior"),
+    campos: Optional[str] = Query(None, description="Campos separados por coma, ej. id,nombre (sin premios no se cargan)"),
+    premios: bool = Query(True, description="false devuelve los planes sin los premios anidados"),
+    compacto: bool = Query(False, description="Omite campos nulos y listas vacías"),
+    session: Session = Depends(get_async_read_session)
+):
+    # ETag = versión global de "planes" + parámetros del request. El 304 sale con una sola lectura, sin
+    # consultar las filas; a cambio, cualquier mutación de planes invalida todas las páginas y filtros.
+    version = (await run_db(session, crud_version.leer, "planes"))["planes"]
+    etag = calcular_etag("planes", version, request.url.query)
+    politica = cache_control(config.CACHE_MAX_AGE_CATALOGO)
+    if etag_coincide(request, etag):
+        return no_modificado(etag, politica)
+
+    columnas = parsear_campos(campos, crud_plan.COLUMNAS_PLAN)
+    if not premios:
+        columnas = [c for c in columnas or crud_plan.COLUMNAS_PLAN if c != "premios"]
+    id_cursor = decodificar_cursor(cursor, int)
+    planes = await run_db(
+        session,
+        crud_plan.listar_filas if config.JSON_RAPIDO else crud_plan.listar,
+        limite=limit + 1,
+        cursor=id_cursor[0] if id_cursor else None,
+        con_premios=not columnas or "premios" in columnas,
+    )
+
+    aplicar_encabezados(response, etag, politica)
+    if len(planes) > limit:
+        planes = planes[:limit]
+        ultimo = planes[-1]
+        response.headers[ENCABEZADO_CURSOR] = codificar_cursor(ultimo["id"] if config.JSON_RAPIDO else ultimo.id)
+
+    if config.JSON_RAPIDO:
+        if columnas:
+            planes = [{c: plan[c] for c in columnas} for plan in planes]
+        return ORJSONResponse(compactar(planes) if compacto else planes, headers=dict(response.headers))
+    if columnas or compacto:
+        if columnas:
+            datos = [{c: getattr(plan, c) for c in columnas} for plan in planes]
+            # Los premios con las claves de PremioRead, igual que la ruta rápida
+            for fila in datos:
+                if "premios" in fila:
+                    fila["premios"] = [schemas.PremioRead.model_validate(p) for p in fila["premios"]]
+        else:
+            datos = [schemas.PlanRead.model_validate(plan) for plan in planes]
+        datos = jsonable_encoder(datos)
+        return JSONResponse(compactar(datos) if compacto else datos, headers=dict(response.headers))
+    return planes
 
 @router.get("/{plan_id}", response_model=schemas.PlanRead)
-def obtener_plan(plan_id: int, session: Session = Depends(get_session)):
-    plan = session.get(models.PlanPremios, plan_id)
+async def obtener_plan(plan_id: int, session: Session = Depends(get_async_read_session)):
+    plan = await run_db(session, crud_plan.obtener, plan_id)
     if not plan:
         raise HTTPException(status_code=404, detail="Plan no encontrado")
     return plan
 
 @router.put("/{plan_id}", response_model=schemas.PlanRead)
-def actualizar_plan(plan_id: int, plan_in: schemas.PlanUpdate, session: Session = Depends(get_session)):
+def actualizar_plan(plan_id: int, plan_in: schemas.PlanUpdate, session: Session = Depends(get_write_session)):
     plan_db = session.get(models.PlanPremios, plan_id)
     if not plan_db:
         raise HTTPException(status_code=404, detail="Plan no encontrado")
@@ -45,12 +143,12 @@ def actualizar_plan(plan_id: int, plan_in: schemas.PlanUpdate, session: Session
         setattr(plan_db, key, value)
         
     session.add(plan_db)
+    crud_version.incrementar(session, "planes")
     session.commit()
-    session.refresh(plan_db)
-    return plan_db
+    return crud_plan.obtener(session, plan_id)
 
 @router.delete("/{plan_id}")
-def eliminar_plan(plan_id: int, session: Session = Depends(get_session)):
+def eliminar_plan(plan_id: int, session: Session = Depends(get_write_session)):
     plan_db = session.get(models.PlanPremios, plan_id)
     if not plan_db:
         raise HTTPException(status_code=404, detail="Plan no encontrado")
@@ -63,12 +161,10 @@ def eliminar_plan(plan_id: int, session: Session = Depends(get_session)):
         )
 
     try:
-        premios_asociados = session.exec(select(models.Premio).where(models.Premio.plan_id == plan_id)).all()
-        for premio in premios_asociados:
-            session.delete(premio)
-            
-        session.delete(plan_db)
+        crud_plan.eliminar(session, plan_id)
+        crud_version.incrementar(session, "planes")
         session.commit()
+        invalidar_catalogo(plan_id)
         return {"ok": True, "message": f"Plan {plan_id} y sus premios eliminados."}
     except Exception as e:
         session.rollback()
@@ -1,26 +1,48 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import Session, select
 
-from app.core.database import get_session
+from app.core.database import get_write_session
+from app.core.cache import invalidar_catalogo, invalidar_plan
+from app.core.estadisticas import motor_estadisticas
+from app.core.snapshots import publicar_sorteos
+from app.crud import crud_resumen, crud_version
 from app import models
 from app import schemas
 
 router = APIRouter(tags=["Premios"])
 
+def _guardar_premio(session: Session, db_premio: models.Premio):
+    # El índice único (plan_id, titulo) rechaza títulos repetidos dentro del plan
+    titulo = db_premio.titulo
+    session.add(db_premio)
+    try:
+        session.flush()
+    except IntegrityError:
+        session.rollback()
+        raise HTTPException(status_code=400, detail=f"Ya existe un premio '{titulo}' en este plan")
+
 @router.post("/planes/{plan_id}/premios", response_model=schemas.PremioRead)
-def agregar_premio(plan_id: int, premio_in: schemas.PremioCreate, session: Session = Depends(get_session)):
+def agregar_premio(plan_id: int, premio_in: schemas.PremioCreate, session: Session = Depends(get_write_session)):
     plan = session.get(models.PlanPremios, plan_id)
     if not plan:
         raise HTTPException(status_code=404, detail="Plan no encontrado")
     
     db_premio = models.Premio(**premio_in.model_dump(), plan_id=plan_id)
-    session.add(db_premio)
+    _guardar_premio(session, db_premio)
+    crud_version.incrementar(session, "planes")
     session.commit()
     session.refresh(db_premio)
+    invalidar_catalogo(plan_id)
     return db_premio
 
 @router.put("/premios/{premio_id}", response_model=schemas.PremioRead)
-def actualizar_premio(premio_id: int, premio_in: schemas.PremioUpdate, session: Session = Depends(get_session)):
+def actualizar_premio(
+    premio_id: int,
+    premio_in: schemas.PremioUpdate,
+    tareas: BackgroundTasks,
+    session: Session = Depends(get_write_session)
+):
     db_premio = session.get(models.Premio, premio_id)
     if not db_premio:
         raise HTTPException(status_code=404, detail="Premio no encontrado")
@@ -29,13 +51,21 @@ def actualizar_premio(premio_id: int, premio_in: schemas.PremioUpdate, session:
     for key, value in premio_data.items():
         setattr(db_premio, key, value)
         
-    session.add(db_premio)
+    _guardar_premio(session, db_premio)
+    crud_version.incrementar(session, "planes")
+    crud_resumen.reconstruir_plan(session, db_premio.plan_id)
     session.commit()
     session.refresh(db_premio)
+    # El título y el valor del premio aparecen en la consulta pública de todos los sorteos del plan
+    invalidar_plan(db_premio.plan_id)
+    invalidar_catalogo(db_premio.plan_id)
+    motor_estadisticas.invalidar()
+    # Cambian los resúmenes de todo el plan; el publicador solo reescribe los archivos afectados
+    tareas.add_task(publicar_sorteos)
     return db_premio
 
 @router.delete("/premios/{premio_id}")
-def eliminar_premio(premio_id: int, session: Session = Depends(get_session)):
+def eliminar_premio(premio_id: int, session: Session = Depends(get_write_session)):
     db_premio = session.get(models.Premio, premio_id)
     if not db_premio:
         raise HTTPException(status_code=404, detail="Premio no encontrado")
@@ -47,9 +77,12 @@ def eliminar_premio(premio_id: int, session: Session = Depends(get_session)):
             detail="No se puede eliminar este premio porque ya tiene resultados registrados en un sorteo."
         )
         
+    plan_id = db_premio.plan_id
     try:
         session.delete(db_premio)
+        crud_version.incrementar(session, "planes")
         session.commit()
+        invalidar_catalogo(plan_id)
         return {"ok": True, "message": "Premio eliminado exitosamente"}
     except Exception as e:
         session.rollback()
@@ -1,24 +1,30 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, Query
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import Session, select
 
-from app.core.database import get_session
+from app.core.database import get_write_session
+from app.core.cache import invalidar_sorteos
+from app.core.difusion import canal_sorteo, hub
+from app.core.estadisticas import motor_estadisticas
+from app.core.snapshots import publicar_sorteos
+from app.crud import crud_premio, crud_resumen, crud_sorteo
 from app import models
 from app import schemas
 
 router = APIRouter(prefix="/resultados", tags=["Resultados"])
 
 @router.post("/", response_model=schemas.ResultadoRead)
-def crear_resultado(resultado_in: schemas.ResultadoCreate, session: Session = Depends(get_session)):
+def crear_resultado(
+    resultado_in: schemas.ResultadoCreate,
+    tareas: BackgroundTasks,
+    session: Session = Depends(get_write_session)
+):
     sorteo = session.get(models.Sorteo, resultado_in.sorteo_id)
     if not sorteo:
         raise HTTPException(status_code=404, detail="Sorteo no encontrado")
 
-    statement = select(models.Premio).where(
-        models.Premio.plan_id == sorteo.plan_id,
-        models.Premio.titulo == resultado_in.premio_titulo
-    )
-    premio = session.exec(statement).first()
-
+    # El único acceso a la BD para validar es el sorteo; el premio sale del catálogo del plan
+    premio = crud_premio.buscar_por_titulo(session, sorteo.plan_id, resultado_in.premio_titulo)
     if not premio:
         raise HTTPException(status_code=404, detail=f"Premio '{resultado_in.premio_titulo}' no existe")
 
@@ -31,12 +37,31 @@ def crear_resultado(resultado_in: schemas.ResultadoCreate, session: Session = De
         numeros_ganadores=resultado_in.numeros_ganadores
     )
     session.add(db_resultado)
+    try:
+        session.flush()
+    except IntegrityError:
+        session.rollback()
+        raise HTTPException(status_code=400, detail=f"Premio '{premio.titulo}' ya tiene resultado en este sorteo")
+    # El evento se arma antes del commit, mientras sorteo y premio siguen cargados
+    numero_sorteo = sorteo.numero_sorteo
+    evento = crud_sorteo.resultado_publico(db_resultado, premio)
+    crud_resumen.reconstruir(session, [sorteo])
     session.commit()
     session.refresh(db_resultado)
+    invalidar_sorteos(numero_sorteo)
+    motor_estadisticas.marcar_nuevos()
+    hub.publicar(canal_sorteo(numero_sorteo), evento.model_dump(mode="json"))
+    # Corrección de un sorteo ya cerrado: su snapshot estático se regenera después de responder
+    tareas.add_task(publicar_sorteos, [numero_sorteo])
     return db_resultado
 
 @router.delete("/{sorteo_id}/{premio_id}")
-def eliminar_resultado(sorteo_id: int, premio_id: int, session: Session = Depends(get_session)):
+def eliminar_resultado(
+    sorteo_id: int,
+    premio_id: int,
+    tareas: BackgroundTasks,
+    session: Session = Depends(get_write_session)
+):
     statement = select(models.Resultado).where(
         models.Resultado.sorteo_id == sorteo_id,
         models.Resultado.premio_id == premio_id
@@ -44,17 +69,31 @@ def eliminar_resultado(sorteo_id: int, premio_id: int, session: Session = Depend
     resultado = session.exec(statement).first()
     if not resultado:
         raise HTTPException(status_code=404, detail="Resultado no encontrado")
+    sorteo = resultado.sorteo
+    numero_sorteo = sorteo.numero_sorteo
     session.delete(resultado)
+    crud_resumen.reconstruir(session, [sorteo])
     session.commit()
+    invalidar_sorteos(numero_sorteo)
+    motor_estadisticas.invalidar()
+    tareas.add_task(publicar_sorteos, [numero_sorteo])
     return {"ok": True, "message": "Resultado eliminado"}
 
 @router.put("/{sorteo_id}/{premio_id}", response_model=schemas.ResultadoRead)
 def actualizar_resultado(
     sorteo_id: int,
     premio_id: int,
+    tareas: BackgroundTasks,
     numeros_nuevos: str = Query(...),
-    session: Session = Depends(get_session)
+    session: Session = Depends(get_write_session)
 ):
+    sorteo = session.get(models.Sorteo, sorteo_id)
+    premio = crud_premio.buscar_por_id(session, sorteo.plan_id, premio_id) if sorteo else None
+    if not premio:
+        raise HTTPException(status_code=404, detail="Resultado no encontrado para editar")
+    if len(numeros_nuevos) < premio.cantidad_balotas:
+        raise HTTPException(status_code=400, detail="Faltan cifras.")
+
     statement = select(models.Resultado).where(
         models.Resultado.sorteo_id == sorteo_id,
         models.Resultado.premio_id == premio_id
@@ -63,12 +102,15 @@ def actualizar_resultado(
     if not resultado:
         raise HTTPException(status_code=404, detail="Resultado no encontrado para editar")
 
-    premio = session.get(models.Premio, premio_id)
-    if len(numeros_nuevos) < premio.cantidad_balotas:
-        raise HTTPException(status_code=400, detail="Faltan cifras.")
-
+    numero_sorteo = sorteo.numero_sorteo
     resultado.numeros_ganadores = numeros_nuevos
     session.add(resultado)
+    evento = crud_sorteo.resultado_publico(resultado, premio)
+    crud_resumen.reconstruir(session, [sorteo])
     session.commit()
     session.refresh(resultado)
+    invalidar_sorteos(numero_sorteo)
+    motor_estadisticas.invalidar()
+    hub.publicar(canal_sorteo(numero_sorteo), evento.model_dump(mode="json"))
+    tareas.add_task(publicar_sorteos, [numero_sorteo])
     return resultado
\ No newline at end of file
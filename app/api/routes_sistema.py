@@ -0,0 +1,80 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.admision import estadisticas_admision
+from app.core.arranque import arranque
+from app.core.cache import CACHES
+from app.core.coalescencia import vuelos
+from app.core.database import estadisticas_pools
+from app.core.metricas import registro
+
+router = APIRouter(tags=["Sistema"])
+
+@router.get("/sistema/cache")
+def estadisticas_cache():
+    return {nombre: cache.estadisticas() for nombre, cache in CACHES.items()}
+
+@router.get("/sistema/pool")
+def estadisticas_pool():
+    return estadisticas_pools()
+
+@router.get("/sistema/arranque")
+def estadisticas_arranque():
+    return arranque.estadisticas()
+
+@router.get("/sistema/carga")
+def estadisticas_carga():
+    return {"coalescencia": vuelos.estadisticas(), "admision": {"rechazos": estadisticas_admision.rechazos}}
+
+# --- FORMATO PROMETHEUS ---
+@router.get("/metrics", response_class=PlainTextResponse)
+def metricas_prometheus():
+    lineas = registro.exponer()
+
+    lineas += [
+        "# HELP cache_hits_total Aciertos por caché",
+        "# TYPE cache_hits_total counter",
+    ]
+    estadisticas = {nombre: cache.estadisticas() for nombre, cache in CACHES.items()}
+    for nombre, datos in estadisticas.items():
+        lineas.append(f'cache_hits_total{{cache="{nombre}"}} {datos["hits"]}')
+    lineas += ["# HELP cache_misses_total Fallos por caché", "# TYPE cache_misses_total counter"]
+    for nombre, datos in estadisticas.items():
+        lineas.append(f'cache_misses_total{{cache="{nombre}"}} {datos["misses"]}')
+    lineas += ["# HELP cache_entries Entradas en memoria por caché", "# TYPE cache_entries gauge"]
+    for nombre, datos in estadisticas.items():
+        lineas.append(f'cache_entries{{cache="{nombre}"}} {datos["entradas"]}')
+
+    pools = estadisticas_pools()
+    metricas_pool = [
+        ("db_pool_checked_out", "gauge", "en_uso", "Conexiones en uso"),
+        ("db_pool_waiting", "gauge", "esperando", "Requests esperando una conexión"),
+        ("db_pool_overflow", "gauge", "overflow_en_uso", "Conexiones de overflow en uso"),
+        ("db_pool_checkouts_total", "counter", "checkouts", "Conexiones entregadas por el pool"),
+        ("db_pool_timeouts_total", "counter", "timeouts", "Checkouts que agotaron el timeout"),
+        ("db_pool_wait_seconds_total", "counter", "espera_total_segundos", "Tiempo total esperando una conexión"),
+    ]
+    for nombre, tipo, campo, ayuda in metricas_pool:
+        lineas += [f"# HELP {nombre} {ayuda}", f"# TYPE {nombre} {tipo}"]
+        for motor, datos in pools.items():
+            if campo in datos:
+                lineas.append(f'{nombre}{{engine="{motor}"}} {datos[campo]}')
+
+    vuelo = vuelos.estadisticas()
+    lineas += [
+        "# HELP coalescencia_cargas_total Cargas ejecutadas por single-flight",
+        "# TYPE coalescencia_cargas_total counter",
+        f"coalescencia_cargas_total {vuelo['ejecutadas']}",
+        "# HELP coalescencia_compartidas_total Requests que reutilizaron una carga en curso",
+        "# TYPE coalescencia_compartidas_total counter",
+        f"coalescencia_compartidas_total {vuelo['compartidas']}",
+        "# HELP admision_rechazos_total Requests rechazados con 503 por saturación del pool",
+        "# TYPE admision_rechazos_total counter",
+        f"admision_rechazos_total {estadisticas_admision.rechazos}",
+    ]
+
+    lineas += ["# HELP app_arranque_segundos Duración de cada fase del arranque", "# TYPE app_arranque_segundos gauge"]
+    for fase, segundos in arranque.fases.items():
+        lineas.append(f'app_arranque_segundos{{fase="{fase}"}} {round(segundos, 6)}')
+
+    return PlainTextResponse("\n".join(lineas) + "\n", media_type="text/plain; version=0.0.4")
@@ -1,93 +1,383 @@
-from fastapi import APIRouter, HTTPException, Depends
-from sqlmodel import Session, select
-from typing import List
+import asyncio
+import json
+from datetime import date
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session
+from typing import List, Literal, Optional
 
-from app.core.database import get_session
+from app.core.database import get_async_read_session, get_write_session, run_db, run_db_aislado
+from app.core import config
+from app.core.cache import cache_indices, cache_publico, invalidar_sorteos
+from app.core.coalescencia import vuelos
+from app.core.difusion import canal_sorteo, hub
+from app.core.estadisticas import motor_estadisticas
+from app.core.exportacion import exportar_csv, exportar_ndjson
+from app.core.indice_ganadores import IndiceGanadores
+from app.core.http_cache import (
+    aplicar_encabezados, cache_control, cache_control_sorteo, calcular_etag, etag_coincide, no_modificado
+)
+from app.core.snapshots import publicar_sorteos
+from app.core.paginacion import (
+    ENCABEZADO_CURSOR, LIMITE_MAXIMO, LIMITE_POR_DEFECTO, codificar_cursor, compactar, decodificar_cursor,
+    parsear_campos,
+)
+from app.crud import crud_premio, crud_resultado, crud_resumen, crud_sorteo, crud_version
 from app import models
 from app import schemas
 
 router = APIRouter(prefix="/sorteos", tags=["Sorteos"])
 
+# Lecturas del resumen público que se repiten si una invalidación llega mientras se leía
+INTENTOS_CARGA = 3
+
 @router.post("/", response_model=schemas.SorteoRead)
-def crear_sorteo(sorteo_in: schemas.SorteoCreate, session: Session = Depends(get_session)):
+def crear_sorteo(sorteo_in: schemas.SorteoCreate, session: Session = Depends(get_write_session)):
     db_sorteo = models.Sorteo.model_validate(sorteo_in)
     session.add(db_sorteo)
+    crud_version.incrementar(session, "sorteos")
+    crud_resumen.reconstruir(session, [db_sorteo])
     session.commit()
     session.refresh(db_sorteo)
+    invalidar_sorteos(db_sorteo.numero_sorteo)
     return db_sorteo
 
 @router.get("/", response_model=List[schemas.SorteoRead])
-def listar_sorteos(session: Session = Depends(get_session)):
-    return session.exec(select(models.Sorteo)).all()
+async def listar_sorteos(
+    request: Request,
+    response: Response,
+    limit: int = Query(LIMITE_POR_DEFECTO, ge=1, le=LIMITE_MAXIMO),
+    cursor: Optional[str] = Query(None, description=f"Valor del encabezado {ENCABEZADO_CURSOR} de la página anterior"),
+    desde: Optional[date] = None,
+    hasta: Optional[date] = None,
+    plan_id: Optional[int] = None,
+    campos: Optional[str] = Query(None, description="Columnas separadas por coma, ej. id,numero_sorteo"),
+    orden: Literal["asc", "desc"] = "asc",
+    compacto: bool = Query(False, description="Omite campos nulos"),
+    session: Session = Depends(get_async_read_session)
+):
+    # ETag = versión global de "sorteos" + parámetros del request. El 304 sale con una sola lectura, sin
+    # consultar las filas; a cambio, cualquier mutación de sorteos invalida todas las páginas y filtros.
+    version = (await run_db(session, crud_version.leer, "sorteos"))["sorteos"]
+    etag = calcular_etag("sorteos", version, request.url.query)
+    politica = cache_control(config.CACHE_MAX_AGE_CATALOGO)
+    if etag_coincide(request, etag):
+        return no_modificado(etag, politica)
+
+    columnas = parsear_campos(campos, crud_sorteo.COLUMNAS_SORTEO)
+    filas = await run_db(
+        session,
+        crud_sorteo.listar,
+        limite=limit + 1,
+        cursor=decodificar_cursor(cursor, date.fromisoformat, int),
+        desde=desde,
+        hasta=hasta,
+        plan_id=plan_id,
+        columnas=columnas or crud_sorteo.COLUMNAS_SORTEO,
+        descendente=orden == "desc",
+    )
+
+    aplicar_encabezados(response, etag, politica)
+    if len(filas) > limit:
+        filas = filas[:limit]
+        response.headers[ENCABEZADO_CURSOR] = codificar_cursor(filas[-1]["fecha"], filas[-1]["id"])
+
+    if columnas:
+        filas = [{c: fila[c] for c in columnas} for fila in filas]
+    if compacto:
+        filas = compactar(filas)
+    if config.JSON_RAPIDO:
+        # Las filas ya son dicts de tipos simples: van directo a orjson sin pasar por SorteoRead
+        return ORJSONResponse(filas, headers=dict(response.headers))
+    if columnas or compacto:
+        return JSONResponse(jsonable_encoder(filas), headers=dict(response.headers))
+    return filas
+
+# --- EXPORTACIÓN DEL HISTÓRICO ---
+# Debe declararse antes de /{sorteo_id} para que "export" no se tome como un id
+@router.get("/export", tags=["Consulta Pública"])
+def exportar_sorteos(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    desde: Optional[date] = None,
+    hasta: Optional[date] = None,
+    plan_id: Optional[int] = None,
+):
+    statement = crud_sorteo.consulta_exportacion(desde=desde, hasta=hasta, plan_id=plan_id)
+    if format == "csv":
+        contenido, media_type = exportar_csv(statement), "text/csv; charset=utf-8"
+    else:
+        contenido, media_type = exportar_ndjson(statement), "application/x-ndjson"
+    return StreamingResponse(
+        contenido,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="sorteos.{format}"'}
+    )
 
 @router.get("/{sorteo_id}", response_model=schemas.SorteoRead)
-def obtener_sorteo(sorteo_id: int, session: Session = Depends(get_session)):
-    sorteo = session.get(models.Sorteo, sorteo_id)
+async def obtener_sorteo(sorteo_id: int, session: Session = Depends(get_async_read_session)):
+    sorteo = await run_db(session, Session.get, models.Sorteo, sorteo_id)
     if not sorteo:
         raise HTTPException(status_code=404, detail="Sorteo no encontrado")
     return sorteo
 
 @router.put("/{sorteo_id}", response_model=schemas.SorteoRead)
-def actualizar_sorteo(sorteo_id: int, sorteo_in: schemas.SorteoUpdate, session: Session = Depends(get_session)):
+def actualizar_sorteo(
+    sorteo_id: int,
+    sorteo_in: schemas.SorteoUpdate,
+    tareas: BackgroundTasks,
+    session: Session = Depends(get_write_session)
+):
     sorteo = session.get(models.Sorteo, sorteo_id)
     if not sorteo:
         raise HTTPException(status_code=404, detail="Sorteo no encontrado")
-        
+
+    numero_anterior = sorteo.numero_sorteo
     sorteo_data = sorteo_in.model_dump(exclude_unset=True)
     for key, value in sorteo_data.items():
         setattr(sorteo, key, value)
         
     session.add(sorteo)
+    crud_version.incrementar(session, "sorteos")
+    crud_resumen.reconstruir(session, [sorteo])
     session.commit()
     session.refresh(sorteo)
+    invalidar_sorteos(numero_anterior, sorteo.numero_sorteo)
+    motor_estadisticas.invalidar()
+    # Un cambio de número o de fecha puede retirar el snapshot anterior o publicar uno nuevo
+    tareas.add_task(publicar_sorteos, {numero_anterior, sorteo.numero_sorteo})
     return sorteo
 
 @router.delete("/{sorteo_id}")
-def eliminar_sorteo(sorteo_id: int, session: Session = Depends(get_session)):
+def eliminar_sorteo(sorteo_id: int, tareas: BackgroundTasks, session: Session = Depends(get_write_session)):
     db_sorteo = session.get(models.Sorteo, sorteo_id)
     if not db_sorteo:
         raise HTTPException(status_code=404, detail="Sorteo no encontrado")
 
+    numero_sorteo = db_sorteo.numero_sorteo
     try:
-        statement_res = select(models.Resultado).where(models.Resultado.sorteo_id == sorteo_id)
-        resultados_asociados = session.exec(statement_res).all()
-        for res in resultados_asociados:
-            session.delete(res)
-
-        session.delete(db_sorteo)
+        crud_sorteo.eliminar(session, [sorteo_id])
+        crud_version.incrementar(session, "sorteos")
         session.commit()
+        invalidar_sorteos(numero_sorteo)
+        motor_estadisticas.invalidar()
+        tareas.add_task(publicar_sorteos, [numero_sorteo])
         return {"ok": True, "message": f"Sorteo {sorteo_id} eliminado."}
     except Exception as e:
         session.rollback()
         raise HTTPException(status_code=500, detail=f"Error interno: {str(e)}")
 
+# --- PURGA DE HISTÓRICO ---
+@router.delete("/")
+def purgar_sorteos(
+    tareas: BackgroundTasks,
+    antes_de: date = Query(..., description="Se eliminan los sorteos con fecha anterior a esta"),
+    lote: int = Query(config.PURGA_TAMANO_LOTE, ge=1, le=10000),
+    session: Session = Depends(get_write_session)
+):
+    # Cada lote es una transacción corta; si la purga se interrumpe, lo ya borrado queda confirmado
+    total, lotes = 0, 0
+    while True:
+        sorteos = crud_sorteo.lote_anterior_a(session, antes_de, lote)
+        if not sorteos:
+            break
+        try:
+            total += crud_sorteo.eliminar(session, [s[0] for s in sorteos])
+            crud_version.incrementar(session, "sorteos")
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            raise HTTPException(status_code=500, detail=f"Error interno tras {total} sorteos eliminados: {str(e)}")
+        lotes += 1
+        invalidar_sorteos(*[s[1] for s in sorteos])
+
+    if total:
+        motor_estadisticas.invalidar()
+        # Recorrido completo: retira del directorio estático los sorteos purgados
+        tareas.add_task(publicar_sorteos)
+    return {"ok": True, "eliminados": total, "lotes": lotes}
+
+# --- PUBLICACIÓN MASIVA DE RESULTADOS ---
+@router.post("/{sorteo_id}/resultados:bulk", response_model=List[schemas.ResultadoRead], tags=["Resultados"])
+def publicar_resultados_masivo(
+    sorteo_id: int,
+    lote: schemas.ResultadoBulkCreate,
+    tareas: BackgroundTasks,
+    session: Session = Depends(get_write_session)
+):
+    # Un lote vacío no cambia nada: se rechaza antes de reconstruir, invalidar o difundir
+    if not lote.resultados:
+        raise HTTPException(status_code=400, detail="El lote no contiene resultados")
+    sorteo = session.get(models.Sorteo, sorteo_id)
+    if not sorteo:
+        raise HTTPException(status_code=404, detail="Sorteo no encontrado")
+
+    filas, errores = crud_resultado.validar_masivo(session, sorteo, lote.resultados)
+    if errores:
+        # Si un solo item falla se rechaza el lote completo
+        raise HTTPException(status_code=400, detail={"message": "Lote rechazado", "errores": errores})
+
+    numero_sorteo = sorteo.numero_sorteo
+    try:
+        insertados = crud_resultado.insertar_masivo(session, filas)
+        # Se serializa antes del commit para no recargar cada fila expirada
+        resultados = [schemas.ResultadoRead.model_validate(r) for r in insertados]
+        # Los premios salen del catálogo en memoria que ya usó la validación
+        catalogo = crud_premio.obtener_catalogo(session, sorteo.plan_id)
+        eventos = [crud_sorteo.resultado_publico(r, catalogo.por_id[r.premio_id]) for r in insertados]
+        crud_resumen.reconstruir(session, [sorteo])
+        session.commit()
+    except IntegrityError:
+        # Otra publicación concurrente ganó la carrera por el mismo premio
+        session.rollback()
+        raise HTTPException(status_code=400, detail="Lote rechazado: algún premio ya tiene resultado en este sorteo")
+    except Exception as e:
+        session.rollback()
+        raise HTTPException(status_code=500, detail=f"Error interno: {str(e)}")
+
+    invalidar_sorteos(numero_sorteo)
+    motor_estadisticas.marcar_nuevos()
+    hub.publicar_lote(canal_sorteo(numero_sorteo), [evento.model_dump(mode="json") for evento in eventos])
+    tareas.add_task(publicar_sorteos, [numero_sorteo])
+    return resultados
+
 # --- CONSULTA PÚBLICA ---
-@router.get("/{numero_sorteo}/publico", response_model=schemas.SorteoPublicoRead, tags=["Consulta Pública"])
-def consultar_resultados_publico(numero_sorteo: str, session: Session = Depends(get_session)):
-    statement = select(models.Sorteo).where(models.Sorteo.numero_sorteo == numero_sorteo)
-    sorteo = session.exec(statement).first()
+def _leer_publico(session: Session, numero_sorteo: str):
+    # Una sola fila del resumen precalculado; si aún no existe (histórico sin backfill) se arma con el join
+    resumen = crud_resumen.obtener(session, numero_sorteo)
+    if resumen:
+        return resumen.contenido, resumen.fecha, resumen.plan_id
+    sorteo = crud_sorteo.obtener_por_numero(session, numero_sorteo)
     if not sorteo:
+        return None, None, None
+    publico = crud_sorteo.construir_sorteo_publico(session, sorteo)
+    return publico.model_dump_json(), sorteo.fecha, sorteo.plan_id
+
+async def _cargar_publico(numero_sorteo: str):
+    # Una sola carga por sorteo aunque lleguen cientos de requests a la vez (ver _vuelo_publico).
+    # Si hubo una invalidación durante la lectura, lo leído puede ser anterior al cambio: se descarta
+    # y se vuelve a leer (hasta INTENTOS_CARGA veces; el último intento se sirve pero no se guarda)
+    for _ in range(INTENTOS_CARGA):
+        generacion = cache_publico.generacion
+        contenido, _, plan_id = await run_db_aislado(_leer_publico, numero_sorteo)
+        if cache_publico.generacion == generacion:
+            break
+    if contenido is None:
+        return None
+    # El ETag sale del contenido: cambia exactamente cuando cambia lo que se sirve
+    entrada = (calcular_etag("publico", contenido), schemas.SorteoPublicoRead.model_validate_json(contenido), contenido)
+    cache_publico.guardar(numero_sorteo, entrada, etiqueta=plan_id, generacion=generacion)
+    return entrada, plan_id
+
+def _vuelo_publico(numero_sorteo: str):
+    # La generación va en la clave: un request posterior a una invalidación no se une a una carga anterior
+    clave = ("publico", numero_sorteo, cache_publico.generacion)
+    return vuelos.ejecutar(clave, lambda: _cargar_publico(numero_sorteo))
+
+async def _publico_de(numero_sorteo: str):
+    cacheado = cache_publico.obtener(numero_sorteo)
+    if cacheado is not None:
+        return cacheado
+    cargado = await _vuelo_publico(numero_sorteo)
+    if cargado is None:
         raise HTTPException(status_code=404, detail="Sorteo no encontrado")
+    return cargado[0]
+
+@router.get("/{numero_sorteo}/publico", response_model=schemas.SorteoPublicoRead, tags=["Consulta Pública"])
+async def consultar_resultados_publico(numero_sorteo: str, request: Request, response: Response):
+    etag, publico, contenido = await _publico_de(numero_sorteo)
+    politica = cache_control_sorteo(publico.fecha)
+    if etag_coincide(request, etag):
+        return no_modificado(etag, politica)
+
+    aplicar_encabezados(response, etag, politica)
+    if config.JSON_RAPIDO:
+        # El resumen ya es el JSON final: se envía tal cual, sin validar ni volver a serializar
+        return Response(contenido, media_type="application/json", headers=dict(response.headers))
+    return publico
 
-    query = (
-        select(models.Resultado, models.Premio)
-        .where(models.Resultado.sorteo_id == sorteo.id)
-        .join(models.Premio)
+# --- VERIFICACIÓN DE BILLETES ---
+async def _construir_indice(numero_sorteo: str) -> Optional[IndiceGanadores]:
+    generacion = cache_indices.generacion
+    # El resumen suele estar ya en cache_publico (lo leyó /publico): solo se va a la BD si falta
+    etiquetado = cache_publico.obtener_con_etiqueta(numero_sorteo)
+    if etiquetado is None:
+        etiquetado = await _vuelo_publico(numero_sorteo)
+        if etiquetado is None:
+            return None
+    (_, publico, _), plan_id = etiquetado
+    indice = IndiceGanadores(publico, config.CIFRAS_NUMERO)
+    cache_indices.guardar(numero_sorteo, indice, etiqueta=plan_id, generacion=generacion)
+    return indice
+
+async def _obtener_indice(numero_sorteo: str) -> IndiceGanadores:
+    # El índice se construye la primera vez que se consulta y se descarta cuando cambian los resultados
+    indice = cache_indices.obtener(numero_sorteo)
+    if indice is None:
+        clave = ("indice", numero_sorteo, cache_indices.generacion)
+        indice = await vuelos.ejecutar(clave, lambda: _construir_indice(numero_sorteo))
+    if indice is None:
+        raise HTTPException(status_code=404, detail="Sorteo no encontrado")
+    return indice
+
+def _verificar_billete(indice: IndiceGanadores, billete: schemas.BilleteConsulta) -> schemas.VerificacionRead:
+    premios = indice.verificar(billete.numero, billete.serie)
+    return schemas.VerificacionRead(
+        numero=billete.numero,
+        serie=billete.serie,
+        ganador=bool(premios),
+        premios=premios
     )
-    data = session.exec(query).all()
-
-    lista_resultados = [
-        schemas.ResultadoPublico(
-            id=res.id,              
-            premio_id=prem.id,      
-            premio=prem.titulo,
-            valor=prem.valor,
-            numero_ganador=res.numeros_ganadores
+
+@router.get("/{numero_sorteo}/verificar", response_model=schemas.VerificacionRead, tags=["Consulta Pública"])
+async def verificar_billete(
+    numero_sorteo: str,
+    numero: str = Query(..., pattern=r"^\s*\d+\s*$"),
+    serie: Optional[str] = Query(None, pattern=r"^\s*\d+\s*$"),
+):
+    indice = await _obtener_indice(numero_sorteo)
+    return _verificar_billete(indice, schemas.BilleteConsulta(numero=numero, serie=serie))
+
+@router.post("/{numero_sorteo}/verificar", response_model=schemas.VerificacionLoteRead, tags=["Consulta Pública"])
+async def verificar_billetes_lote(
+    numero_sorteo: str,
+    lote: schemas.VerificacionLoteCreate,
+):
+    if len(lote.billetes) > config.MAX_BILLETES_POR_LOTE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Máximo {config.MAX_BILLETES_POR_LOTE} billetes por consulta"
         )
-        for res, prem in data
-    ]
-    return schemas.SorteoPublicoRead(
-        numero_sorteo=sorteo.numero_sorteo,
-        fecha=sorteo.fecha,
-        resultados=lista_resultados
-    )
\ No newline at end of file
+
+    indice = await _obtener_indice(numero_sorteo)
+    resultados = [_verificar_billete(indice, billete) for billete in lote.billetes]
+    return schemas.VerificacionLoteRead(
+        numero_sorteo=numero_sorteo,
+        ganadores=sum(1 for r in resultados if r.ganador),
+        resultados=resultados
+    )
+
+# --- TRANSMISIÓN EN VIVO ---
+@router.get("/{numero_sorteo}/stream", tags=["Consulta Pública"])
+async def transmitir_resultados(numero_sorteo: str, request: Request):
+    # Server-Sent Events: cada resultado confirmado se envía a todos los suscriptores sin consultar la BD
+    async def eventos():
+        async with hub.suscribir(canal_sorteo(numero_sorteo)) as cola:
+            yield ": conectado\n\n"
+            while True:
+                try:
+                    datos = await asyncio.wait_for(cola.get(), timeout=config.SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    # Comentario SSE para que proxies y balanceadores no cierren la conexión
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: resultado\ndata: {json.dumps(datos, ensure_ascii=False)}\n\n"
+
+    return StreamingResponse(
+        eventos(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
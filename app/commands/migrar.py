@@ -0,0 +1,25 @@
+import argparse
+import logging
+
+from app.core.database import engine
+from app.core.esquema import VERSION_ESPERADA, migrar, version_actual
+
+# Aplica las migraciones pendientes. Se corre una vez por despliegue, antes de arrancar la app.
+# Uso: python -m app.commands.migrar [--estado]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aplica las migraciones pendientes del esquema")
+    parser.add_argument("--estado", action="store_true", help="Solo muestra la versión actual")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    version = version_actual(engine)
+    print(f"Esquema en la versión {version} de {VERSION_ESPERADA}")
+    if args.estado or version >= VERSION_ESPERADA:
+        return
+    print(f"Esquema migrado a la versión {migrar(engine)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import argparse
+
+from sqlmodel import Session
+
+from app.core import config
+from app.core.database import engine
+from app.core.esquema import verificar_esquema
+from app.core.snapshots import publicar
+
+# Publica (o actualiza) los snapshots estáticos de todos los sorteos cerrados.
+# Uso: python -m app.commands.publicar_snapshots --dir /var/www/snapshots
+#
+# Conviene correrlo a diario (cron): un sorteo pasa a cerrado por el paso del tiempo, sin que
+# ninguna mutación lo dispare. Solo se reescriben los archivos cuyo contenido cambió.
+# Requiere la tabla de resúmenes al día (python -m app.commands.reconstruir_resumenes).
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Publica los sorteos cerrados como archivos estáticos")
+    parser.add_argument("--dir", default=config.SNAPSHOT_DIR, help="Directorio destino (por defecto SNAPSHOT_DIR)")
+    parser.add_argument("--forzar", action="store_true", help="Reescribe todos los archivos aunque no hayan cambiado")
+    args = parser.parse_args()
+    if not args.dir:
+        parser.error("Indique --dir o defina SNAPSHOT_DIR")
+
+    verificar_esquema(engine)
+    config.SNAPSHOT_DIR = args.dir
+    with Session(engine) as session:
+        conteo = publicar(session, forzar=args.forzar)
+    print(
+        f"Listo en {args.dir}: {conteo['escritos']} escritos, {conteo['sin_cambios']} sin cambios, "
+        f"{conteo['retirados']} retirados, índice {'actualizado' if conteo['indice_actualizado'] else 'sin cambios'}"
+    )
+
+
+if __name__ == "__main__":
+    main()
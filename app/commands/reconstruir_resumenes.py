@@ -0,0 +1,46 @@
+import argparse
+
+from sqlmodel import Session
+
+from app.core import config
+from app.core.cache import limpiar_sorteos
+from app.core.database import engine
+from app.core.esquema import verificar_esquema
+from app.crud import crud_resumen
+
+# Backfill de la tabla de resúmenes públicos para el histórico existente.
+# Uso: python -m app.commands.reconstruir_resumenes --lote 500
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconstruye los resúmenes públicos de todos los sorteos")
+    parser.add_argument("--lote", type=int, default=500, help="Sorteos por transacción")
+    args = parser.parse_args()
+
+    verificar_esquema(engine)
+    ultimo_id, total = 0, 0
+    while True:
+        # Un commit por lote: la transacción se mantiene corta y el proceso se puede reanudar
+        with Session(engine) as session:
+            ids = crud_resumen.reconstruir_lote(session, ultimo_id, args.lote)
+            session.commit()
+        if not ids:
+            break
+        ultimo_id = ids[-1]
+        total += len(ids)
+        print(f"{total} sorteos procesados (último id {ultimo_id})")
+
+    print(f"Listo: {total} resúmenes reconstruidos")
+    # Las cachés viven en cada worker: desde este proceso solo se alcanzan por el backend de difusión
+    if config.DIFUSION_BACKEND == "postgres":
+        limpiar_sorteos()
+        print("Se pidió a los workers vaciar sus cachés de sorteos (LISTEN/NOTIFY)")
+    else:
+        print(
+            "Aviso: las cachés de la app NO se vaciaron (DIFUSION_BACKEND=local no llega a otros procesos). "
+            f"Se renuevan solas en {config.PUBLIC_CACHE_TTL_SECONDS:.0f} s o al reiniciar los workers."
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+from app.core import config
+from app.core.database import cola_pools
+
+# Rutas de operación: deben responder justo cuando el servicio está saturado
+_EXENTAS = ("/metrics", "/sistema/")
+
+_CUERPO_503 = b'{"detail":"Servicio saturado, reintente en unos segundos"}'
+
+
+class EstadisticasAdmision:
+    def __init__(self):
+        self.rechazos = 0
+
+
+estadisticas_admision = EstadisticasAdmision()
+
+
+class AdmisionMiddleware:
+    # Rechaza con 503 + Retry-After cuando la cola del pool supera ADMISION_MAX_COLA_DB:
+    # es mejor fallar rápido y que el cliente reintente que acumular requests hasta el timeout
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or config.ADMISION_MAX_COLA_DB <= 0
+            or scope["path"].startswith(_EXENTAS)
+            or cola_pools() <= config.ADMISION_MAX_COLA_DB
+        ):
+            return await self.app(scope, receive, send)
+
+        estadisticas_admision.rechazos += 1
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(_CUERPO_503)).encode()),
+                (b"retry-after", str(config.ADMISION_RETRY_AFTER_SECONDS).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": _CUERPO_503})
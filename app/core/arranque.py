@@ -0,0 +1,47 @@
+import logging
+import time
+from typing import Dict
+
+# Tiempos del arranque en frío por fase. app/main.py importa este módulo antes que cualquier otro
+# para que la primera fase cubra las importaciones; por eso aquí no se importa nada pesado.
+
+logger = logging.getLogger("app.arranque")
+
+
+class TiemposArranque:
+    def __init__(self):
+        self._ultima = time.perf_counter()
+        self.fases: Dict[str, float] = {}
+        self.listo = False
+
+    def marcar(self, fase: str):
+        # Duración desde la marca anterior
+        ahora = time.perf_counter()
+        self.fases[fase] = ahora - self._ultima
+        self._ultima = ahora
+
+    def reiniciar(self):
+        # El lifespan puede correr mucho después de importar (uvicorn --reload, tests): se mide aparte
+        self._ultima = time.perf_counter()
+
+    def terminar(self, fase: str):
+        self.marcar(fase)
+        self.listo = True
+        logger.info(
+            "Arranque en %.1f ms (%s)",
+            self.total() * 1000,
+            ", ".join(f"{nombre} {segundos * 1000:.1f} ms" for nombre, segundos in self.fases.items()),
+        )
+
+    def total(self) -> float:
+        return sum(self.fases.values())
+
+    def estadisticas(self) -> dict:
+        return {
+            "listo": self.listo,
+            "total_ms": round(self.total() * 1000, 2),
+            "fases_ms": {nombre: round(segundos * 1000, 2) for nombre, segundos in self.fases.items()},
+        }
+
+
+arranque = TiemposArranque()
@@ -0,0 +1,168 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Hashable, Iterable, Optional
+
+from app.core import config
+from app.core.difusion import CANAL_RECONEXION, hub
+
+
+class CacheTTL:
+    # Caché LRU acotada con expiración por tiempo.
+    # Cada entrada puede llevar una etiqueta (ej. plan_id) para invalidar en grupo.
+
+    def __init__(self, max_entradas: int, ttl_segundos: float):
+        self.max_entradas = max_entradas
+        self.ttl_segundos = ttl_segundos
+        self._datos: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Se incrementa en cada invalidación; evita guardar valores leídos antes de un cambio
+        self._generacion = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def generacion(self) -> int:
+        return self._generacion
+
+    def obtener(self, clave: Hashable) -> Optional[Any]:
+        encontrado = self.obtener_con_etiqueta(clave)
+        return None if encontrado is None else encontrado[0]
+
+    def obtener_con_etiqueta(self, clave: Hashable) -> Optional[tuple]:
+        # (valor, etiqueta), para quien necesita guardar algo derivado con la misma etiqueta
+        with self._lock:
+            entrada = self._datos.get(clave)
+            if entrada is None:
+                self.misses += 1
+                return None
+            expira, valor, etiqueta = entrada
+            if expira < time.monotonic():
+                del self._datos[clave]
+                self.misses += 1
+                return None
+            self._datos.move_to_end(clave)
+            self.hits += 1
+            return valor, etiqueta
+
+    def guardar(self, clave: Hashable, valor: Any, etiqueta: Hashable = None, generacion: Optional[int] = None):
+        if self.max_entradas <= 0:
+            return
+        with self._lock:
+            # Si hubo una invalidación mientras se leía de la BD, el valor puede estar obsoleto
+            if generacion is not None and generacion != self._generacion:
+                return
+            self._datos[clave] = (time.monotonic() + self.ttl_segundos, valor, etiqueta)
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.max_entradas:
+                self._datos.popitem(last=False)
+
+    def invalidar(self, *claves: Hashable):
+        with self._lock:
+            self._generacion += 1
+            for clave in claves:
+                self._datos.pop(clave, None)
+
+    def invalidar_etiqueta(self, etiqueta: Hashable):
+        with self._lock:
+            self._generacion += 1
+            for clave in [c for c, (_, _, e) in self._datos.items() if e == etiqueta]:
+                del self._datos[clave]
+
+    def limpiar(self):
+        with self._lock:
+            self._generacion += 1
+            self._datos.clear()
+
+    def estadisticas(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entradas": len(self._datos),
+                "max_entradas": self.max_entradas,
+                "ttl_segundos": self.ttl_segundos,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            }
+
+
+# Cachés derivadas de los resultados de un sorteo: clave = numero_sorteo, etiqueta = plan_id
+cache_publico = CacheTTL(config.PUBLIC_CACHE_MAX_ENTRIES, config.PUBLIC_CACHE_TTL_SECONDS)
+cache_indices = CacheTTL(config.INDICE_CACHE_MAX_ENTRIES, config.PUBLIC_CACHE_TTL_SECONDS)
+
+CACHES_SORTEO = {"publico": cache_publico, "indices": cache_indices}
+
+# Premios por plan para validar resultados: clave = plan_id
+cache_catalogos = CacheTTL(config.CATALOGO_CACHE_MAX_ENTRIES, config.CATALOGO_CACHE_TTL_SECONDS)
+
+# Todas las cachés, para estadísticas
+CACHES = {**CACHES_SORTEO, "catalogos": cache_catalogos}
+
+
+# --- INVALIDACIÓN ENTRE WORKERS ---
+# Cada worker tiene sus propias cachés: las invalidaciones se aplican aquí y se difunden por el hub
+# para que los demás workers también las apliquen. Con DIFUSION_BACKEND=local no salen del proceso,
+# así que varios workers solo quedan coherentes con DIFUSION_BACKEND=postgres.
+CANAL_INVALIDACION = "cache:invalidar"
+# Identifica a este proceso: no se vuelve a aplicar lo que uno mismo difundió
+ORIGEN = uuid.uuid4().hex
+# pg_notify acepta mensajes de hasta 8000 bytes: con más claves se vacían las cachés del tipo
+MAX_CLAVES_MENSAJE = 100
+
+
+def _aplicar(accion: str, claves: Iterable[Hashable]):
+    if accion == "sorteos":
+        for cache in CACHES_SORTEO.values():
+            cache.invalidar(*claves)
+    elif accion == "planes":
+        # Cambios en títulos o valores de premios afectan a todos los sorteos del plan
+        for cache in CACHES_SORTEO.values():
+            for plan_id in claves:
+                cache.invalidar_etiqueta(plan_id)
+    elif accion == "catalogos":
+        cache_catalogos.invalidar(*claves)
+    elif accion == "sorteos:todo":
+        for cache in CACHES_SORTEO.values():
+            cache.limpiar()
+    elif accion == "catalogos:todo":
+        cache_catalogos.limpiar()
+    elif accion == "todo":
+        for cache in CACHES.values():
+            cache.limpiar()
+
+
+def _difundir(accion: str, claves: Iterable[Hashable] = ()):
+    claves = list(claves)
+    if len(claves) > MAX_CLAVES_MENSAJE:
+        accion, claves = ("sorteos:todo" if accion in ("sorteos", "planes") else accion + ":todo"), []
+    _aplicar(accion, claves)
+    hub.publicar(CANAL_INVALIDACION, {"origen": ORIGEN, "accion": accion, "claves": claves})
+
+
+def _recibir(datos: dict):
+    if datos.get("origen") != ORIGEN:
+        _aplicar(datos["accion"], datos["claves"])
+
+
+hub.escuchar(CANAL_INVALIDACION, _recibir)
+# Las invalidaciones difundidas durante un corte del backend se perdieron: se vacía todo
+hub.escuchar(CANAL_RECONEXION, lambda datos: _aplicar("todo", []))
+
+
+def invalidar_sorteos(*numeros_sorteo: str):
+    _difundir("sorteos", numeros_sorteo)
+
+
+def invalidar_plan(plan_id: int):
+    _difundir("planes", [plan_id])
+
+
+def invalidar_catalogo(*plan_ids: int):
+    _difundir("catalogos", plan_ids)
+
+
+def limpiar_sorteos():
+    # Vacía las cachés de sorteos de todos los workers (ej. tras reconstruir los resúmenes)
+    _difundir("sorteos:todo")
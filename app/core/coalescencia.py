@@ -0,0 +1,47 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class VueloUnico:
+    # Single-flight: mientras una carga con cierta clave está en curso, los requests que piden
+    # la misma clave esperan ese resultado en vez de repetir la consulta.
+    # Vale por worker (un event loop); entre workers el alivio lo dan las cachés.
+    # Para cargas que alimentan una CacheTTL, la clave debe incluir su generación: así quien llega
+    # después de una invalidación arranca una carga nueva en vez de esperar una que leyó datos viejos.
+
+    def __init__(self):
+        self._en_vuelo: Dict[Hashable, asyncio.Task] = {}
+        self.ejecutadas = 0
+        self.compartidas = 0
+
+    async def ejecutar(self, clave: Hashable, cargar: Callable[[], Awaitable[T]]) -> T:
+        tarea = self._en_vuelo.get(clave)
+        if tarea is not None:
+            self.compartidas += 1
+        else:
+            self.ejecutadas += 1
+            # La carga corre en su propia tarea: si el request que la inició se cancela
+            # (cliente desconectado), los demás igual reciben el resultado
+            tarea = asyncio.ensure_future(cargar())
+            self._en_vuelo[clave] = tarea
+            tarea.add_done_callback(lambda t: self._terminar(clave, t))
+        return await asyncio.shield(tarea)
+
+    def _terminar(self, clave: Hashable, tarea: asyncio.Task):
+        if self._en_vuelo.get(clave) is tarea:
+            del self._en_vuelo[clave]
+        # Marca la excepción como recuperada aunque todos los que esperaban se hayan ido
+        if not tarea.cancelled():
+            tarea.exception()
+
+    def estadisticas(self) -> dict:
+        return {
+            "en_vuelo": len(self._en_vuelo),
+            "ejecutadas": self.ejecutadas,
+            "compartidas": self.compartidas,
+        }
+
+
+vuelos = VueloUnico()
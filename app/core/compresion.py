@@ -0,0 +1,183 @@
+import zlib
+from typing import Optional
+
+from app.core import config
+
+# brotli es opcional: sin el paquete solo se negocia gzip
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Tipos que no vale la pena comprimir o que no deben retenerse en un buffer (SSE)
+_EXCLUIDOS = ("text/event-stream", "image/", "video/", "audio/", "application/zip", "application/gzip")
+
+# En streaming se vacía el compresor tras el primer bloque (el cliente recibe bytes en cuanto la
+# app tiene el primer lote) y luego cada tantos bytes sin comprimir: sin esto nada sale hasta que
+# se llena la ventana del compresor, y cada vaciado extra empeora la razón de compresión
+VACIADO_BYTES = 64 * 1024
+
+
+def _elegir_codificacion(accept_encoding: str) -> Optional[str]:
+    # Respeta los q-values del cliente; ante empate se prefiere br por comprimir más
+    aceptadas = {}
+    for parte in accept_encoding.lower().split(","):
+        nombre, _, parametros = parte.strip().partition(";")
+        calidad = 1.0
+        if parametros.strip().startswith("q="):
+            try:
+                calidad = float(parametros.strip()[2:])
+            except ValueError:
+                calidad = 0.0
+        aceptadas[nombre.strip()] = calidad
+
+    opciones = []
+    if brotli is not None:
+        opciones.append("br")
+    opciones.append("gzip")
+    comodin = aceptadas.get("*", 0.0)
+    mejor, mejor_calidad = None, 0.0
+    for opcion in opciones:
+        calidad = aceptadas.get(opcion, comodin)
+        if calidad > mejor_calidad:
+            mejor, mejor_calidad = opcion, calidad
+    return mejor
+
+
+class _Compresor:
+    def __init__(self, codificacion: str):
+        self.codificacion = codificacion
+        if codificacion == "br":
+            self._br = brotli.Compressor(quality=config.COMPRESION_NIVEL_BROTLI)
+        else:
+            # wbits=31: formato gzip (encabezado + CRC) en vez de zlib crudo
+            self._gz = zlib.compressobj(config.COMPRESION_NIVEL_GZIP, zlib.DEFLATED, 31)
+        self._vaciado = False
+        self._sin_vaciar = 0
+
+    def comprimir(self, datos: bytes) -> bytes:
+        if self.codificacion == "br":
+            return self._br.process(datos)
+        return self._gz.compress(datos)
+
+    def comprimir_bloque(self, datos: bytes) -> bytes:
+        # Un bloque de una respuesta en streaming
+        salida = self.comprimir(datos)
+        self._sin_vaciar += len(datos)
+        if not self._vaciado or self._sin_vaciar >= VACIADO_BYTES:
+            salida += self._br.flush() if self.codificacion == "br" else self._gz.flush(zlib.Z_SYNC_FLUSH)
+            self._vaciado = True
+            self._sin_vaciar = 0
+        return salida
+
+    def terminar(self) -> bytes:
+        if self.codificacion == "br":
+            return self._br.finish()
+        return self._gz.flush(zlib.Z_FINISH)
+
+
+class CompresionMiddleware:
+    # Comprime con br o gzip según Accept-Encoding. Las respuestas completas por debajo de
+    # COMPRESION_MIN_BYTES se envían tal cual; las de streaming (export) se comprimen por bloque.
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        encabezados = dict(scope["headers"])
+        codificacion = _elegir_codificacion(encabezados.get(b"accept-encoding", b"").decode("latin-1"))
+        if codificacion is None:
+            return await self.app(scope, receive, send)
+
+        inicio = None
+        compresor = None
+        directo = False
+
+        async def send_comprimido(mensaje):
+            nonlocal inicio, compresor, directo
+            if mensaje["type"] == "http.response.start":
+                # Se retiene hasta ver el primer bloque del cuerpo y decidir si se comprime
+                inicio = mensaje
+                return
+            if mensaje["type"] != "http.response.body" or directo:
+                return await send(mensaje)
+
+            cuerpo = mensaje.get("body", b"")
+            hay_mas = mensaje.get("more_body", False)
+
+            if compresor is None:
+                if not _comprimible(inicio, cuerpo, hay_mas):
+                    directo = True
+                    if inicio["status"] == 304:
+                        inicio = _validar_304(inicio, encabezados.get(b"if-none-match", b""))
+                    await send(inicio)
+                    return await send(mensaje)
+
+                compresor = _Compresor(codificacion)
+                cabeceras = [
+                    (k, v) for k, v in inicio["headers"] if k.lower() not in (b"content-length", b"etag")
+                ]
+                cabeceras.append((b"content-encoding", codificacion.encode()))
+                cabeceras.append((b"vary", b"Accept-Encoding"))
+                etag = _encabezado(inicio, b"etag")
+                if etag:
+                    # Otra representación del mismo recurso: el ETag pasa a ser débil
+                    cabeceras.append((b"etag", _debil(etag)))
+                if not hay_mas:
+                    comprimido = compresor.comprimir(cuerpo) + compresor.terminar()
+                    cabeceras.append((b"content-length", str(len(comprimido)).encode()))
+                    await send({**inicio, "headers": cabeceras})
+                    return await send({"type": "http.response.body", "body": comprimido})
+                await send({**inicio, "headers": cabeceras})
+
+            if hay_mas:
+                datos = compresor.comprimir_bloque(cuerpo)
+            else:
+                datos = compresor.comprimir(cuerpo) + compresor.terminar()
+            if hay_mas and not datos:
+                return
+            await send({"type": "http.response.body", "body": datos, "more_body": hay_mas})
+
+        await self.app(scope, receive, send_comprimido)
+
+
+def _encabezado(inicio, nombre: bytes) -> Optional[bytes]:
+    for k, v in inicio["headers"]:
+        if k.lower() == nombre:
+            return v
+    return None
+
+
+def _debil(etag: bytes) -> bytes:
+    return etag if etag.startswith(b"W/") else b"W/" + etag
+
+
+def _validar_304(inicio, if_none_match: bytes):
+    # Un 304 debe llevar el mismo ETag que llevaría el 200. La app lo emite fuerte; si el 200 se
+    # habría enviado comprimido (el cliente validó con la forma débil que recibió) se debilita igual.
+    # Un "*" no dice qué representación tiene el cliente: se asume la comprimida, la habitual.
+    etag = _encabezado(inicio, b"etag")
+    if not etag or etag.startswith(b"W/"):
+        return inicio
+    candidatos = [c.strip() for c in if_none_match.split(b",")]
+    if _debil(etag) not in candidatos and b"*" not in candidatos:
+        return inicio
+    cabeceras = [(k, v) for k, v in inicio["headers"] if k.lower() != b"etag"]
+    cabeceras.append((b"etag", _debil(etag)))
+    cabeceras.append((b"vary", b"Accept-Encoding"))
+    return {**inicio, "headers": cabeceras}
+
+
+def _comprimible(inicio, cuerpo: bytes, hay_mas: bool) -> bool:
+    if inicio["status"] < 200 or inicio["status"] in (204, 304):
+        return False
+    if _encabezado(inicio, b"content-encoding"):
+        return False
+    tipo = (_encabezado(inicio, b"content-type") or b"").decode("latin-1")
+    if tipo.startswith(_EXCLUIDOS):
+        return False
+    # Las respuestas de streaming no tienen tamaño conocido: siempre se comprimen
+    return hay_mas or len(cuerpo) >= config.COMPRESION_MIN_BYTES
@@ -0,0 +1,108 @@
+import os
+
+# Configuración leída de variables de entorno.
+# Cada valor tiene un default pensado para desarrollo local.
+
+# --- BASE DE DATOS ---
+# Modo asíncrono opcional (AsyncEngine) para las rutas de lectura.
+# Requiere asyncpg (Postgres) o aiosqlite (SQLite). Con SQLite es más lento que el modo síncrono
+# (ver benchmarks/bench_async.py); solo tiene sentido con Postgres en red, midiendo antes.
+DB_ASYNC = os.environ.get("DB_ASYNC", "0").lower() in ("1", "true", "yes")
+
+# Pool de conexiones (aplica a los motores sync y async)
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", "30"))
+# Segundos antes de reciclar una conexión; evita usar conexiones que el servidor ya cerró
+DB_POOL_RECYCLE = int(os.environ.get("DB_POOL_RECYCLE", "1800"))
+# Verifica la conexión antes de entregarla (un SELECT 1 extra por checkout)
+DB_POOL_PRE_PING = os.environ.get("DB_POOL_PRE_PING", "1").lower() in ("1", "true", "yes")
+
+# Las migraciones se aplican con `python -m app.commands.migrar`; al arrancar solo se verifica la versión.
+# Con 1 la app migra sola si encuentra el esquema atrasado (útil en desarrollo local).
+DB_MIGRAR_AL_INICIAR = os.environ.get("DB_MIGRAR_AL_INICIAR", "0").lower() in ("1", "true", "yes")
+
+# Con réplica de lectura (DATABASE_READ_URL), segundos durante los que las lecturas siguen yendo a la
+# base principal después de una mutación; debe cubrir el atraso normal de la réplica.
+DB_LECTURA_PRIMARIO_SECONDS = float(os.environ.get("DB_LECTURA_PRIMARIO_SECONDS", "5"))
+
+# --- CACHÉ DE CONSULTA PÚBLICA ---
+# Cantidad máxima de sorteos guardados y segundos de vida de cada entrada
+PUBLIC_CACHE_MAX_ENTRIES = int(os.environ.get("PUBLIC_CACHE_MAX_ENTRIES", "256"))
+PUBLIC_CACHE_TTL_SECONDS = float(os.environ.get("PUBLIC_CACHE_TTL_SECONDS", "300"))
+
+# --- CATÁLOGO DE PREMIOS ---
+# Premios de cada plan en memoria para validar resultados sin consultar la BD.
+# Cada worker invalida su copia al modificar premios; el TTL acota lo que tarda en verlo otro worker.
+CATALOGO_CACHE_MAX_ENTRIES = int(os.environ.get("CATALOGO_CACHE_MAX_ENTRIES", "64"))
+CATALOGO_CACHE_TTL_SECONDS = float(os.environ.get("CATALOGO_CACHE_TTL_SECONDS", "300"))
+
+# --- VERIFICACIÓN DE BILLETES ---
+# Índices de números ganadores en memoria (uno por sorteo)
+INDICE_CACHE_MAX_ENTRIES = int(os.environ.get("INDICE_CACHE_MAX_ENTRIES", "64"))
+# Cifras del número del billete; el resto del número ganador es la serie
+CIFRAS_NUMERO = int(os.environ.get("CIFRAS_NUMERO", "4"))
+MAX_BILLETES_POR_LOTE = int(os.environ.get("MAX_BILLETES_POR_LOTE", "10000"))
+
+# --- ETAG / CACHE-CONTROL ---
+# Un sorteo se considera cerrado cuando su fecha tiene más de SORTEO_DIAS_CIERRE días
+SORTEO_DIAS_CIERRE = int(os.environ.get("SORTEO_DIAS_CIERRE", "2"))
+CACHE_MAX_AGE_SORTEO_CERRADO = int(os.environ.get("CACHE_MAX_AGE_SORTEO_CERRADO", "86400"))
+CACHE_MAX_AGE_SORTEO_ABIERTO = int(os.environ.get("CACHE_MAX_AGE_SORTEO_ABIERTO", "0"))
+CACHE_MAX_AGE_CATALOGO = int(os.environ.get("CACHE_MAX_AGE_CATALOGO", "0"))
+
+# --- MÉTRICAS ---
+# Requests más lentos que este umbral se registran con sus sentencias SQL (0 = desactivado)
+SLOW_REQUEST_MS = float(os.environ.get("SLOW_REQUEST_MS", "0"))
+
+# --- TRANSMISIÓN EN VIVO (SSE) ---
+# "local": eventos solo dentro del proceso. "postgres": LISTEN/NOTIFY para compartirlos entre workers.
+# También lleva las invalidaciones de caché (app/core/cache.py): con más de un worker use "postgres"
+DIFUSION_BACKEND = os.environ.get("DIFUSION_BACKEND", "local")
+SSE_KEEPALIVE_SECONDS = float(os.environ.get("SSE_KEEPALIVE_SECONDS", "15"))
+SSE_MAX_PENDIENTES = int(os.environ.get("SSE_MAX_PENDIENTES", "100"))
+# Espera máxima entre reintentos cuando se cae la conexión de LISTEN (backoff exponencial desde 1 s)
+DIFUSION_REINTENTO_MAX_SECONDS = float(os.environ.get("DIFUSION_REINTENTO_MAX_SECONDS", "30"))
+
+# --- ESTADÍSTICAS ---
+# Cada cuánto se buscan resultados nuevos hechos por otros workers, y cada cuánto se reconstruye todo
+ESTADISTICAS_REFRESCO_SECONDS = float(os.environ.get("ESTADISTICAS_REFRESCO_SECONDS", "60"))
+ESTADISTICAS_RECONSTRUIR_SECONDS = float(os.environ.get("ESTADISTICAS_RECONSTRUIR_SECONDS", "3600"))
+# La carga incremental vuelve a leer los últimos N ids ya cargados: un id bajo puede confirmarse
+# después de uno más alto (transacciones concurrentes) y quedaría fuera de "id > último cargado"
+ESTADISTICAS_VENTANA_IDS = int(os.environ.get("ESTADISTICAS_VENTANA_IDS", "1000"))
+
+# --- CONTROL DE ADMISIÓN ---
+# Con más de esta cantidad de requests esperando una conexión del pool se responde 503 de inmediato
+# en vez de encolar más trabajo (0 = desactivado). Retry-After indica cuándo reintentar.
+ADMISION_MAX_COLA_DB = int(os.environ.get("ADMISION_MAX_COLA_DB", "0"))
+ADMISION_RETRY_AFTER_SECONDS = int(os.environ.get("ADMISION_RETRY_AFTER_SECONDS", "1"))
+
+# --- SERIALIZACIÓN ---
+# Ruta rápida opcional para las lecturas más frecuentes: orjson y bytes armados directo desde
+# las filas de la BD, sin validar contra el response_model (los datos ya se validaron al escribirse).
+JSON_RAPIDO = os.environ.get("JSON_RAPIDO", "0").lower() in ("1", "true", "yes")
+
+# --- COMPRESIÓN ---
+# gzip o brotli (si está instalado) según Accept-Encoding; respuestas más chicas que el umbral van sin comprimir.
+# Desactivar si un proxy o CDN delante de la app ya comprime.
+COMPRESION_ACTIVA = os.environ.get("COMPRESION_ACTIVA", "1").lower() in ("1", "true", "yes")
+COMPRESION_MIN_BYTES = int(os.environ.get("COMPRESION_MIN_BYTES", "1024"))
+COMPRESION_NIVEL_GZIP = int(os.environ.get("COMPRESION_NIVEL_GZIP", "6"))
+COMPRESION_NIVEL_BROTLI = int(os.environ.get("COMPRESION_NIVEL_BROTLI", "4"))
+
+# --- SNAPSHOTS ESTÁTICOS ---
+# Directorio donde se publican los sorteos cerrados como archivos JSON precomprimidos (.gz/.br)
+# para que nginx o un CDN los sirvan sin pasar por la app (vacío = desactivado).
+# Se comprime una sola vez por sorteo, así que se usa el nivel máximo.
+SNAPSHOT_DIR = os.environ.get("SNAPSHOT_DIR", "")
+SNAPSHOT_NIVEL_GZIP = int(os.environ.get("SNAPSHOT_NIVEL_GZIP", "9"))
+SNAPSHOT_NIVEL_BROTLI = int(os.environ.get("SNAPSHOT_NIVEL_BROTLI", "11"))
+
+# --- IMPORTACIÓN DE PLANES ---
+# Planes insertados por sentencia en POST /planes/import; todo el archivo va en una sola transacción
+IMPORTACION_TAMANO_LOTE = int(os.environ.get("IMPORTACION_TAMANO_LOTE", "200"))
+
+# --- PURGA DE HISTÓRICO ---
+# Sorteos borrados por transacción: lotes pequeños mantienen los bloqueos cortos
+PURGA_TAMANO_LOTE = int(os.environ.get("PURGA_TAMANO_LOTE", "500"))
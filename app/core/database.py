@@ -1,25 +1,193 @@
 import os
-from sqlmodel import SQLModel, create_engine, Session
+import time
+from typing import Any, Callable, TypeVar, Union
+
+from fastapi import Request, Response
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool, StaticPool
+from sqlmodel import create_engine, Session
+
+from app.core import config
+from app.core.pool import crear_pool_medido, estadisticas_pool
+
+T = TypeVar("T")
 
 # 1. Obtenemos la URL de la variable de entorno
 # Si no existe (desarrollo local), usará SQLite por defecto
 database_url = os.environ.get("DATABASE_URL", "sqlite:///./loteria.db")
 
+# Réplica de lectura opcional: las rutas GET la usan; vacía = todo va a la base principal
+read_database_url = os.environ.get("DATABASE_READ_URL", "")
+
 # 2. FIX CRÍTICO PARA RENDER: 
 # Render entrega URLs que empiezan con 'postgres://', 
 # pero SQLAlchemy requiere 'postgresql://'
-if database_url and database_url.startswith("postgres://"):
-    database_url = database_url.replace("postgres://", "postgresql://", 1)
+def _normalizar_url(url: str) -> str:
+    if url and url.startswith("postgres://"):
+        return url.replace("postgres://", "postgresql://", 1)
+    return url
+
+database_url = _normalizar_url(database_url)
+read_database_url = _normalizar_url(read_database_url)
 
 # 3. Configuración del motor (engine)
 # El check_same_thread es solo para SQLite
-connect_args = {"check_same_thread": False} if "sqlite" in database_url else {}
+def _connect_args(url: str) -> dict:
+    return {"check_same_thread": False} if "sqlite" in url else {}
+
+connect_args = _connect_args(database_url)
+
+def _opciones_pool(clase_base, url: str = database_url):
+    # SQLite en memoria: una sola conexión compartida por todos los hilos (cada conexión nueva sería
+    # otra base vacía); lo usan los tests
+    if url in ("sqlite://", "sqlite:///:memory:"):
+        return {"poolclass": StaticPool}, None
+    poolclass, metricas = crear_pool_medido(clase_base)
+    return {
+        "poolclass": poolclass,
+        "pool_size": config.DB_POOL_SIZE,
+        "max_overflow": config.DB_MAX_OVERFLOW,
+        "pool_timeout": config.DB_POOL_TIMEOUT,
+        "pool_recycle": config.DB_POOL_RECYCLE,
+        "pool_pre_ping": config.DB_POOL_PRE_PING,
+    }, metricas
+
+opciones, metricas_pool = _opciones_pool(QueuePool)
+engine = create_engine(database_url, connect_args=connect_args, **opciones)
+
+# Sin réplica, el motor de lectura es el mismo objeto que el principal
+read_engine = engine
+metricas_pool_lectura = None
+if read_database_url:
+    opciones_lectura, metricas_pool_lectura = _opciones_pool(QueuePool, read_database_url)
+    read_engine = create_engine(read_database_url, connect_args=_connect_args(read_database_url), **opciones_lectura)
+
+# 4. Motor asíncrono opcional (DB_ASYNC=1)
+# Las rutas de lectura lo usan para no ocupar un hilo del threadpool mientras esperan a la BD.
+# Las mutaciones (admin, poco tráfico) siguen usando el motor síncrono.
+def _async_url(url: str) -> str:
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    if url.startswith("sqlite://"):
+        return url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    return url
+
+async_engine = None
+async_read_engine = None
+metricas_pool_async = None
+metricas_pool_async_lectura = None
+if config.DB_ASYNC:
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from sqlmodel.ext.asyncio.session import AsyncSession
+
+    opciones_async, metricas_pool_async = _opciones_pool(AsyncAdaptedQueuePool)
+    async_engine = create_async_engine(_async_url(database_url), **opciones_async)
+    async_read_engine = async_engine
+    if read_database_url:
+        opciones_async_lectura, metricas_pool_async_lectura = _opciones_pool(AsyncAdaptedQueuePool, read_database_url)
+        async_read_engine = create_async_engine(_async_url(read_database_url), **opciones_async_lectura)
+
+_METRICAS_POOLS = (metricas_pool, metricas_pool_lectura, metricas_pool_async, metricas_pool_async_lectura)
 
-engine = create_engine(database_url, connect_args=connect_args)
+def cola_pools() -> int:
+    # Requests esperando una conexión en cualquiera de los motores; lo usa el control de admisión
+    return sum(m.esperando for m in _METRICAS_POOLS if m is not None)
 
-def create_db_and_tables():
-    SQLModel.metadata.create_all(engine)
+def estadisticas_pools() -> dict:
+    datos = {}
+    if metricas_pool is not None:
+        datos["sync"] = estadisticas_pool(engine, metricas_pool)
+    if metricas_pool_lectura is not None:
+        datos["sync_lectura"] = estadisticas_pool(read_engine, metricas_pool_lectura)
+    if async_engine is not None and metricas_pool_async is not None:
+        datos["async"] = estadisticas_pool(async_engine.sync_engine, metricas_pool_async)
+    if async_read_engine is not None and metricas_pool_async_lectura is not None:
+        datos["async_lectura"] = estadisticas_pool(async_read_engine.sync_engine, metricas_pool_async_lectura)
+    return datos
 
-def get_session():
+# --- LEER LO PROPIO ---
+# La réplica puede ir unos segundos atrasada. Después de una mutación las lecturas vuelven a la
+# base principal durante DB_LECTURA_PRIMARIO_SECONDS: en todo el worker (así las cachés recién
+# invalidadas no se rellenan con datos viejos) y para el cliente que escribió, vía cookie,
+# aunque su siguiente request lo atienda otro worker.
+COOKIE_ESCRITURA = "loteria_escritura"
+_ultima_escritura = float("-inf")
+
+def _marcar_escritura(conexion):
+    global _ultima_escritura
+    _ultima_escritura = time.monotonic()
+
+# Se registra siempre (es solo guardar un número): sin réplica, _leer_del_primario no lo consulta
+event.listen(engine, "commit", _marcar_escritura)
+
+def _leer_del_primario(request: Request = None) -> bool:
+    if read_engine is engine:
+        return True
+    if time.monotonic() - _ultima_escritura < config.DB_LECTURA_PRIMARIO_SECONDS:
+        return True
+    return request is not None and COOKIE_ESCRITURA in request.cookies
+
+def motor_lectura(request: Request = None):
+    # Para lecturas fuera de una dependencia (exportación, cargas compartidas)
+    return engine if _leer_del_primario(request) else read_engine
+
+class SesionLectura(Session):
+    # Sesión de las rutas GET: rechaza cualquier escritura antes de llegar a la base
+    # (contra una réplica fallaría de todos modos, y solo después de haber hecho el trabajo)
+    def flush(self, objects=None):
+        if self.new or self.dirty or self.deleted:
+            raise RuntimeError("Sesión de solo lectura: las mutaciones deben usar get_write_session")
+        super().flush(objects)
+
+def get_write_session(response: Response):
+    if read_engine is not engine:
+        response.set_cookie(
+            COOKIE_ESCRITURA, "1", max_age=max(1, int(config.DB_LECTURA_PRIMARIO_SECONDS)),
+            httponly=True, samesite="lax",
+        )
     with Session(engine) as session:
-        yield session
\ No newline at end of file
+        yield session
+
+def get_read_session(request: Request):
+    with SesionLectura(motor_lectura(request)) as session:
+        yield session
+
+# Dependencia de lectura para las rutas async: en modo síncrono entrega una SesionLectura normal
+if async_engine is not None:
+    async def get_async_read_session(request: Request):
+        motor = async_engine if _leer_del_primario(request) else async_read_engine
+        async with AsyncSession(motor, sync_session_class=SesionLectura) as session:
+            yield session
+else:
+    get_async_read_session = get_read_session
+
+def _unidad_de_trabajo(session: Session, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    # La conexión vuelve al pool apenas termina la consulta, no al final del request:
+    # así un request que espera otro hilo del threadpool no retiene una conexión
+    try:
+        return fn(session, *args, **kwargs)
+    finally:
+        session.close()
+
+async def run_db(session: Union[Session, "AsyncSession"], fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    # Ejecuta una función de app/crud (que recibe una Session) sin bloquear el event loop:
+    # en modo async corre sobre la conexión asíncrona, en modo sync en el threadpool.
+    # Los objetos devueltos quedan desasociados de la sesión; sus relaciones deben venir precargadas.
+    if async_engine is not None:
+        return await session.run_sync(_unidad_de_trabajo, fn, *args, **kwargs)
+    return await run_in_threadpool(_unidad_de_trabajo, session, fn, *args, **kwargs)
+
+def _en_sesion_nueva(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    with SesionLectura(motor_lectura()) as session:
+        return fn(session, *args, **kwargs)
+
+async def run_db_aislado(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    # Como run_db pero con una sesión de lectura propia, no la del request: la usan las consultas
+    # compartidas entre varios requests (app/core/coalescencia.py), que pueden sobrevivir al request
+    # que las inició. Solo cuenta la ventana del worker: el resultado lo reciben varios clientes.
+    if async_engine is not None:
+        motor = async_engine if _leer_del_primario() else async_read_engine
+        async with AsyncSession(motor, sync_session_class=SesionLectura) as session:
+            return await session.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(_en_sesion_nueva, fn, *args, **kwargs)
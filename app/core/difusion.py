@@ -0,0 +1,231 @@
+import asyncio
+import json
+import logging
+import select
+import threading
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Dict, List, Set, Tuple
+
+from app.core import config
+
+logger = logging.getLogger("app.difusion")
+
+Entregar = Callable[[str, dict], None]
+
+# Lo entrega un backend al recuperar la conexión: los eventos del corte se perdieron
+CANAL_RECONEXION = "difusion:reconectado"
+
+
+# --- BACKENDS DE FAN-OUT ---
+# Un backend recibe lo que publica este proceso y llama `entregar` en cada proceso suscrito.
+
+class BackendLocal:
+    # Todo queda en el proceso actual (desarrollo, tests, un solo worker)
+
+    def __init__(self):
+        self.entregar: Entregar = lambda canal, datos: None
+
+    def iniciar(self, entregar: Entregar):
+        self.entregar = entregar
+
+    def detener(self):
+        pass
+
+    def publicar(self, canal: str, lote: List[dict]):
+        for datos in lote:
+            self.entregar(canal, datos)
+
+
+class BackendPostgres:
+    # Comparte eventos entre workers con LISTEN/NOTIFY sobre la misma base de datos
+
+    CANAL = "loteria_eventos"
+    # pg_notify rechaza mensajes de 8000 bytes o más: los lotes se parten por debajo de ese tamaño
+    MAX_BYTES_MENSAJE = 7900
+    ESPERA_INICIAL = 1.0
+
+    def __init__(self, engine):
+        self.engine = engine
+        self._detener = threading.Event()
+        self._hilo = None
+
+    def iniciar(self, entregar: Entregar):
+        self.entregar = entregar
+        self._hilo = threading.Thread(target=self._escuchar, name="difusion-postgres", daemon=True)
+        self._hilo.start()
+
+    def detener(self):
+        self._detener.set()
+        if self._hilo is not None:
+            self._hilo.join(timeout=5)
+
+    def publicar(self, canal: str, lote: List[dict]):
+        from sqlalchemy import text
+
+        # Todos los NOTIFY en una transacción y una sola llamada; cada uno lleva tantos eventos como quepan
+        mensajes = [{"canal": self.CANAL, "mensaje": m} for m in self.mensajes(canal, lote)]
+        if not mensajes:
+            return
+        with self.engine.connect() as conexion:
+            conexion.execute(text("SELECT pg_notify(:canal, :mensaje)"), mensajes)
+            conexion.commit()
+
+    @classmethod
+    def mensajes(cls, canal: str, lote: List[dict]) -> List[str]:
+        # json.dumps escapa todo a ASCII: el largo en caracteres es el largo en bytes
+        cabecera = json.dumps({"canal": canal, "lote": []})[:-3]
+        mensajes, actual, tamano = [], [], len(cabecera) + 3
+        for datos in lote:
+            evento = json.dumps(datos)
+            if actual and tamano + len(evento) + 1 > cls.MAX_BYTES_MENSAJE:
+                mensajes.append(cabecera + "[" + ",".join(actual) + "]}")
+                actual, tamano = [], len(cabecera) + 3
+            actual.append(evento)
+            tamano += len(evento) + 1
+        if actual:
+            mensajes.append(cabecera + "[" + ",".join(actual) + "]}")
+        return mensajes
+
+    def _escuchar(self):
+        # Si la conexión se cae (reinicio de Postgres, failover) se reintenta con backoff exponencial;
+        # tras reconectar se avisa por CANAL_RECONEXION porque los eventos del corte no llegan
+        espera, conectado_antes = self.ESPERA_INICIAL, False
+        while not self._detener.is_set():
+            try:
+                conexion = self._conectar()
+            except Exception:
+                logger.exception("No se pudo abrir la conexión de LISTEN; reintento en %.0f s", espera)
+            else:
+                espera = self.ESPERA_INICIAL
+                if conectado_antes:
+                    self.entregar(CANAL_RECONEXION, {})
+                conectado_antes = True
+                try:
+                    self._recibir(conexion)
+                except Exception:
+                    logger.exception("Se perdió la conexión de LISTEN; reintento en %.0f s", espera)
+                finally:
+                    try:
+                        conexion.close()
+                    except Exception:
+                        pass
+            if self._detener.wait(espera):
+                break
+            espera = min(espera * 2, config.DIFUSION_REINTENTO_MAX_SECONDS)
+
+    def _conectar(self):
+        # Conexión dedicada fuera del pool: queda bloqueada esperando notificaciones
+        conexion = self.engine.raw_connection()
+        conexion.detach()
+        dbapi = conexion.dbapi_connection
+        dbapi.autocommit = True
+        with dbapi.cursor() as cursor:
+            cursor.execute(f"LISTEN {self.CANAL}")
+        return conexion
+
+    def _recibir(self, conexion):
+        dbapi = conexion.dbapi_connection
+        while not self._detener.is_set():
+            if select.select([dbapi], [], [], 1.0) == ([], [], []):
+                continue
+            dbapi.poll()
+            while dbapi.notifies:
+                notificacion = dbapi.notifies.pop(0)
+                try:
+                    mensaje = json.loads(notificacion.payload)
+                    canal, lote = mensaje["canal"], mensaje["lote"]
+                except (ValueError, KeyError):
+                    logger.warning("Notificación inválida: %s", notificacion.payload)
+                    continue
+                for datos in lote:
+                    self.entregar(canal, datos)
+
+
+# --- HUB ---
+class HubDifusion:
+    # Suscriptores locales por canal. `publicar` se puede llamar desde cualquier hilo
+    # (los handlers sync corren en el threadpool); cada suscriptor recibe en su event loop.
+    # Los oyentes internos (ej. invalidación de cachés) se llaman en el hilo que entrega.
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._lock = threading.Lock()
+        self._suscriptores: Dict[str, Set[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+        self._oyentes: Dict[str, List[Callable[[dict], None]]] = {}
+
+    def iniciar(self):
+        self.backend.iniciar(self._entregar)
+
+    def detener(self):
+        self.backend.detener()
+
+    def publicar(self, canal: str, datos: dict):
+        self.publicar_lote(canal, [datos])
+
+    def publicar_lote(self, canal: str, lote: List[dict]):
+        # Varios eventos del mismo canal (ej. resultados:bulk) viajan juntos al backend
+        try:
+            self.backend.publicar(canal, lote)
+        except Exception:
+            # La transmisión en vivo nunca debe hacer fallar la escritura que ya se confirmó
+            logger.exception("No se pudo publicar el evento en %s", canal)
+
+    def escuchar(self, canal: str, oyente: Callable[[dict], None]):
+        # Se registra al importar el módulo interesado, antes de iniciar el hub
+        self._oyentes.setdefault(canal, []).append(oyente)
+
+    def suscriptores(self, canal: str) -> int:
+        with self._lock:
+            return len(self._suscriptores.get(canal, ()))
+
+    @asynccontextmanager
+    async def suscribir(self, canal: str) -> AsyncIterator[asyncio.Queue]:
+        entrada = (asyncio.get_running_loop(), asyncio.Queue(maxsize=config.SSE_MAX_PENDIENTES))
+        with self._lock:
+            self._suscriptores.setdefault(canal, set()).add(entrada)
+        try:
+            yield entrada[1]
+        finally:
+            with self._lock:
+                suscritos = self._suscriptores.get(canal)
+                if suscritos is not None:
+                    suscritos.discard(entrada)
+                    if not suscritos:
+                        del self._suscriptores[canal]
+
+    def _entregar(self, canal: str, datos: dict):
+        for oyente in self._oyentes.get(canal, ()):
+            try:
+                oyente(datos)
+            except Exception:
+                logger.exception("Falló un oyente de %s", canal)
+        with self._lock:
+            suscritos = list(self._suscriptores.get(canal, ()))
+        for loop, cola in suscritos:
+            try:
+                loop.call_soon_threadsafe(_encolar, cola, datos)
+            except RuntimeError:
+                # El event loop del suscriptor ya se cerró
+                pass
+
+
+def _encolar(cola: asyncio.Queue, datos: dict):
+    # Un cliente lento pierde eventos en vez de acumular memoria; puede resincronizar con /publico
+    try:
+        cola.put_nowait(datos)
+    except asyncio.QueueFull:
+        pass
+
+
+def canal_sorteo(numero_sorteo: str) -> str:
+    return f"sorteo:{numero_sorteo}"
+
+
+def _crear_backend():
+    if config.DIFUSION_BACKEND == "postgres":
+        from app.core.database import engine
+        return BackendPostgres(engine)
+    return BackendLocal()
+
+
+hub = HubDifusion(_crear_backend())
@@ -0,0 +1,66 @@
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+
+from app.core import config
+from app.migraciones import MIGRACIONES
+
+logger = logging.getLogger("app.esquema")
+
+TABLA_VERSION = "esquema_version"
+VERSION_ESPERADA = len(MIGRACIONES)
+# Clave arbitraria para pg_advisory_xact_lock: dos procesos no migran a la vez
+_LLAVE_BLOQUEO = 5_318_008
+
+
+def _leer_version(conexion: Connection) -> int:
+    return conexion.execute(text(f"SELECT version FROM {TABLA_VERSION}")).scalar() or 0
+
+
+def version_actual(engine: Engine) -> int:
+    # Una sola consulta; una base sin la tabla de versión cuenta como versión 0
+    try:
+        with engine.connect() as conexion:
+            return _leer_version(conexion)
+    except DBAPIError:
+        return 0
+
+
+def migrar(engine: Engine) -> int:
+    # Aplica las migraciones pendientes, cada una en su propia transacción junto con la versión
+    with engine.begin() as conexion:
+        conexion.execute(text(f"CREATE TABLE IF NOT EXISTS {TABLA_VERSION} (version INTEGER NOT NULL)"))
+        if conexion.execute(text(f"SELECT COUNT(*) FROM {TABLA_VERSION}")).scalar() == 0:
+            conexion.execute(text(f"INSERT INTO {TABLA_VERSION} (version) VALUES (0)"))
+
+    with engine.connect() as conexion:
+        for numero, migracion in enumerate(MIGRACIONES, start=1):
+            with conexion.begin():
+                if conexion.dialect.name == "postgresql":
+                    conexion.execute(text("SELECT pg_advisory_xact_lock(:llave)"), {"llave": _LLAVE_BLOQUEO})
+                if _leer_version(conexion) >= numero:
+                    continue
+                logger.info("Aplicando migración %d: %s", numero, migracion.DESCRIPCION)
+                migracion.aplicar(conexion)
+                conexion.execute(text(f"UPDATE {TABLA_VERSION} SET version = :v"), {"v": numero})
+        return _leer_version(conexion)
+
+
+def verificar_esquema(engine: Engine):
+    # Chequeo de arranque: no inspecciona tablas, solo compara el número de versión
+    version = version_actual(engine)
+    if version == VERSION_ESPERADA:
+        return
+    if version > VERSION_ESPERADA:
+        # Despliegue gradual: otra instancia con código más nuevo ya migró
+        logger.warning("El esquema (v%d) es más nuevo que esta versión de la app (v%d)", version, VERSION_ESPERADA)
+        return
+    if config.DB_MIGRAR_AL_INICIAR:
+        migrar(engine)
+        return
+    raise RuntimeError(
+        f"El esquema de la base está en la versión {version} y la app requiere la {VERSION_ESPERADA}. "
+        "Ejecute: python -m app.commands.migrar"
+    )
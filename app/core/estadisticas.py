@@ -0,0 +1,251 @@
+import threading
+import time
+from datetime import date
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from sqlmodel import Session, select
+
+from app import models
+from app.core import config
+from app.core.cache import CacheTTL
+
+# numpy se importa al calcular por primera vez, no al arrancar: los routers de mutación importan
+# este módulo solo para marcar cambios y la importación de numpy pesa en el arranque en frío
+if TYPE_CHECKING:
+    import numpy as np
+
+# Ancho de la matriz de cifras: los números se alinean a la derecha (unidades en la última columna)
+ANCHO = 12
+EPOCA = date(1970, 1, 1)
+
+
+def _matriz_cifras(numeros: List[str]) -> "np.ndarray":
+    import numpy as np
+
+    # Cada número ocupa una fila; las posiciones vacías o no numéricas quedan en -1
+    if not numeros:
+        return np.empty((0, ANCHO), dtype=np.int8)
+    texto = "".join(n.strip()[-ANCHO:].rjust(ANCHO) for n in numeros)
+    cifras = np.frombuffer(texto.encode("ascii", "replace"), dtype=np.uint8).reshape(-1, ANCHO).astype(np.int8) - 48
+    cifras[(cifras < 0) | (cifras > 9)] = -1
+    return cifras
+
+
+def _tasa_consecutiva(nivel, indice_sorteo, codigos, total_sorteos: int, posibles: int) -> float:
+    import numpy as np
+
+    # Por premio: de cada sorteo al siguiente sorteo en que ese premio tuvo resultados, fracción de
+    # transiciones en las que alguna terminación del sorteo anterior vuelve a salir. Un sorteo puede
+    # tener varios resultados por premio, por eso se compara el conjunto de terminaciones de cada
+    # (premio, sorteo) y no un resultado suelto.
+    if not len(codigos):
+        return 0.0
+    grupo = nivel.astype(np.int64) * total_sorteos + indice_sorteo
+    claves = np.unique(grupo * posibles + codigos)
+    grupos = np.unique(claves // posibles)
+    # Grupo anterior del mismo premio; el primero de cada premio no tiene transición
+    anterior = np.empty_like(grupos)
+    anterior[1:] = grupos[:-1]
+    con_anterior = np.zeros(len(grupos), dtype=bool)
+    con_anterior[1:] = grupos[1:] // total_sorteos == grupos[:-1] // total_sorteos
+    if not con_anterior.any():
+        return 0.0
+
+    posicion = np.searchsorted(grupos, claves // posibles)
+    candidata = anterior[posicion] * posibles + claves % posibles
+    repite = con_anterior[posicion] & np.isin(candidata, claves)
+    repetidos = np.zeros(len(grupos), dtype=bool)
+    repetidos[posicion[repite]] = True
+    return float(repetidos[con_anterior].mean())
+
+
+class MotorEstadisticas:
+    # Matriz columnar en memoria de todos los resultados: una fila por resultado.
+    # Los resultados nuevos se agregan de forma incremental desde el último id cargado menos
+    # ESTADISTICAS_VENTANA_IDS, descartando los que ya están; lo que se confirme aún más tarde
+    # entra en la reconstrucción periódica. Correcciones y borrados obligan a reconstruir.
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._niveles: Dict[str, int] = {}
+        # Los arreglos se crean en la primera carga (siempre una reconstrucción: _invalido empieza en True)
+        self._resultado_id = self._sorteo_id = self._dia = self._nivel = self._cifras = None
+        self._ultimo_id = 0
+        self._invalido = True
+        self._pendiente = False
+        self._reconstruido_en = 0.0
+        self._refrescado_en = 0.0
+        self.version = 0
+        # Resultados ya calculados; la versión de los datos forma parte de la clave
+        self._calculados = CacheTTL(128, config.ESTADISTICAS_RECONSTRUIR_SECONDS)
+
+    # --- Señales desde los handlers de mutación ---
+    def marcar_nuevos(self):
+        self._pendiente = True
+
+    def invalidar(self):
+        self._invalido = True
+
+    # --- Carga ---
+    def refrescar(self, session: Session):
+        ahora = time.monotonic()
+        with self._lock:
+            if self._invalido or ahora - self._reconstruido_en > config.ESTADISTICAS_RECONSTRUIR_SECONDS:
+                self._cargar(session, reconstruir=True)
+                self._reconstruido_en = ahora
+            elif self._pendiente or ahora - self._refrescado_en > config.ESTADISTICAS_REFRESCO_SECONDS:
+                self._cargar(session, reconstruir=False)
+            else:
+                return
+            self._refrescado_en = ahora
+
+    def _cargar(self, session: Session, reconstruir: bool):
+        import numpy as np
+
+        # Las banderas se limpian antes de consultar: una mutación concurrente vuelve a marcarlas
+        self._invalido = False
+        self._pendiente = False
+        desde_id = 0 if reconstruir else max(self._ultimo_id - config.ESTADISTICAS_VENTANA_IDS, 0)
+
+        statement = (
+            select(
+                models.Resultado.id,
+                models.Resultado.sorteo_id,
+                models.Sorteo.fecha,
+                models.Premio.titulo,
+                models.Resultado.numeros_ganadores,
+            )
+            .join(models.Sorteo, models.Sorteo.id == models.Resultado.sorteo_id)
+            .join(models.Premio, models.Premio.id == models.Resultado.premio_id)
+            .where(models.Resultado.id > desde_id)
+            .order_by(models.Resultado.id)
+        )
+        filas = session.exec(statement).all()
+        if reconstruir:
+            self._niveles = {}
+        else:
+            # La ventana relee resultados ya cargados: solo quedan los que faltaban
+            cargados = set(self._resultado_id[self._resultado_id > desde_id].tolist())
+            filas = [f for f in filas if f[0] not in cargados]
+        if not filas and not reconstruir:
+            return
+
+        resultado_id = np.fromiter((f[0] for f in filas), dtype=np.int64, count=len(filas))
+        sorteo_id = np.fromiter((f[1] for f in filas), dtype=np.int64, count=len(filas))
+        dia = np.fromiter(((f[2] - EPOCA).days for f in filas), dtype=np.int32, count=len(filas))
+        nivel = np.fromiter(
+            (self._niveles.setdefault(f[3], len(self._niveles)) for f in filas), dtype=np.int16, count=len(filas)
+        )
+        cifras = _matriz_cifras([f[4] or "" for f in filas])
+
+        if reconstruir:
+            self._resultado_id, self._sorteo_id, self._dia, self._nivel, self._cifras = (
+                resultado_id, sorteo_id, dia, nivel, cifras
+            )
+        else:
+            self._resultado_id = np.concatenate([self._resultado_id, resultado_id])
+            self._sorteo_id = np.concatenate([self._sorteo_id, sorteo_id])
+            self._dia = np.concatenate([self._dia, dia])
+            self._nivel = np.concatenate([self._nivel, nivel])
+            self._cifras = np.concatenate([self._cifras, cifras])
+        self._ultimo_id = int(self._resultado_id.max()) if len(self._resultado_id) else 0
+        self.version += 1
+
+    # --- Cálculo ---
+    def niveles(self) -> List[str]:
+        return list(self._niveles)
+
+    def consultar(self, **parametros) -> dict:
+        clave = (self.version, tuple(sorted(parametros.items())))
+        calculado = self._calculados.obtener(clave)
+        if calculado is None:
+            calculado = self.calcular(**parametros)
+            self._calculados.guardar(clave, calculado)
+        return calculado
+
+    def calcular(
+        self,
+        premio: Optional[str] = None,
+        desde: Optional[date] = None,
+        hasta: Optional[date] = None,
+        cifras: int = 2,
+        top: int = 10,
+    ) -> dict:
+        import numpy as np
+
+        with self._lock:
+            # Instantánea consistente; los arreglos nunca se modifican en su lugar
+            sorteo_id, dia, nivel, matriz = self._sorteo_id, self._dia, self._nivel, self._cifras
+            niveles = dict(self._niveles)
+
+        mascara = np.ones(len(dia), dtype=bool)
+        if premio is not None:
+            if premio not in niveles:
+                mascara[:] = False
+            else:
+                mascara &= nivel == niveles[premio]
+        if desde:
+            mascara &= dia >= (desde - EPOCA).days
+        if hasta:
+            mascara &= dia <= (hasta - EPOCA).days
+
+        matriz = matriz[mascara]
+        total = int(mascara.sum())
+
+        # Frecuencia de cada cifra (0-9) en cada posición, de izquierda a derecha
+        validas = matriz >= 0
+        posiciones = np.broadcast_to(np.arange(ANCHO), matriz.shape)
+        conteo = np.bincount((posiciones * 10 + matriz)[validas], minlength=ANCHO * 10).reshape(ANCHO, 10)
+        usadas = np.flatnonzero(conteo.sum(axis=1))
+        frecuencias = {
+            f"posicion_{i - usadas[0] + 1}": conteo[i].tolist() for i in usadas
+        } if len(usadas) else {}
+
+        # Terminaciones de `cifras` dígitos: códigos 0..10^cifras-1
+        sufijo = matriz[:, -cifras:]
+        completos = (sufijo >= 0).all(axis=1)
+        codigos = (sufijo[completos].astype(np.int64) @ (10 ** np.arange(cifras - 1, -1, -1))).astype(np.int64)
+        posibles = 10 ** cifras
+        apariciones = np.bincount(codigos, minlength=posibles)
+
+        orden_calientes = np.argsort(-apariciones, kind="stable")[:top]
+        orden_frios = np.argsort(apariciones, kind="stable")[:top]
+
+        # Atraso: sorteos transcurridos desde la última aparición de cada terminación
+        claves = (dia[mascara][completos].astype(np.int64) << 32) | sorteo_id[mascara][completos]
+        sorteos_unicos, indice_sorteo = np.unique(claves, return_inverse=True)
+        total_sorteos = len(sorteos_unicos)
+        ultima = np.full(posibles, -1, dtype=np.int64)
+        np.maximum.at(ultima, codigos, indice_sorteo)
+        atraso = np.where(ultima >= 0, total_sorteos - 1 - ultima, total_sorteos)
+        orden_atrasados = np.argsort(-atraso, kind="stable")[:top]
+
+        # Repetición: apariciones de terminaciones ya vistas y repetición en sorteos consecutivos
+        distintos = int((apariciones > 0).sum())
+        tasa_repeticion = 1 - distintos / len(codigos) if len(codigos) else 0.0
+        tasa_consecutiva = _tasa_consecutiva(nivel[mascara][completos], indice_sorteo, codigos, total_sorteos, posibles)
+
+        formato = f"0{cifras}d"
+        return {
+            "premio": premio,
+            "desde": desde,
+            "hasta": hasta,
+            "resultados": total,
+            "sorteos": total_sorteos,
+            "frecuencia_por_posicion": frecuencias,
+            "cifras": cifras,
+            "calientes": [
+                {"numero": format(int(c), formato), "apariciones": int(apariciones[c])} for c in orden_calientes
+            ],
+            "frios": [
+                {"numero": format(int(c), formato), "apariciones": int(apariciones[c])} for c in orden_frios
+            ],
+            "atrasados": [
+                {"numero": format(int(c), formato), "sorteos_sin_salir": int(atraso[c])} for c in orden_atrasados
+            ],
+            "tasa_repeticion": round(tasa_repeticion, 4),
+            "tasa_repeticion_consecutiva": round(tasa_consecutiva, 4),
+        }
+
+
+motor_estadisticas = MotorEstadisticas()
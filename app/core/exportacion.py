@@ -0,0 +1,75 @@
+import csv
+import io
+import json
+from typing import Iterable, Iterator, Tuple
+
+from app.core.database import SesionLectura, motor_lectura
+
+# Tamaño aproximado de cada bloque enviado al cliente
+TAMANO_BLOQUE = 64 * 1024
+FILAS_POR_LOTE = 1000
+
+COLUMNAS_CSV = ("numero_sorteo", "fecha", "plan_id", "premio_id", "premio", "valor", "numero_ganador")
+
+
+def _filas(statement) -> Iterator[Tuple]:
+    # Sesión propia: el generador sigue corriendo después de que el endpoint retorna.
+    # stream_results usa un cursor del lado del servidor en Postgres; las filas llegan por lotes.
+    with SesionLectura(motor_lectura()) as session:
+        resultado = session.exec(statement.execution_options(stream_results=True, yield_per=FILAS_POR_LOTE))
+        yield from resultado
+
+
+def _en_bloques(lineas: Iterable[str]) -> Iterator[bytes]:
+    bloque, tamano = [], 0
+    for linea in lineas:
+        bloque.append(linea)
+        tamano += len(linea)
+        if tamano >= TAMANO_BLOQUE:
+            yield "".join(bloque).encode()
+            bloque, tamano = [], 0
+    if bloque:
+        yield "".join(bloque).encode()
+
+
+def _lineas_ndjson(filas: Iterable[Tuple]) -> Iterator[str]:
+    # Un objeto JSON por sorteo con todos sus resultados
+    actual = None
+    for sorteo_id, numero, fecha, plan_id, premio_id, titulo, valor, ganador in filas:
+        if actual is None or actual["id"] != sorteo_id:
+            if actual is not None:
+                yield json.dumps(actual, ensure_ascii=False) + "\n"
+            actual = {
+                "id": sorteo_id,
+                "numero_sorteo": numero,
+                "fecha": fecha.isoformat(),
+                "plan_id": plan_id,
+                "resultados": [],
+            }
+        if premio_id is not None:
+            actual["resultados"].append(
+                {"premio_id": premio_id, "premio": titulo, "valor": valor, "numero_ganador": ganador}
+            )
+    if actual is not None:
+        yield json.dumps(actual, ensure_ascii=False) + "\n"
+
+
+def _lineas_csv(filas: Iterable[Tuple]) -> Iterator[str]:
+    # Una fila por resultado
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(COLUMNAS_CSV)
+    for _, numero, fecha, plan_id, premio_id, titulo, valor, ganador in filas:
+        writer.writerow((numero, fecha.isoformat(), plan_id, premio_id, titulo, valor, ganador))
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+def exportar_ndjson(statement) -> Iterator[bytes]:
+    return _en_bloques(_lineas_ndjson(_filas(statement)))
+
+
+def exportar_csv(statement) -> Iterator[bytes]:
+    return _en_bloques(_lineas_csv(_filas(statement)))
@@ -0,0 +1,48 @@
+import hashlib
+from datetime import date, timedelta
+
+from fastapi import Request, Response
+
+from app.core import config
+
+
+def calcular_etag(*partes) -> str:
+    base = ":".join(str(p) for p in partes)
+    return '"' + hashlib.sha1(base.encode()).hexdigest()[:20] + '"'
+
+
+def etag_coincide(request: Request, etag: str) -> bool:
+    encabezado = request.headers.get("if-none-match")
+    if not encabezado:
+        return False
+    if encabezado.strip() == "*":
+        return True
+    candidatos = [e.strip().removeprefix("W/") for e in encabezado.split(",")]
+    return etag in candidatos
+
+
+def cache_control(max_age: int) -> str:
+    if max_age <= 0:
+        return "no-cache"
+    return f"public, max-age={max_age}"
+
+
+def limite_cierre() -> date:
+    # Los sorteos con fecha anterior a este día están cerrados
+    return date.today() - timedelta(days=config.SORTEO_DIAS_CIERRE)
+
+
+def cache_control_sorteo(fecha: date) -> str:
+    # Los sorteos cerrados ya no cambian: el CDN y los clientes pueden guardarlos mucho tiempo
+    if fecha < limite_cierre():
+        return cache_control(config.CACHE_MAX_AGE_SORTEO_CERRADO)
+    return cache_control(config.CACHE_MAX_AGE_SORTEO_ABIERTO)
+
+
+def aplicar_encabezados(response: Response, etag: str, politica: str):
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = politica
+
+
+def no_modificado(etag: str, politica: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": politica})
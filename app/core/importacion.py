@@ -0,0 +1,79 @@
+import csv
+import io
+import json
+from typing import List, Tuple
+
+from pydantic import TypeAdapter, ValidationError
+
+from app import schemas
+
+# Una fila por premio; las filas con el mismo nombre de plan forman un plan (la descripción se toma
+# de la primera). Un plan sin premios se declara con una fila sin título.
+COLUMNAS_CSV = ("plan", "descripcion", "titulo", "valor", "cantidad_balotas")
+
+_lista_planes = TypeAdapter(List[schemas.PlanCreate])
+
+
+def _validar_titulos(planes: List[schemas.PlanCreate]) -> List[dict]:
+    errores = []
+    for indice, plan in enumerate(planes):
+        titulos = [p.titulo for p in plan.premios]
+        if len(set(titulos)) != len(titulos):
+            errores.append({
+                "indice": indice, "plan": plan.nombre, "error": "Hay títulos de premio repetidos en el plan"
+            })
+    return errores
+
+
+def leer_json(contenido: bytes) -> Tuple[List[schemas.PlanCreate], List[dict]]:
+    # Acepta una lista de PlanCreate o {"planes": [...]}
+    try:
+        datos = json.loads(contenido)
+    except ValueError:
+        return [], [{"error": "JSON inválido"}]
+    if isinstance(datos, dict):
+        datos = datos.get("planes")
+    try:
+        planes = _lista_planes.validate_python(datos)
+    except ValidationError as e:
+        return [], [{"ubicacion": list(err["loc"]), "error": err["msg"]} for err in e.errors()]
+    return planes, _validar_titulos(planes)
+
+
+def leer_csv(contenido: bytes) -> Tuple[List[schemas.PlanCreate], List[dict]]:
+    try:
+        texto = contenido.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        return [], [{"error": "El CSV debe estar en UTF-8"}]
+
+    lector = csv.DictReader(io.StringIO(texto))
+    faltantes = [c for c in COLUMNAS_CSV if c not in (lector.fieldnames or [])]
+    if faltantes:
+        return [], [{"error": f"Faltan columnas: {', '.join(faltantes)}"}]
+
+    por_nombre, errores = {}, []
+    # La fila 1 es el encabezado
+    for fila_num, fila in enumerate(lector, start=2):
+        nombre = (fila["plan"] or "").strip()
+        if not nombre:
+            errores.append({"fila": fila_num, "error": "Falta el nombre del plan"})
+            continue
+        plan = por_nombre.setdefault(
+            nombre, {"nombre": nombre, "descripcion": fila["descripcion"] or None, "premios": []}
+        )
+        titulo = (fila["titulo"] or "").strip()
+        if not titulo:
+            continue
+        try:
+            cantidad = int(fila["cantidad_balotas"])
+        except (TypeError, ValueError):
+            errores.append({"fila": fila_num, "error": f"cantidad_balotas inválida: {fila['cantidad_balotas']!r}"})
+            continue
+        plan["premios"].append({
+            "titulo": titulo, "valor": (fila["valor"] or "").strip(), "cantidad_balotas": cantidad
+        })
+
+    if errores:
+        return [], errores
+    planes = [schemas.PlanCreate.model_validate(p) for p in por_nombre.values()]
+    return planes, _validar_titulos(planes)
@@ -0,0 +1,42 @@
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from app import schemas
+
+
+class IndiceGanadores:
+    # Índice en memoria de los números ganadores de un sorteo.
+    # Según la cantidad de cifras del número ganador:
+    #   - más de `cifras_numero`: número + serie, debe coincidir el par completo
+    #   - igual a `cifras_numero`: coincide el número con cualquier serie
+    #   - menos de `cifras_numero`: coinciden las últimas cifras del número
+    # Cada billete se resuelve con a lo sumo `cifras_numero` + 1 búsquedas en diccionarios.
+
+    def __init__(self, publico: schemas.SorteoPublicoRead, cifras_numero: int):
+        self.numero_sorteo = publico.numero_sorteo
+        self.cifras_numero = cifras_numero
+        self._por_numero_serie: Dict[Tuple[str, str], List[schemas.ResultadoPublico]] = defaultdict(list)
+        self._por_terminacion: Dict[str, List[schemas.ResultadoPublico]] = defaultdict(list)
+
+        for resultado in publico.resultados:
+            ganador = (resultado.numero_ganador or "").strip()
+            if not ganador:
+                continue
+            if len(ganador) > cifras_numero:
+                clave = (ganador[:cifras_numero], ganador[cifras_numero:])
+                self._por_numero_serie[clave].append(resultado)
+            else:
+                self._por_terminacion[ganador].append(resultado)
+
+        # Longitudes de terminación presentes, de mayor a menor
+        self._longitudes = sorted({len(t) for t in self._por_terminacion}, reverse=True)
+
+    def verificar(self, numero: str, serie: Optional[str] = None) -> List[schemas.ResultadoPublico]:
+        numero = numero.strip()
+        premios: List[schemas.ResultadoPublico] = []
+        if serie:
+            premios.extend(self._por_numero_serie.get((numero, serie.strip()), ()))
+        for longitud in self._longitudes:
+            if longitud <= len(numero):
+                premios.extend(self._por_terminacion.get(numero[-longitud:], ()))
+        return premios
@@ -0,0 +1,185 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core import config
+
+logger = logging.getLogger("app.lento")
+
+BUCKETS_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BUCKETS_CONSULTAS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class Histograma:
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        self.conteos = [0] * len(buckets)
+        self.suma = 0.0
+        self.total = 0
+
+    def observar(self, valor: float):
+        self.suma += valor
+        self.total += 1
+        for i, limite in enumerate(self.buckets):
+            if valor <= limite:
+                self.conteos[i] += 1
+                break
+
+    def lineas(self, nombre: str, etiquetas: str) -> List[str]:
+        lineas, acumulado = [], 0
+        for limite, conteo in zip(self.buckets, self.conteos):
+            acumulado += conteo
+            lineas.append(f'{nombre}_bucket{{{etiquetas},le="{limite}"}} {acumulado}')
+        lineas.append(f'{nombre}_bucket{{{etiquetas},le="+Inf"}} {self.total}')
+        lineas.append(f"{nombre}_sum{{{etiquetas}}} {self.suma}")
+        lineas.append(f"{nombre}_count{{{etiquetas}}} {self.total}")
+        return lineas
+
+
+class EstadoRequest:
+    # Consultas SQL emitidas durante un request (se comparte entre hilos vía contextvar)
+    __slots__ = ("consultas", "tiempo_db", "sentencias")
+
+    def __init__(self, guardar_sentencias: bool):
+        self.consultas = 0
+        self.tiempo_db = 0.0
+        self.sentencias: Optional[List[Tuple[float, str]]] = [] if guardar_sentencias else None
+
+
+_estado_request: ContextVar[Optional[EstadoRequest]] = ContextVar("estado_request", default=None)
+
+
+class RegistroMetricas:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencia: Dict[Tuple[str, str], Histograma] = {}
+        self.consultas_por_request: Dict[Tuple[str, str], Histograma] = {}
+        self.requests: Dict[Tuple[str, str, int], int] = defaultdict(int)
+        self.consultas_db: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.tiempo_db: Dict[Tuple[str, str], float] = defaultdict(float)
+
+    def registrar(self, metodo: str, ruta: str, codigo: int, duracion: float, estado: EstadoRequest):
+        clave = (metodo, ruta)
+        with self._lock:
+            if clave not in self.latencia:
+                self.latencia[clave] = Histograma(BUCKETS_LATENCIA)
+                self.consultas_por_request[clave] = Histograma(BUCKETS_CONSULTAS)
+            self.latencia[clave].observar(duracion)
+            self.consultas_por_request[clave].observar(estado.consultas)
+            self.requests[(metodo, ruta, codigo)] += 1
+            self.consultas_db[clave] += estado.consultas
+            self.tiempo_db[clave] += estado.tiempo_db
+
+    def exponer(self) -> List[str]:
+        with self._lock:
+            lineas = [
+                "# HELP http_requests_total Requests atendidos por ruta y código",
+                "# TYPE http_requests_total counter",
+            ]
+            for (metodo, ruta, codigo), total in sorted(self.requests.items()):
+                lineas.append(f'http_requests_total{{method="{metodo}",route="{ruta}",status="{codigo}"}} {total}')
+
+            lineas += [
+                "# HELP http_request_duration_seconds Latencia por plantilla de ruta",
+                "# TYPE http_request_duration_seconds histogram",
+            ]
+            for (metodo, ruta), histograma in sorted(self.latencia.items()):
+                lineas += histograma.lineas("http_request_duration_seconds", f'method="{metodo}",route="{ruta}"')
+
+            lineas += [
+                "# HELP http_request_db_queries Consultas SQL por request",
+                "# TYPE http_request_db_queries histogram",
+            ]
+            for (metodo, ruta), histograma in sorted(self.consultas_por_request.items()):
+                lineas += histograma.lineas("http_request_db_queries", f'method="{metodo}",route="{ruta}"')
+
+            lineas += [
+                "# HELP db_queries_total Consultas SQL por ruta",
+                "# TYPE db_queries_total counter",
+            ]
+            for (metodo, ruta), total in sorted(self.consultas_db.items()):
+                lineas.append(f'db_queries_total{{method="{metodo}",route="{ruta}"}} {total}')
+
+            lineas += [
+                "# HELP db_query_seconds_total Tiempo total en la base de datos por ruta",
+                "# TYPE db_query_seconds_total counter",
+            ]
+            for (metodo, ruta), total in sorted(self.tiempo_db.items()):
+                lineas.append(f'db_query_seconds_total{{method="{metodo}",route="{ruta}"}} {total}')
+            return lineas
+
+
+registro = RegistroMetricas()
+
+
+# --- HOOKS DE SQLALCHEMY ---
+# Se registran sobre la clase Engine: cubren el motor sync y el sync_engine del motor async.
+# El inicio se guarda en el contexto de ejecución de cada sentencia, no en la conexión: si la
+# sentencia falla, after_cursor_execute no corre y el valor se va con el contexto.
+@event.listens_for(Engine, "before_cursor_execute")
+def _antes_de_consulta(conn, cursor, statement, parameters, context, executemany):
+    context._inicio_consulta = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _despues_de_consulta(conn, cursor, statement, parameters, context, executemany):
+    inicio = getattr(context, "_inicio_consulta", None)
+    if inicio is None:
+        return
+    duracion = time.perf_counter() - inicio
+    estado = _estado_request.get()
+    if estado is None:
+        return
+    estado.consultas += 1
+    estado.tiempo_db += duracion
+    if estado.sentencias is not None:
+        estado.sentencias.append((duracion, statement))
+
+
+# --- MIDDLEWARE ASGI ---
+class MetricasMiddleware:
+    # Mide cada request HTTP y lo asocia a la plantilla de la ruta (ej. /sorteos/{numero_sorteo}/publico)
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        estado = EstadoRequest(guardar_sentencias=config.SLOW_REQUEST_MS > 0)
+        token = _estado_request.set(estado)
+        codigo = 500
+        inicio = time.perf_counter()
+
+        async def send_medido(mensaje):
+            nonlocal codigo
+            if mensaje["type"] == "http.response.start":
+                codigo = mensaje["status"]
+            await send(mensaje)
+
+        try:
+            await self.app(scope, receive, send_medido)
+        finally:
+            duracion = time.perf_counter() - inicio
+            _estado_request.reset(token)
+            ruta = getattr(scope.get("route"), "path", "<sin_ruta>")
+            registro.registrar(scope["method"], ruta, codigo, duracion, estado)
+            if config.SLOW_REQUEST_MS > 0 and duracion * 1000 >= config.SLOW_REQUEST_MS:
+                _registrar_lento(scope, ruta, duracion, estado)
+
+
+def _registrar_lento(scope, ruta: str, duracion: float, estado: EstadoRequest):
+    detalle = "\n".join(
+        f"  [{d * 1000:.1f} ms] {' '.join(sentencia.split())}" for d, sentencia in estado.sentencias or ()
+    )
+    logger.warning(
+        "Request lento %s %s (%s): %.1f ms, %d consultas, %.1f ms en BD\n%s",
+        scope["method"], scope["path"], ruta, duracion * 1000, estado.consultas, estado.tiempo_db * 1000, detalle
+    )
@@ -0,0 +1,51 @@
+import base64
+import json
+from typing import Any, Callable, List, Optional, Sequence
+
+from fastapi import HTTPException
+
+LIMITE_POR_DEFECTO = 100
+LIMITE_MAXIMO = 1000
+ENCABEZADO_CURSOR = "X-Next-Cursor"
+
+
+# El cursor es opaco para el cliente: base64url de la lista de valores de la última fila
+def codificar_cursor(*valores) -> str:
+    crudo = json.dumps([str(v) if not isinstance(v, int) else v for v in valores])
+    return base64.urlsafe_b64encode(crudo.encode()).decode().rstrip("=")
+
+
+def decodificar_cursor(cursor: Optional[str], *tipos: Callable) -> Optional[tuple]:
+    if not cursor:
+        return None
+    try:
+        relleno = "=" * (-len(cursor) % 4)
+        valores = json.loads(base64.urlsafe_b64decode(cursor + relleno))
+        if not isinstance(valores, list) or len(valores) != len(tipos):
+            raise ValueError
+        return tuple(tipo(valor) for tipo, valor in zip(tipos, valores))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+
+
+def parsear_campos(campos: Optional[str], permitidos: Sequence[str]) -> Optional[List[str]]:
+    if not campos:
+        return None
+    seleccion = [c.strip() for c in campos.split(",") if c.strip()]
+    invalidos = [c for c in seleccion if c not in permitidos]
+    if invalidos:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Campos no válidos: {', '.join(invalidos)}. Permitidos: {', '.join(permitidos)}"
+        )
+    # Se conserva el orden declarado en el schema
+    return [c for c in permitidos if c in seleccion]
+
+
+def compactar(datos: Any) -> Any:
+    # Modo compacto: quita campos nulos y listas vacías a cualquier profundidad
+    if isinstance(datos, list):
+        return [compactar(d) for d in datos]
+    if isinstance(datos, dict):
+        return {k: compactar(v) for k, v in datos.items() if v is not None and v != []}
+    return datos
@@ -0,0 +1,86 @@
+import threading
+import time
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+
+class MetricasPool:
+    # Contadores de espera al pedir una conexión al pool
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.espera_total = 0.0
+        self.espera_maxima = 0.0
+        # Checkouts en curso: hilos o tareas esperando una conexión (profundidad de la cola)
+        self.esperando = 0
+
+    def entrar(self):
+        with self._lock:
+            self.esperando += 1
+
+    def salir(self):
+        with self._lock:
+            self.esperando -= 1
+
+    def registrar(self, espera: float, timeout: bool = False):
+        with self._lock:
+            self.checkouts += 1
+            self.espera_total += espera
+            self.espera_maxima = max(self.espera_maxima, espera)
+            if timeout:
+                self.timeouts += 1
+
+    def estadisticas(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "espera_total_segundos": round(self.espera_total, 6),
+                "espera_promedio_ms": round(self.espera_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "espera_maxima_ms": round(self.espera_maxima * 1000, 3),
+                "esperando": self.esperando,
+            }
+
+
+class _PoolMedido:
+    # Mide cuánto tarda cada checkout, incluido el tiempo esperando una conexión libre
+    metricas: MetricasPool
+
+    def _do_get(self):
+        self.metricas.entrar()
+        inicio = time.perf_counter()
+        try:
+            conexion = super()._do_get()
+        except PoolTimeoutError:
+            self.metricas.registrar(time.perf_counter() - inicio, timeout=True)
+            raise
+        finally:
+            self.metricas.salir()
+        self.metricas.registrar(time.perf_counter() - inicio)
+        return conexion
+
+
+def crear_pool_medido(clase_base):
+    # Cada motor recibe su propia subclase (y sus propias métricas); recreate() conserva la clase
+    metricas = MetricasPool()
+    clase = type(f"{clase_base.__name__}Medido", (_PoolMedido, clase_base), {"metricas": metricas})
+    return clase, metricas
+
+
+def estadisticas_pool(engine, metricas: MetricasPool) -> dict:
+    pool = engine.pool
+    datos = {"clase": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        datos.update({
+            "tamano": pool.size(),
+            "en_uso": pool.checkedout(),
+            "disponibles": pool.checkedin(),
+            # overflow() es negativo mientras el pool no ha abierto todas sus conexiones base
+            "overflow_en_uso": max(pool.overflow(), 0),
+            "max_overflow": pool._max_overflow,
+        })
+    datos.update(metricas.estadisticas())
+    return datos
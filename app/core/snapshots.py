@@ -0,0 +1,184 @@
+import gzip
+import json
+import os
+import re
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Optional
+
+from sqlmodel import Session
+
+from app.core import config
+from app.core.database import engine
+from app.core.http_cache import calcular_etag, limite_cierre
+from app.crud import crud_resumen
+
+# brotli es opcional: sin el paquete solo se publican .json y .json.gz
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# fcntl solo existe en POSIX: en Windows (desarrollo) el bloqueo queda limitado al proceso
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Publica los sorteos cerrados como archivos estáticos con la misma ruta que la API:
+#
+#   {SNAPSHOT_DIR}/sorteos/{numero}/publico.json (+ .gz y .br)
+#   {SNAPSHOT_DIR}/sorteos/index.json (+ .gz y .br)
+#
+# nginx puede servirlos con `try_files /snapshots$uri.json @api` y gzip_static/brotli_static;
+# los sorteos abiertos no tienen archivo y siguen llegando a la app.
+# El manifiesto guarda el ETag de cada archivo publicado: solo se reescribe lo que cambió.
+
+MANIFIESTO = ".manifiesto.json"
+BLOQUEO = ".publicador.lock"
+FILAS_POR_LOTE = 500
+
+# El número del sorteo forma parte de la ruta del archivo: solo se publican nombres seguros
+_NUMERO_VALIDO = re.compile(r"^[A-Za-z0-9_-]+$")
+
+
+_lock_local = threading.Lock()
+
+
+@contextmanager
+def _bloqueo(raiz: Path):
+    # Un solo publicador a la vez entre todos los workers y procesos (CLI incluido) que comparten
+    # SNAPSHOT_DIR; flock también excluye a otros hilos del mismo proceso porque cada uno abre el archivo
+    raiz.mkdir(parents=True, exist_ok=True)
+    if fcntl is None:
+        with _lock_local:
+            yield
+        return
+    with open(raiz / BLOQUEO, "a") as archivo:
+        fcntl.flock(archivo, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(archivo, fcntl.LOCK_UN)
+
+
+def _escribir(ruta: Path, datos: bytes):
+    # Se escribe a un temporal con nombre único y se renombra: nginx nunca ve un archivo a medias
+    with tempfile.NamedTemporaryFile(dir=ruta.parent, prefix=ruta.name + ".", suffix=".tmp", delete=False) as temporal:
+        temporal.write(datos)
+    try:
+        # NamedTemporaryFile crea el archivo con 0600; nginx necesita poder leerlo
+        os.chmod(temporal.name, 0o644)
+        os.replace(temporal.name, ruta)
+    except OSError:
+        os.unlink(temporal.name)
+        raise
+
+
+def _publicar_archivo(ruta: Path, datos: bytes):
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    _escribir(ruta, datos)
+    # mtime=0: el .gz es idéntico entre corridas si el contenido no cambia
+    _escribir(ruta.with_name(ruta.name + ".gz"), gzip.compress(datos, config.SNAPSHOT_NIVEL_GZIP, mtime=0))
+    if brotli is not None:
+        _escribir(ruta.with_name(ruta.name + ".br"), brotli.compress(datos, quality=config.SNAPSHOT_NIVEL_BROTLI))
+
+
+def _retirar_archivo(ruta: Path):
+    for variante in (ruta, ruta.with_name(ruta.name + ".gz"), ruta.with_name(ruta.name + ".br")):
+        variante.unlink(missing_ok=True)
+    try:
+        ruta.parent.rmdir()
+    except OSError:
+        pass
+
+
+def _ruta_sorteo(raiz: Path, numero_sorteo: str) -> Path:
+    return raiz / "sorteos" / numero_sorteo / "publico.json"
+
+
+def _publicados_en_disco(raiz: Path) -> set:
+    # El manifiesto puede perderse o quedar atrás (p. ej. un proceso que murió a mitad de camino):
+    # lo que cuenta para retirar es lo que nginx realmente puede servir
+    return {ruta.parent.name for ruta in (raiz / "sorteos").glob("*/publico.json")}
+
+
+def _leer_manifiesto(raiz: Path) -> dict:
+    try:
+        with open(raiz / MANIFIESTO, encoding="utf-8") as archivo:
+            return json.load(archivo)
+    except (OSError, ValueError):
+        return {"sorteos": {}, "indice": None}
+
+
+def _contenido_indice(sorteos: dict) -> bytes:
+    # Del más reciente al más antiguo, como el listado de la API
+    filas = sorted(
+        ({"numero_sorteo": numero, **datos} for numero, datos in sorteos.items()),
+        key=lambda f: (f["fecha"], f["numero_sorteo"]),
+        reverse=True,
+    )
+    return json.dumps({"sorteos": filas}, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def publicar(session: Session, numeros: Optional[Iterable[str]] = None, forzar: bool = False) -> dict:
+    # numeros=None recorre todos los sorteos cerrados (backfill) y retira los que ya no existen;
+    # con una lista solo revisa esos sorteos, que es lo que hacen los handlers tras una mutación.
+    raiz = Path(config.SNAPSHOT_DIR)
+    with _bloqueo(raiz):
+        manifiesto = _leer_manifiesto(raiz)
+        publicados = manifiesto["sorteos"]
+        revisados = set(numeros) if numeros is not None else None
+        vistos = set()
+        conteo = {"escritos": 0, "sin_cambios": 0, "retirados": 0, "indice_actualizado": False}
+
+        statement = crud_resumen.consulta_cerrados(limite_cierre(), revisados)
+        filas = session.exec(statement.execution_options(yield_per=FILAS_POR_LOTE))
+        for numero, fecha, plan_id, contenido in filas:
+            if not _NUMERO_VALIDO.match(numero):
+                continue
+            vistos.add(numero)
+            # Mismo ETag que devuelve la API para este contenido
+            etag = calcular_etag("publico", contenido)
+            previo = publicados.get(numero)
+            ruta = _ruta_sorteo(raiz, numero)
+            if not forzar and previo and previo["etag"] == etag and ruta.exists():
+                conteo["sin_cambios"] += 1
+                continue
+            _publicar_archivo(ruta, contenido.encode("utf-8"))
+            publicados[numero] = {"fecha": fecha.isoformat(), "plan_id": plan_id, "etag": etag}
+            conteo["escritos"] += 1
+
+        # Sorteos borrados, reabiertos por un cambio de fecha o renumerados: su archivo ya no aplica.
+        # Se compara contra la tabla de resúmenes tanto el manifiesto como los archivos en disco.
+        candidatos = revisados if revisados is not None else set(publicados) | _publicados_en_disco(raiz)
+        for numero in candidatos - vistos:
+            if not _NUMERO_VALIDO.match(numero):
+                continue
+            ruta = _ruta_sorteo(raiz, numero)
+            if numero in publicados or ruta.exists():
+                _retirar_archivo(ruta)
+                publicados.pop(numero, None)
+                conteo["retirados"] += 1
+
+        contenido_indice = _contenido_indice(publicados)
+        etag_indice = calcular_etag("indice", contenido_indice.decode("utf-8"))
+        ruta_indice = raiz / "sorteos" / "index.json"
+        if forzar or etag_indice != manifiesto.get("indice") or not ruta_indice.exists():
+            _publicar_archivo(ruta_indice, contenido_indice)
+            manifiesto["indice"] = etag_indice
+            conteo["indice_actualizado"] = True
+
+        if conteo["escritos"] or conteo["retirados"] or conteo["indice_actualizado"]:
+            _escribir(raiz / MANIFIESTO, json.dumps(manifiesto, ensure_ascii=False).encode("utf-8"))
+        return conteo
+
+
+def publicar_sorteos(numeros: Optional[Iterable[str]] = None):
+    # Para BackgroundTasks: corre después de responder, con su propia sesión
+    if not config.SNAPSHOT_DIR:
+        return
+    with Session(engine) as session:
+        publicar(session, numeros)
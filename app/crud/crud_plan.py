@@ -0,0 +1,110 @@
+from typing import List, Optional, Sequence
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, delete, insert, select
+
+from app import models
+from app import schemas
+
+COLUMNAS_PLAN = ("nombre", "descripcion", "id", "premios")
+
+
+def obtener(session: Session, plan_id: int) -> Optional[models.PlanPremios]:
+    # Carga los premios en la misma operación para que PlanRead no dispare lazy loads
+    statement = (
+        select(models.PlanPremios)
+        .where(models.PlanPremios.id == plan_id)
+        .options(selectinload(models.PlanPremios.premios))
+    )
+    return session.exec(statement).first()
+
+
+def listar_filas(
+    session: Session,
+    limite: int,
+    cursor: Optional[int] = None,
+    con_premios: bool = True,
+) -> List[dict]:
+    # Igual que listar() pero arma dicts desde tuplas de columnas, sin objetos ORM;
+    # las claves siguen el orden de PlanRead/PremioRead para producir el mismo JSON
+    statement = select(models.PlanPremios.nombre, models.PlanPremios.descripcion, models.PlanPremios.id)
+    if cursor is not None:
+        statement = statement.where(models.PlanPremios.id > cursor)
+    planes = [fila._asdict() for fila in session.exec(statement.order_by(models.PlanPremios.id).limit(limite)).all()]
+    if not con_premios or not planes:
+        return planes
+
+    por_plan = {plan["id"]: plan.setdefault("premios", []) for plan in planes}
+    statement = (
+        select(
+            models.Premio.titulo,
+            models.Premio.valor,
+            models.Premio.cantidad_balotas,
+            models.Premio.id,
+            models.Premio.plan_id,
+        )
+        .where(models.Premio.plan_id.in_(por_plan))
+        .order_by(*models.premio.ORDEN_PREMIOS)
+    )
+    for premio in session.exec(statement).all():
+        por_plan[premio.plan_id].append(premio._asdict())
+    return planes
+
+
+def crear(session: Session, planes: Sequence[schemas.PlanCreate]) -> List[dict]:
+    # Un INSERT ... RETURNING para los planes y otro para todos sus premios, sin commits intermedios
+    # ni refresh; el commit lo hace quien llama. Devuelve dicts con la forma de PlanRead.
+    # Los ids de los planes vuelven en el orden de los parámetros (en Postgres sigue siendo un solo lote).
+    if not planes:
+        return []
+    statement = insert(models.PlanPremios).returning(models.PlanPremios.id, sort_by_parameter_order=True)
+    ids = session.scalars(statement, [{"nombre": p.nombre, "descripcion": p.descripcion} for p in planes]).all()
+
+    creados = [
+        {"nombre": p.nombre, "descripcion": p.descripcion, "id": plan_id, "premios": []}
+        for p, plan_id in zip(planes, ids)
+    ]
+    filas = [
+        {**premio.model_dump(), "plan_id": plan["id"]}
+        for p, plan in zip(planes, creados)
+        for premio in p.premios
+    ]
+    if filas:
+        # Los premios se emparejan por (plan_id, titulo), que es único: sin sort_by_parameter_order
+        # SQLite también los inserta en una sola sentencia en vez de una por fila
+        statement = insert(models.Premio).returning(models.Premio.id, models.Premio.plan_id, models.Premio.titulo)
+        premio_ids = {
+            (plan_id, titulo): premio_id for premio_id, plan_id, titulo in session.exec(statement, params=filas)
+        }
+        por_plan = {plan["id"]: plan["premios"] for plan in creados}
+        for fila in filas:
+            premio_id = premio_ids[(fila["plan_id"], fila["titulo"])]
+            por_plan[fila["plan_id"]].append({
+                "titulo": fila["titulo"],
+                "valor": fila["valor"],
+                "cantidad_balotas": fila["cantidad_balotas"],
+                "id": premio_id,
+                "plan_id": fila["plan_id"],
+            })
+    return creados
+
+
+def eliminar(session: Session, plan_id: int):
+    # Premios y plan en dos sentencias; el llamador ya verificó que no haya sorteos asociados
+    session.exec(delete(models.Premio).where(models.Premio.plan_id == plan_id))
+    session.exec(delete(models.PlanPremios).where(models.PlanPremios.id == plan_id))
+
+
+def listar(
+    session: Session,
+    limite: int,
+    cursor: Optional[int] = None,
+    con_premios: bool = True,
+) -> List[models.PlanPremios]:
+    # Paginación por llave sobre la llave primaria
+    statement = select(models.PlanPremios).order_by(models.PlanPremios.id)
+    if con_premios:
+        # Una sola consulta IN para los premios de toda la página, en vez de una por plan
+        statement = statement.options(selectinload(models.PlanPremios.premios))
+    if cursor is not None:
+        statement = statement.where(models.PlanPremios.id > cursor)
+    return session.exec(statement.limit(limite)).all()
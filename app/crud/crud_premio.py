@@ -0,0 +1,45 @@
+from typing import Dict, NamedTuple, Optional
+from sqlmodel import Session, select
+
+from app import models
+from app.core.cache import cache_catalogos
+
+
+class PremioCatalogo(NamedTuple):
+    # Copia inmutable de un Premio: se comparte entre requests sin depender de una sesión
+    id: int
+    titulo: str
+    valor: str
+    cantidad_balotas: int
+
+
+class CatalogoPremios:
+    # Premios de un plan indexados por título (publicación) y por id (edición)
+
+    def __init__(self, premios):
+        self.por_titulo: Dict[str, PremioCatalogo] = {p.titulo: p for p in premios}
+        self.por_id: Dict[int, PremioCatalogo] = {p.id: p for p in premios}
+
+
+def obtener_catalogo(session: Session, plan_id: int) -> CatalogoPremios:
+    # Los planes casi nunca cambian: la consulta se hace una vez por plan hasta que
+    # routes_premios/routes_planes invaliden la entrada o venza el TTL
+    catalogo = cache_catalogos.obtener(plan_id)
+    if catalogo is not None:
+        return catalogo
+
+    generacion = cache_catalogos.generacion
+    statement = select(
+        models.Premio.id, models.Premio.titulo, models.Premio.valor, models.Premio.cantidad_balotas
+    ).where(models.Premio.plan_id == plan_id)
+    catalogo = CatalogoPremios([PremioCatalogo(*fila) for fila in session.exec(statement).all()])
+    cache_catalogos.guardar(plan_id, catalogo, generacion=generacion)
+    return catalogo
+
+
+def buscar_por_titulo(session: Session, plan_id: int, titulo: str) -> Optional[PremioCatalogo]:
+    return obtener_catalogo(session, plan_id).por_titulo.get(titulo)
+
+
+def buscar_por_id(session: Session, plan_id: int, premio_id: int) -> Optional[PremioCatalogo]:
+    return obtener_catalogo(session, plan_id).por_id.get(premio_id)
@@ -0,0 +1,48 @@
+from typing import List, Sequence, Tuple
+from sqlmodel import Session, insert, select
+
+from app import models
+from app import schemas
+from app.crud import crud_premio
+
+
+def validar_masivo(
+    session: Session,
+    sorteo: models.Sorteo,
+    items: Sequence[schemas.ResultadoBulkItem],
+) -> Tuple[List[dict], List[dict]]:
+    # Los títulos se resuelven contra el catálogo del plan en memoria y se validan sin consultas
+    premios = crud_premio.obtener_catalogo(session, sorteo.plan_id).por_titulo
+
+    statement = select(models.Resultado.premio_id).where(models.Resultado.sorteo_id == sorteo.id)
+    ya_publicados = set(session.exec(statement).all())
+
+    filas, errores, vistos = [], [], set()
+    for indice, item in enumerate(items):
+        premio = premios.get(item.premio_titulo)
+        if not premio:
+            error = f"Premio '{item.premio_titulo}' no existe"
+        elif premio.id in vistos:
+            error = f"Premio '{item.premio_titulo}' repetido en el lote"
+        elif premio.id in ya_publicados:
+            error = f"Premio '{item.premio_titulo}' ya tiene resultado en este sorteo"
+        elif len(item.numeros_ganadores) < premio.cantidad_balotas:
+            error = f"Faltan cifras. Se esperan {premio.cantidad_balotas}"
+        else:
+            vistos.add(premio.id)
+            filas.append({
+                "sorteo_id": sorteo.id,
+                "premio_id": premio.id,
+                "numeros_ganadores": item.numeros_ganadores,
+            })
+            continue
+        errores.append({"indice": indice, "premio_titulo": item.premio_titulo, "error": error})
+    return filas, errores
+
+
+def insertar_masivo(session: Session, filas: List[dict]) -> List[models.Resultado]:
+    # Un solo INSERT ... RETURNING para todo el lote; el commit lo hace quien llama
+    if not filas:
+        return []
+    statement = insert(models.Resultado).returning(models.Resultado)
+    return list(session.scalars(statement, filas).all())
@@ -0,0 +1,84 @@
+from collections import defaultdict
+from datetime import date
+from typing import Iterable, List, Optional
+from sqlmodel import Session, select
+
+from app import models
+from app import schemas
+from app.crud import crud_sorteo
+
+
+def obtener(session: Session, numero_sorteo: str) -> Optional[models.ResumenSorteo]:
+    statement = select(models.ResumenSorteo).where(models.ResumenSorteo.numero_sorteo == numero_sorteo)
+    return session.exec(statement).first()
+
+
+def consulta_cerrados(limite: date, numeros: Optional[Iterable[str]] = None):
+    # Resúmenes de los sorteos con fecha anterior a `limite`; la usa el publicador de snapshots
+    statement = select(
+        models.ResumenSorteo.numero_sorteo,
+        models.ResumenSorteo.fecha,
+        models.ResumenSorteo.plan_id,
+        models.ResumenSorteo.contenido,
+    ).where(models.ResumenSorteo.fecha < limite)
+    if numeros is not None:
+        statement = statement.where(models.ResumenSorteo.numero_sorteo.in_(list(numeros)))
+    return statement.order_by(models.ResumenSorteo.sorteo_id)
+
+
+def reconstruir(session: Session, sorteos: Iterable[models.Sorteo]):
+    # Recalcula los resúmenes de varios sorteos con una consulta de resultados y una de resúmenes.
+    # Corre dentro de la transacción de la mutación; el commit lo hace quien llama.
+    sorteos = list(sorteos)
+    if not sorteos:
+        return
+    session.flush()
+    ids = [s.id for s in sorteos]
+
+    query = (
+        select(models.Resultado, models.Premio)
+        .where(models.Resultado.sorteo_id.in_(ids))
+        .join(models.Premio)
+        .order_by(models.Resultado.id)
+    )
+    por_sorteo = defaultdict(list)
+    for res, prem in session.exec(query).all():
+        por_sorteo[res.sorteo_id].append(crud_sorteo.resultado_publico(res, prem))
+
+    existentes = {
+        r.sorteo_id: r
+        for r in session.exec(select(models.ResumenSorteo).where(models.ResumenSorteo.sorteo_id.in_(ids))).all()
+    }
+    for sorteo in sorteos:
+        contenido = schemas.SorteoPublicoRead(
+            numero_sorteo=sorteo.numero_sorteo,
+            fecha=sorteo.fecha,
+            resultados=por_sorteo[sorteo.id]
+        ).model_dump_json()
+        resumen = existentes.get(sorteo.id)
+        if resumen is None:
+            resumen = models.ResumenSorteo(sorteo_id=sorteo.id)
+        resumen.numero_sorteo = sorteo.numero_sorteo
+        resumen.plan_id = sorteo.plan_id
+        resumen.fecha = sorteo.fecha
+        resumen.contenido = contenido
+        session.add(resumen)
+
+
+def reconstruir_plan(session: Session, plan_id: int):
+    # Títulos y valores de premios aparecen en el resumen de cada sorteo del plan
+    sorteos = session.exec(select(models.Sorteo).where(models.Sorteo.plan_id == plan_id)).all()
+    reconstruir(session, sorteos)
+
+
+def reconstruir_lote(session: Session, despues_de_id: int, tamano: int) -> List[int]:
+    # Usado por el comando de backfill: un lote de sorteos por llave primaria
+    statement = (
+        select(models.Sorteo)
+        .where(models.Sorteo.id > despues_de_id)
+        .order_by(models.Sorteo.id)
+        .limit(tamano)
+    )
+    sorteos = session.exec(statement).all()
+    reconstruir(session, sorteos)
+    return [s.id for s in sorteos]
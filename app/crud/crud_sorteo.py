@@ -0,0 +1,128 @@
+from datetime import date
+from typing import List, Optional, Sequence, Tuple
+from sqlalchemy import tuple_
+from sqlmodel import Session, delete, select
+
+from app import models
+from app import schemas
+
+
+def obtener_por_numero(session: Session, numero_sorteo: str) -> Optional[models.Sorteo]:
+    statement = select(models.Sorteo).where(models.Sorteo.numero_sorteo == numero_sorteo)
+    return session.exec(statement).first()
+
+
+def resultado_publico(res: models.Resultado, prem: models.Premio) -> schemas.ResultadoPublico:
+    return schemas.ResultadoPublico(
+        id=res.id,
+        premio_id=prem.id,
+        premio=prem.titulo,
+        valor=prem.valor,
+        numero_ganador=res.numeros_ganadores
+    )
+
+
+def construir_sorteo_publico(session: Session, sorteo: models.Sorteo) -> schemas.SorteoPublicoRead:
+    query = (
+        select(models.Resultado, models.Premio)
+        .where(models.Resultado.sorteo_id == sorteo.id)
+        .join(models.Premio)
+    )
+    data = session.exec(query).all()
+
+    lista_resultados = [resultado_publico(res, prem) for res, prem in data]
+    return schemas.SorteoPublicoRead(
+        numero_sorteo=sorteo.numero_sorteo,
+        fecha=sorteo.fecha,
+        resultados=lista_resultados
+    )
+
+
+def eliminar(session: Session, sorteo_ids: Sequence[int]) -> int:
+    # Borrado por conjuntos: una sentencia por tabla sin importar cuántos resultados tenga cada sorteo.
+    # Las llaves foráneas declaran ON DELETE CASCADE, pero bases existentes y SQLite sin
+    # PRAGMA foreign_keys no lo aplican, así que los hijos se borran explícitamente.
+    if not sorteo_ids:
+        return 0
+    session.exec(delete(models.Resultado).where(models.Resultado.sorteo_id.in_(sorteo_ids)))
+    session.exec(delete(models.ResumenSorteo).where(models.ResumenSorteo.sorteo_id.in_(sorteo_ids)))
+    borrados = session.exec(delete(models.Sorteo).where(models.Sorteo.id.in_(sorteo_ids)))
+    return borrados.rowcount
+
+
+def lote_anterior_a(session: Session, fecha: date, limite: int) -> List[Tuple[int, str]]:
+    # (id, numero_sorteo) de los sorteos más antiguos que `fecha`, usando el índice (fecha, id)
+    statement = (
+        select(models.Sorteo.id, models.Sorteo.numero_sorteo)
+        .where(models.Sorteo.fecha < fecha)
+        .order_by(models.Sorteo.fecha, models.Sorteo.id)
+        .limit(limite)
+    )
+    return [tuple(fila) for fila in session.exec(statement).all()]
+
+
+COLUMNAS_SORTEO = ("numero_sorteo", "fecha", "plan_id", "id")
+
+
+def listar(
+    session: Session,
+    limite: int,
+    cursor: Optional[Tuple[date, int]] = None,
+    desde: Optional[date] = None,
+    hasta: Optional[date] = None,
+    plan_id: Optional[int] = None,
+    columnas: Sequence[str] = COLUMNAS_SORTEO,
+    descendente: bool = False,
+) -> List[dict]:
+    # Paginación por llave (fecha, id): cada página es un rango del índice, sin OFFSET
+    # fecha e id siempre se leen porque forman el cursor de la siguiente página
+    nombres = list(dict.fromkeys([*columnas, "fecha", "id"]))
+    statement = select(*[getattr(models.Sorteo, c) for c in nombres])
+
+    if desde:
+        statement = statement.where(models.Sorteo.fecha >= desde)
+    if hasta:
+        statement = statement.where(models.Sorteo.fecha <= hasta)
+    if plan_id is not None:
+        statement = statement.where(models.Sorteo.plan_id == plan_id)
+
+    llave = tuple_(models.Sorteo.fecha, models.Sorteo.id)
+    if cursor:
+        statement = statement.where(llave < cursor if descendente else llave > cursor)
+
+    if descendente:
+        statement = statement.order_by(models.Sorteo.fecha.desc(), models.Sorteo.id.desc())
+    else:
+        statement = statement.order_by(models.Sorteo.fecha, models.Sorteo.id)
+
+    return [fila._asdict() for fila in session.exec(statement.limit(limite)).all()]
+
+
+def consulta_exportacion(
+    desde: Optional[date] = None,
+    hasta: Optional[date] = None,
+    plan_id: Optional[int] = None,
+):
+    # Una fila por resultado (o una por sorteo sin resultados), ordenada para agrupar por sorteo
+    statement = (
+        select(
+            models.Sorteo.id,
+            models.Sorteo.numero_sorteo,
+            models.Sorteo.fecha,
+            models.Sorteo.plan_id,
+            models.Premio.id,
+            models.Premio.titulo,
+            models.Premio.valor,
+            models.Resultado.numeros_ganadores,
+        )
+        .outerjoin(models.Resultado, models.Resultado.sorteo_id == models.Sorteo.id)
+        .outerjoin(models.Premio, models.Premio.id == models.Resultado.premio_id)
+        .order_by(models.Sorteo.fecha, models.Sorteo.id, models.Resultado.id)
+    )
+    if desde:
+        statement = statement.where(models.Sorteo.fecha >= desde)
+    if hasta:
+        statement = statement.where(models.Sorteo.fecha <= hasta)
+    if plan_id is not None:
+        statement = statement.where(models.Sorteo.plan_id == plan_id)
+    return statement
@@ -0,0 +1,29 @@
+from typing import Dict
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select, update
+
+from app import models
+
+
+def leer(session: Session, *claves: str) -> Dict[str, int]:
+    statement = select(models.VersionRecurso).where(models.VersionRecurso.clave.in_(claves))
+    versiones = {v.clave: v.version for v in session.exec(statement).all()}
+    return {clave: versiones.get(clave, 0) for clave in claves}
+
+
+def incrementar(session: Session, *claves: str):
+    # Se ejecuta dentro de la transacción de la mutación; el commit lo hace quien llama
+    for clave in claves:
+        statement = (
+            update(models.VersionRecurso)
+            .where(models.VersionRecurso.clave == clave)
+            .values(version=models.VersionRecurso.version + 1)
+        )
+        if session.exec(statement).rowcount:
+            continue
+        try:
+            with session.begin_nested():
+                session.add(models.VersionRecurso(clave=clave, version=1))
+        except IntegrityError:
+            # Otra transacción creó la fila al mismo tiempo
+            session.exec(statement)
@@ -1,18 +1,51 @@
+# Primero que todo: mide el arranque en frío por fase (ver /sistema/arranque)
+from app.core.arranque import arranque
+
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+arranque.marcar("importar_fastapi")
+
 # Importamos la configuración de DB y los routers
-from app.core.database import create_db_and_tables
-from app.api import routes_planes, routes_premios, routes_sorteos, routes_resultados
+from app.core.database import async_engine, async_read_engine, engine
+from app.core import config
+from app.core.admision import AdmisionMiddleware
+from app.core.compresion import CompresionMiddleware
+from app.core.difusion import hub
+from app.core.esquema import verificar_esquema
+from app.core.metricas import MetricasMiddleware
+
+arranque.marcar("importar_base_de_datos")
+
+from app.api import (
+    routes_planes, routes_premios, routes_sorteos, routes_resultados, routes_sistema, routes_estadisticas
+)
+
+arranque.marcar("importar_routers")
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    create_db_and_tables()
+    arranque.reiniciar()
+    # Las migraciones corren aparte (python -m app.commands.migrar); aquí solo se compara la versión
+    verificar_esquema(engine)
+    arranque.marcar("verificar_esquema")
+    hub.iniciar()
+    arranque.terminar("iniciar_difusion")
     yield
+    hub.detener()
+    if async_engine is not None:
+        await async_engine.dispose()
+    if async_read_engine is not None and async_read_engine is not async_engine:
+        await async_read_engine.dispose()
 
 app = FastAPI(title="Lotería de Manizales API", lifespan=lifespan)
 
+# --- CONTROL DE ADMISIÓN ---
+# Se agrega primero para quedar por dentro de CORS: el 503 por saturación lleva los encabezados
+# CORS y el frontend puede leer Retry-After (las métricas, más afuera, lo siguen contando)
+app.add_middleware(AdmisionMiddleware)
+
 # --- CONFIGURACIÓN CORS ---
 origins = [
     "http://localhost:3000",
@@ -26,10 +59,25 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # El frontend necesita leer el cursor de paginación, el ETag y cuándo reintentar tras un 503
+    expose_headers=["X-Next-Cursor", "ETag", "Retry-After"],
 )
 
+# --- COMPRESIÓN ---
+# Por dentro de las métricas, para que la latencia medida incluya el tiempo de comprimir
+if config.COMPRESION_ACTIVA:
+    app.add_middleware(CompresionMiddleware)
+
+# --- MÉTRICAS ---
+# Se agrega al final para quedar por fuera de CORS y medir el request completo
+app.add_middleware(MetricasMiddleware)
+
 # --- INCLUSIÓN DE ROUTERS ---
 app.include_router(routes_planes.router)
 app.include_router(routes_premios.router)  # <--- Nuevo router incluido
 app.include_router(routes_sorteos.router)
-app.include_router(routes_resultados.router)
\ No newline at end of file
+app.include_router(routes_resultados.router)
+app.include_router(routes_estadisticas.router)
+app.include_router(routes_sistema.router)
+
+arranque.marcar("construir_app")
\ No newline at end of file
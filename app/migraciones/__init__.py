@@ -0,0 +1,15 @@
+from app.migraciones import (
+    m0001_esquema_inicial,
+    m0002_versiones_e_indices_sorteo,
+    m0003_resumen_sorteo,
+    m0004_indices_resultado_premio,
+)
+
+# En orden de aplicación: la versión del esquema es la posición en esta lista.
+# Nunca se edita una migración ya publicada; los cambios van en un módulo nuevo al final.
+MIGRACIONES = (
+    m0001_esquema_inicial,
+    m0002_versiones_e_indices_sorteo,
+    m0003_resumen_sorteo,
+    m0004_indices_resultado_premio,
+)
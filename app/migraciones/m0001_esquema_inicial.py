@@ -0,0 +1,45 @@
+from sqlalchemy import Column, Date, ForeignKey, Integer, MetaData, String, Table
+from sqlalchemy.engine import Connection
+
+# Tablas originales de la app. Las definiciones quedan congeladas aquí:
+# los cambios posteriores a app/models/ van en migraciones nuevas.
+DESCRIPCION = "Planes, premios, sorteos y resultados"
+
+metadata = MetaData()
+
+Table(
+    "planpremios", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("nombre", String, nullable=False, index=True),
+    Column("descripcion", String),
+)
+
+Table(
+    "premio", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("plan_id", Integer, ForeignKey("planpremios.id", ondelete="CASCADE"), nullable=False),
+    Column("titulo", String, nullable=False),
+    Column("valor", String, nullable=False),
+    Column("cantidad_balotas", Integer, nullable=False),
+)
+
+Table(
+    "sorteo", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("numero_sorteo", String, nullable=False, unique=True, index=True),
+    Column("fecha", Date, nullable=False),
+    Column("plan_id", Integer, ForeignKey("planpremios.id"), nullable=False),
+)
+
+Table(
+    "resultado", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("sorteo_id", Integer, ForeignKey("sorteo.id", ondelete="CASCADE"), nullable=False),
+    Column("premio_id", Integer, ForeignKey("premio.id"), nullable=False),
+    Column("numeros_ganadores", String, nullable=False),
+)
+
+
+def aplicar(conexion: Connection):
+    # checkfirst: las bases creadas antes con create_all se adoptan sin cambios
+    metadata.create_all(conexion, checkfirst=True)
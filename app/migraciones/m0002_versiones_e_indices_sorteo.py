@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, MetaData, String, Table, text
+from sqlalchemy.engine import Connection
+
+DESCRIPCION = "Contadores de versión para ETags e índices de paginación de sorteos"
+
+metadata = MetaData()
+
+Table(
+    "versionrecurso", metadata,
+    Column("clave", String, primary_key=True),
+    Column("version", Integer, nullable=False),
+)
+
+
+def aplicar(conexion: Connection):
+    metadata.create_all(conexion, checkfirst=True)
+    conexion.execute(text("CREATE INDEX IF NOT EXISTS ix_sorteo_fecha_id ON sorteo (fecha, id)"))
+    conexion.execute(text("CREATE INDEX IF NOT EXISTS ix_sorteo_plan_id_fecha_id ON sorteo (plan_id, fecha, id)"))
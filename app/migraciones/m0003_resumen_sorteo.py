@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Date, ForeignKey, Integer, MetaData, String, Table, Text
+from sqlalchemy.engine import Connection
+
+# Después de aplicarla, llenar el histórico con: python -m app.commands.reconstruir_resumenes
+DESCRIPCION = "Resumen público precalculado por sorteo"
+
+metadata = MetaData()
+
+# Solo para resolver la llave foránea; esta migración no crea la tabla sorteo
+Table("sorteo", metadata, Column("id", Integer, primary_key=True))
+
+resumen = Table(
+    "resumensorteo", metadata,
+    Column("sorteo_id", Integer, ForeignKey("sorteo.id", ondelete="CASCADE"), primary_key=True),
+    Column("numero_sorteo", String, nullable=False, unique=True, index=True),
+    Column("plan_id", Integer, nullable=False, index=True),
+    Column("fecha", Date, nullable=False),
+    Column("contenido", Text, nullable=False),
+)
+
+
+def aplicar(conexion: Connection):
+    resumen.create(conexion, checkfirst=True)
@@ -0,0 +1,13 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+# Falla si hay resultados o premios duplicados: deben depurarse antes de migrar
+DESCRIPCION = "Índices únicos (sorteo_id, premio_id) en resultado y (plan_id, titulo) en premio"
+
+
+def aplicar(conexion: Connection):
+    conexion.execute(text(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ux_resultado_sorteo_id_premio_id ON resultado (sorteo_id, premio_id)"
+    ))
+    conexion.execute(text("CREATE INDEX IF NOT EXISTS ix_resultado_premio_id ON resultado (premio_id)"))
+    conexion.execute(text("CREATE UNIQUE INDEX IF NOT EXISTS ux_premio_plan_id_titulo ON premio (plan_id, titulo)"))
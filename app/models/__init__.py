@@ -1,4 +1,6 @@
 from .plan import PlanPremios
 from .premio import Premio
 from .sorteo import Sorteo
-from .resultado import Resultado
\ No newline at end of file
+from .resultado import Resultado
+from .version import VersionRecurso
+from .resumen import ResumenSorteo
\ No newline at end of file
@@ -1,6 +1,8 @@
 from typing import TYPE_CHECKING, List, Optional
 from sqlmodel import SQLModel, Field, Relationship
 
+from .premio import ORDEN_PREMIOS
+
 # Esto solo lo lee el editor de código, no se ejecuta en tiempo real
 if TYPE_CHECKING:
     from .premio import Premio
@@ -11,5 +13,8 @@ class PlanPremios(SQLModel, table=True):
     nombre: str = Field(index=True)
     descripcion: Optional[str] = None
 
-    premios: List["Premio"] = Relationship(back_populates="plan")
+    # Orden explícito: sin él, SQLite devuelve los premios según el índice único (plan_id, titulo)
+    premios: List["Premio"] = Relationship(
+        back_populates="plan", sa_relationship_kwargs={"order_by": list(ORDEN_PREMIOS)}
+    )
     sorteos: List["Sorteo"] = Relationship(back_populates="plan")
\ No newline at end of file
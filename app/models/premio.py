@@ -1,4 +1,5 @@
 from typing import TYPE_CHECKING, List, Optional
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field, Relationship
 
 if TYPE_CHECKING:
@@ -6,11 +7,21 @@ if TYPE_CHECKING:
     from .resultado import Resultado
 
 class Premio(SQLModel, table=True):
+    # Los resultados se publican por título de premio dentro del plan
+    __table_args__ = (
+        Index("ux_premio_plan_id_titulo", "plan_id", "titulo", unique=True),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
-    plan_id: int = Field(foreign_key="planpremios.id")
+    plan_id: int = Field(foreign_key="planpremios.id", ondelete="CASCADE")
     titulo: str
     valor: str
     cantidad_balotas: int
 
     plan: Optional["PlanPremios"] = Relationship(back_populates="premios")
-    resultados: List["Resultado"] = Relationship(back_populates="premio")
\ No newline at end of file
+    resultados: List["Resultado"] = Relationship(back_populates="premio")
+
+
+# Orden de los premios dentro de un plan, compartido por la relación PlanPremios.premios y
+# crud_plan.listar_filas (JSON_RAPIDO) para que ambas rutas devuelvan el mismo JSON
+ORDEN_PREMIOS = (Premio.id,)
@@ -1,4 +1,5 @@
 from typing import TYPE_CHECKING, Optional
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field, Relationship
 
 if TYPE_CHECKING:
@@ -6,8 +7,14 @@ if TYPE_CHECKING:
     from .premio import Premio
 
 class Resultado(SQLModel, table=True):
+    # Un resultado por premio y sorteo; el índice único también sirve las búsquedas por sorteo_id
+    __table_args__ = (
+        Index("ux_resultado_sorteo_id_premio_id", "sorteo_id", "premio_id", unique=True),
+        Index("ix_resultado_premio_id", "premio_id"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
-    sorteo_id: int = Field(foreign_key="sorteo.id")
+    sorteo_id: int = Field(foreign_key="sorteo.id", ondelete="CASCADE")
     premio_id: int = Field(foreign_key="premio.id")
     numeros_ganadores: str
 
@@ -0,0 +1,13 @@
+from datetime import date
+from sqlalchemy import Column, Text
+from sqlmodel import SQLModel, Field
+
+# Tabla: Resumen público por sorteo (desnormalizada)
+# Guarda el JSON de SorteoPublicoRead listo para servir; se actualiza en la misma
+# transacción que cualquier cambio en el sorteo, sus resultados o los premios de su plan.
+class ResumenSorteo(SQLModel, table=True):
+    sorteo_id: int = Field(primary_key=True, foreign_key="sorteo.id", ondelete="CASCADE")
+    numero_sorteo: str = Field(unique=True, index=True)
+    plan_id: int = Field(index=True)
+    fecha: date
+    contenido: str = Field(sa_column=Column(Text, nullable=False))
@@ -1,5 +1,6 @@
 from typing import TYPE_CHECKING, List, Optional
 from datetime import date
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field, Relationship
 
 if TYPE_CHECKING:
@@ -7,6 +8,12 @@ if TYPE_CHECKING:
     from .resultado import Resultado
 
 class Sorteo(SQLModel, table=True):
+    # Índices para la paginación por (fecha, id) y el filtro por plan
+    __table_args__ = (
+        Index("ix_sorteo_fecha_id", "fecha", "id"),
+        Index("ix_sorteo_plan_id_fecha_id", "plan_id", "fecha", "id"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     numero_sorteo: str = Field(unique=True, index=True)
     fecha: date
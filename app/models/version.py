@@ -0,0 +1,7 @@
+from sqlmodel import SQLModel, Field
+
+# Contadores de versión por recurso (ej. "sorteos", "planes").
+# Se incrementan en la misma transacción que la mutación y se usan para calcular ETags.
+class VersionRecurso(SQLModel, table=True):
+    clave: str = Field(primary_key=True)
+    version: int = 0
@@ -1,4 +1,5 @@
 from .premio import PremioBase, PremioCreate, PremioRead, PremioUpdate
-from .plan import PlanBase, PlanCreate, PlanRead, PlanUpdate
+from .plan import PlanBase, PlanCreate, PlanRead, PlanUpdate, PlanImportRead
 from .sorteo import SorteoBase, SorteoCreate, SorteoRead, SorteoUpdate, ResultadoPublico, SorteoPublicoRead
-from .resultado import ResultadoCreate, ResultadoRead
\ No newline at end of file
+from .resultado import ResultadoCreate, ResultadoRead, ResultadoBulkItem, ResultadoBulkCreate
+from .verificacion import BilleteConsulta, VerificacionRead, VerificacionLoteCreate, VerificacionLoteRead
\ No newline at end of file
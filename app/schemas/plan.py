@@ -16,4 +16,12 @@ class PlanRead(PlanBase):
 
 class PlanUpdate(SQLModel):
     nombre: Optional[str] = None
-    descripcion: Optional[str] = None
\ No newline at end of file
+    descripcion: Optional[str] = None
+
+# --- IMPORTACIÓN MASIVA ---
+class PlanImportRead(SQLModel):
+    ok: bool
+    planes: int
+    premios: int
+    lotes: int
+    ids: List[int]
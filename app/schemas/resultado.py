@@ -1,3 +1,4 @@
+from typing import List
 from sqlmodel import SQLModel
 
 class ResultadoCreate(SQLModel):
@@ -9,4 +10,12 @@ class ResultadoRead(SQLModel):
     id: int
     sorteo_id: int
     premio_id: int
-    numeros_ganadores: str
\ No newline at end of file
+    numeros_ganadores: str
+
+# --- PUBLICACIÓN MASIVA ---
+class ResultadoBulkItem(SQLModel):
+    premio_titulo: str
+    numeros_ganadores: str
+
+class ResultadoBulkCreate(SQLModel):
+    resultados: List[ResultadoBulkItem]
@@ -0,0 +1,33 @@
+from typing import List, Optional
+from pydantic import field_validator
+from sqlmodel import SQLModel
+
+from .sorteo import ResultadoPublico
+
+class BilleteConsulta(SQLModel):
+    numero: str
+    serie: Optional[str] = None
+
+    @field_validator("numero", "serie")
+    @classmethod
+    def solo_digitos(cls, valor: Optional[str]) -> Optional[str]:
+        if valor is None:
+            return valor
+        valor = valor.strip()
+        if not valor.isdigit():
+            raise ValueError("Debe contener solo dígitos")
+        return valor
+
+class VerificacionRead(SQLModel):
+    numero: str
+    serie: Optional[str] = None
+    ganador: bool
+    premios: List[ResultadoPublico] = []
+
+class VerificacionLoteCreate(SQLModel):
+    billetes: List[BilleteConsulta]
+
+class VerificacionLoteRead(SQLModel):
+    numero_sorteo: str
+    ganadores: int
+    resultados: List[VerificacionRead] = []
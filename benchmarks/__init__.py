@@ -0,0 +1,21 @@
+import atexit
+import os
+import tempfile
+
+
+def sqlite_temporal() -> str:
+    # URL de una base SQLite nueva en un archivo temporal. mkstemp crea el archivo (vacío) sin la
+    # carrera de mktemp; SQLite lo toma como una base sin tablas. Se borra al terminar el proceso.
+    descriptor, ruta = tempfile.mkstemp(suffix=".db")
+    os.close(descriptor)
+    atexit.register(_borrar, ruta)
+    return f"sqlite:///{ruta}"
+
+
+def _borrar(ruta: str):
+    # También los archivos auxiliares del modo WAL
+    for archivo in (ruta, ruta + "-wal", ruta + "-shm", ruta + "-journal"):
+        try:
+            os.unlink(archivo)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,201 @@
+# Latencia (p50/p95/p99) y throughput de cada router de app/api con barridos de concurrencia.
+# Corre la app en el mismo proceso (httpx.ASGITransport) sobre una base sembrada con benchmarks.datos.
+#
+#   python -m benchmarks.bench_api --concurrencias 1,10,50 --requests 500 --salida bench.json
+#   python -m benchmarks.bench_api --comparar bench_anterior.json
+#
+# Usa una base SQLite temporal salvo que se pase DATABASE_URL (debe estar vacía).
+# Requiere httpx (pip install -r requirements-dev.txt).
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+from benchmarks import sqlite_temporal
+
+if "DATABASE_URL" not in os.environ:
+    os.environ["DATABASE_URL"] = sqlite_temporal()
+
+
+# Las mutaciones son tráfico de administración: se miden solo sin concurrencia
+# (además SQLite serializa las escrituras y devolvería "database is locked")
+ESCRITURAS = {("premios", "actualizar"), ("resultados", "actualizar")}
+
+
+def _escenarios(datos: dict) -> dict:
+    # (router, escenario) -> función que arma (método, ruta, kwargs) para cada request
+    numeros, plan_ids, resultados = datos["numeros"], datos["plan_ids"], datos["resultados"]
+    premio = datos["premio"]
+    elegir = random.Random(1).choice
+    return {
+        ("planes", "listar"): lambda: ("GET", "/planes/", {}),
+        ("planes", "obtener"): lambda: ("GET", f"/planes/{elegir(plan_ids)}", {}),
+        ("premios", "actualizar"): lambda: (
+            "PUT", f"/premios/{premio['id']}", {"json": {"valor": premio["valor"]}}
+        ),
+        ("sorteos", "listar"): lambda: ("GET", "/sorteos/", {"params": {"limit": 100, "orden": "desc"}}),
+        ("sorteos", "publico"): lambda: ("GET", f"/sorteos/{elegir(numeros)}/publico", {}),
+        ("sorteos", "verificar"): lambda: (
+            "GET", f"/sorteos/{elegir(numeros)}/verificar", {"params": {"numero": f"{random.randrange(10000):04d}"}}
+        ),
+        ("resultados", "actualizar"): lambda: (
+            "PUT", "/resultados/{}/{}".format(*elegir(resultados)), {"params": {"numeros_nuevos": "1234567"}}
+        ),
+        ("estadisticas", "frecuencias"): lambda: ("GET", "/estadisticas/", {"params": {"cifras": 2}}),
+        ("sistema", "metrics"): lambda: ("GET", "/metrics", {}),
+    }
+
+
+def _datos_de_prueba() -> dict:
+    from sqlmodel import Session, select
+    from app import models
+    from app.core.database import engine
+
+    with Session(engine) as session:
+        numeros = session.exec(select(models.Sorteo.numero_sorteo)).all()
+        plan_ids = session.exec(select(models.PlanPremios.id)).all()
+        resultados = session.exec(
+            select(models.Resultado.sorteo_id, models.Resultado.premio_id)
+            .join(models.Premio)
+            .where(models.Premio.titulo == "MAYOR")
+        ).all()
+        premio = session.exec(select(models.Premio).where(models.Premio.titulo == "MAYOR")).first()
+        return {
+            "numeros": list(numeros),
+            "plan_ids": list(plan_ids),
+            "resultados": [tuple(r) for r in resultados],
+            "premio": {"id": premio.id, "valor": premio.valor},
+        }
+
+
+def _percentil(ordenadas: list, p: float) -> float:
+    return round(ordenadas[min(len(ordenadas) - 1, int(len(ordenadas) * p))] * 1000, 2)
+
+
+async def _medir(client, peticion, total: int, concurrencia: int) -> dict:
+    pendientes = iter(range(total))
+    latencias, errores = [], 0
+
+    async def trabajador():
+        nonlocal errores
+        for _ in pendientes:
+            metodo, ruta, kwargs = peticion()
+            t0 = time.perf_counter()
+            r = await client.request(metodo, ruta, **kwargs)
+            latencias.append(time.perf_counter() - t0)
+            if r.status_code >= 400:
+                errores += 1
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*[trabajador() for _ in range(concurrencia)])
+    duracion = time.perf_counter() - t0
+
+    latencias.sort()
+    return {
+        "requests": total,
+        "errores": errores,
+        "rps": round(total / duracion, 1),
+        "p50_ms": _percentil(latencias, 0.50),
+        "p95_ms": _percentil(latencias, 0.95),
+        "p99_ms": _percentil(latencias, 0.99),
+    }
+
+
+async def _ejecutar(args) -> list:
+    import httpx
+    from app.main import app
+
+    random.seed(args.semilla)
+    escenarios = _escenarios(_datos_de_prueba())
+    filtro = set(args.routers.split(",")) if args.routers else None
+    filas = []
+    async with app.router.lifespan_context(app):
+        # Una excepción en la app cuenta como error (500) en vez de abortar la corrida
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for (router, escenario), peticion in escenarios.items():
+                if filtro and router not in filtro:
+                    continue
+                # Calentamiento: cachés, índices y estadísticas quedan construidos antes de medir
+                await _medir(client, peticion, min(args.requests, 20), 1)
+                concurrencias = [1] if (router, escenario) in ESCRITURAS else args.concurrencias
+                for concurrencia in concurrencias:
+                    medicion = await _medir(client, peticion, args.requests, concurrencia)
+                    filas.append({"router": router, "escenario": escenario, "concurrencia": concurrencia, **medicion})
+                    print(
+                        f"{router:13} {escenario:12} c={concurrencia:<4} {medicion['rps']:>9} rps  "
+                        f"p50 {medicion['p50_ms']:>8} ms  p95 {medicion['p95_ms']:>8} ms  "
+                        f"p99 {medicion['p99_ms']:>8} ms  errores {medicion['errores']}"
+                    )
+    return filas
+
+
+def _commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "desconocido"
+
+
+def _comparar(anterior: dict, actual: dict):
+    # Variación porcentual de p95 y rps respecto a una corrida anterior
+    base = {(f["router"], f["escenario"], f["concurrencia"]): f for f in anterior["resultados"]}
+    print(f"\nComparación contra {anterior['commit']}:")
+    for fila in actual["resultados"]:
+        previa = base.get((fila["router"], fila["escenario"], fila["concurrencia"]))
+        if not previa:
+            continue
+        p95 = (fila["p95_ms"] - previa["p95_ms"]) / previa["p95_ms"] * 100 if previa["p95_ms"] else 0.0
+        rps = (fila["rps"] - previa["rps"]) / previa["rps"] * 100 if previa["rps"] else 0.0
+        print(f"{fila['router']:13} {fila['escenario']:12} c={fila['concurrencia']:<4} p95 {p95:+7.1f}%  rps {rps:+7.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrencias", type=lambda v: [int(c) for c in v.split(",")], default=[1, 10, 50])
+    parser.add_argument("--requests", type=int, default=500, help="Requests por escenario y concurrencia")
+    parser.add_argument("--routers", default="", help="Solo estos routers, separados por coma")
+    parser.add_argument("--anios", type=int, default=10)
+    parser.add_argument("--planes", type=int, default=3)
+    parser.add_argument("--secos", type=int, default=40)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--salida", default="bench_api.json")
+    parser.add_argument("--comparar", help="JSON de una corrida anterior")
+    args = parser.parse_args()
+
+    from app.core import config
+    from app.core.database import engine
+    from benchmarks.datos import sembrar
+
+    sembrado = sembrar(engine, args.anios, args.planes, args.secos, args.semilla)
+    print(f"Datos: {sembrado}")
+    resultados = asyncio.run(_ejecutar(args))
+
+    informe = {
+        "commit": _commit(),
+        "fecha": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "base_de_datos": engine.dialect.name,
+        "db_async": config.DB_ASYNC,
+        "datos": sembrado,
+        "parametros": {"requests": args.requests, "concurrencias": args.concurrencias, "semilla": args.semilla},
+        "resultados": resultados,
+    }
+    with open(args.salida, "w", encoding="utf-8") as archivo:
+        json.dump(informe, archivo, indent=2, ensure_ascii=False)
+    print(f"Resultados en {args.salida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as archivo:
+            _comparar(json.load(archivo), informe)
+
+
+if __name__ == "__main__":
+    main()
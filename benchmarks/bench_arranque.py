@@ -0,0 +1,118 @@
+# Arranque en frío: cada corrida es un proceso nuevo que importa app.main y ejecuta el lifespan,
+# como una instancia que escala desde cero. Reporta la mediana por fase (app/core/arranque.py)
+# y termina con código 1 si la mediana total supera el presupuesto, para usarlo en CI.
+#
+#   python -m benchmarks.bench_arranque --corridas 10 --presupuesto-ms 1500
+#   python -m benchmarks.bench_arranque --detalle 15     # módulos que más tardan en importarse
+#
+# Usa una base SQLite temporal salvo que se pase DATABASE_URL.
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks import sqlite_temporal
+
+
+def _hijo():
+    import asyncio
+
+    from app.main import app
+    from app.core.arranque import arranque
+
+    async def ciclo():
+        async with app.router.lifespan_context(app):
+            pass
+
+    asyncio.run(ciclo())
+    print(json.dumps(arranque.estadisticas()))
+
+
+def _corrida(env: dict) -> dict:
+    t0 = time.perf_counter()
+    salida = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_arranque", "--hijo"],
+        env=env, capture_output=True, text=True, check=True
+    )
+    datos = json.loads(salida.stdout.strip().splitlines()[-1])
+    # Incluye levantar el intérprete, que no se ve desde dentro de la app
+    datos["proceso_ms"] = round((time.perf_counter() - t0) * 1000, 2)
+    return datos
+
+
+def _detalle(env: dict, top: int):
+    # -X importtime escribe en stderr: "import time: propio | acumulado | módulo" (microsegundos)
+    salida = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "benchmarks.bench_arranque", "--hijo"],
+        env=env, capture_output=True, text=True, check=True
+    )
+    modulos = []
+    for linea in salida.stderr.splitlines():
+        if not linea.startswith("import time:") or "self [us]" in linea:
+            continue
+        propio, acumulado, modulo = linea[len("import time:"):].split("|")
+        modulos.append((int(propio), int(acumulado), modulo.strip()))
+    print(f"\n{'módulo':50} {'propio':>10} {'acumulado':>10}")
+    for propio, acumulado, modulo in sorted(modulos, reverse=True)[:top]:
+        print(f"{modulo:50} {propio / 1000:>7.1f} ms {acumulado / 1000:>7.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--corridas", type=int, default=10)
+    parser.add_argument("--presupuesto-ms", type=float, default=1500, help="Mediana máxima del arranque de la app")
+    parser.add_argument("--detalle", type=int, default=0, help="Muestra los N módulos más lentos de importar")
+    parser.add_argument("--salida", help="Guarda los resultados en este JSON")
+    parser.add_argument("--hijo", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.hijo:
+        return _hijo()
+
+    env = dict(os.environ)
+    if "DATABASE_URL" not in env:
+        env["DATABASE_URL"] = sqlite_temporal()
+    # El esquema se deja al día antes de medir: el lifespan solo verifica la versión
+    subprocess.run([sys.executable, "-m", "app.commands.migrar"], env=env, capture_output=True, check=True)
+
+    # Una corrida de calentamiento: la primera compila los .pyc y no representa un arranque normal
+    _corrida(env)
+    corridas = [_corrida(env) for _ in range(args.corridas)]
+
+    fases = list(corridas[0]["fases_ms"])
+    filas = {
+        fase: [c["fases_ms"][fase] for c in corridas] for fase in fases
+    }
+    filas["total app"] = [c["total_ms"] for c in corridas]
+    filas["proceso completo"] = [c["proceso_ms"] for c in corridas]
+
+    print(f"{'fase':28} {'mediana':>10} {'máximo':>10}")
+    resumen = {}
+    for nombre, valores in filas.items():
+        resumen[nombre] = {"mediana_ms": round(statistics.median(valores), 2), "maximo_ms": round(max(valores), 2)}
+        print(f"{nombre:28} {resumen[nombre]['mediana_ms']:>7.1f} ms {resumen[nombre]['maximo_ms']:>7.1f} ms")
+
+    if args.detalle:
+        _detalle(env, args.detalle)
+
+    mediana = resumen["total app"]["mediana_ms"]
+    dentro = mediana <= args.presupuesto_ms
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            json.dump(
+                {"presupuesto_ms": args.presupuesto_ms, "dentro_del_presupuesto": dentro, "fases": resumen},
+                archivo, indent=2, ensure_ascii=False
+            )
+        print(f"Resultados en {args.salida}")
+
+    print(f"\nArranque de la app: {mediana:.1f} ms (presupuesto {args.presupuesto_ms:.0f} ms)")
+    if not dentro:
+        print("FALLA: el arranque superó el presupuesto")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
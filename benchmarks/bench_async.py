@@ -0,0 +1,126 @@
+# Compara peticiones por segundo entre el modo síncrono y el asíncrono (DB_ASYNC=1).
+# Cada modo corre en un proceso aparte porque el motor se elige al importar la app.
+#
+#   python -m benchmarks.bench_async --requests 2000 --concurrency 200
+#
+# Usa una base SQLite temporal salvo que se pase DATABASE_URL.
+# Requiere httpx (pip install -r requirements-dev.txt).
+#
+# Medido sobre SQLite local (1500 requests a /sorteos/?limit=50), el modo async es MÁS LENTO:
+#
+#   concurrencia   sync rps   async rps   sync p99   async p99
+#        1           262        248         5.8 ms     6.6 ms
+#       20           253        210       128 ms     167 ms
+#      100           219        204       573 ms    1410 ms
+#
+# En otra corrida a c=100 salió 256 frente a 167 rps. SQLite no tiene espera de red que el event
+# loop pueda aprovechar, y aiosqlite suma un salto de hilo más el puente greenlet de run_sync en
+# cada consulta. Con SQLite no conviene DB_ASYNC=1. La ganancia esperada es con Postgres en red,
+# donde los requests pasan la mayor parte del tiempo esperando I/O, pero todavía no está medida:
+# corra este script con DATABASE_URL apuntando a Postgres antes de activarlo en producción.
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import date, timedelta
+
+from benchmarks import sqlite_temporal
+
+
+def _sembrar(n_sorteos: int):
+    from sqlmodel import Session, select
+    from app import models
+    from app.core.database import engine
+    from app.core.esquema import migrar
+
+    migrar(engine)
+    with Session(engine) as session:
+        # Una base ya sembrada por una corrida anterior (ej. Postgres con DATABASE_URL) se reutiliza
+        if session.exec(select(models.Sorteo.id).where(models.Sorteo.numero_sorteo == "B0")).first():
+            return
+        plan = models.PlanPremios(nombre="Bench")
+        session.add(plan)
+        session.flush()
+        session.add(models.Premio(plan_id=plan.id, titulo="MAYOR", valor="1", cantidad_balotas=7))
+        inicio = date(2015, 1, 1)
+        for i in range(n_sorteos):
+            session.add(models.Sorteo(numero_sorteo=f"B{i}", fecha=inicio + timedelta(days=i), plan_id=plan.id))
+        session.commit()
+
+
+async def _medir(path: str, total: int, concurrencia: int) -> dict:
+    import httpx
+    from app.main import app
+
+    pendientes = iter(range(total))
+    latencias = []
+
+    async def trabajador(client):
+        for _ in pendientes:
+            t0 = time.perf_counter()
+            r = await client.get(path)
+            r.raise_for_status()
+            latencias.append(time.perf_counter() - t0)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.get(path)
+        t0 = time.perf_counter()
+        await asyncio.gather(*[trabajador(client) for _ in range(concurrencia)])
+        duracion = time.perf_counter() - t0
+
+    latencias.sort()
+    return {
+        "rps": round(total / duracion, 1),
+        "p50_ms": round(latencias[len(latencias) // 2] * 1000, 2),
+        "p99_ms": round(latencias[int(len(latencias) * 0.99) - 1] * 1000, 2),
+    }
+
+
+def _hijo(args):
+    resultado = asyncio.run(_medir(args.path, args.requests, args.concurrency))
+    print(json.dumps(resultado))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--sorteos", type=int, default=500)
+    parser.add_argument("--path", default="/sorteos/?limit=50")
+    parser.add_argument("--hijo", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--sembrar", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.sembrar:
+        return _sembrar(args.sorteos)
+    if args.hijo:
+        return _hijo(args)
+
+    # Los dos modos miden la misma base, sembrada una sola vez antes de lanzarlos
+    base = dict(os.environ)
+    base.setdefault("DATABASE_URL", sqlite_temporal())
+    subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_async", "--sembrar", *sys.argv[1:]],
+        env=dict(base, DB_ASYNC="0"), check=True
+    )
+
+    resultados = {}
+    for modo in ("sync", "async"):
+        env = dict(base, DB_ASYNC="1" if modo == "async" else "0")
+        salida = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_async", "--hijo", *sys.argv[1:]],
+            env=env, capture_output=True, text=True, check=True
+        )
+        resultados[modo] = json.loads(salida.stdout.strip().splitlines()[-1])
+        print(modo, json.dumps(resultados[modo]))
+
+    relacion = resultados["async"]["rps"] / resultados["sync"]["rps"]
+    print(f"async / sync: {relacion:.2f}x rps ({'más rápido' if relacion > 1 else 'más lento'} en modo async)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# Bytes transferidos por endpoint: sin comprimir, gzip, brotli y en modo compacto.
+# Siembra la base con benchmarks.datos y consulta la app en el mismo proceso.
+#
+#   python -m benchmarks.bench_compresion --anios 10 --salida compresion.json
+#
+# Usa una base SQLite temporal salvo que se pase DATABASE_URL (debe estar vacía).
+# Requiere httpx (pip install -r requirements-dev.txt).
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from benchmarks import sqlite_temporal
+
+if "DATABASE_URL" not in os.environ:
+    os.environ["DATABASE_URL"] = sqlite_temporal()
+
+# (endpoint, respuesta completa contra la que se calcula el ahorro)
+ENDPOINTS = (
+    ("/planes/", "/planes/"),
+    ("/planes/?compacto=true", "/planes/"),
+    ("/planes/?premios=false&compacto=true", "/planes/"),
+    ("/sorteos/?limit=1000", "/sorteos/?limit=1000"),
+    ("/sorteos/?limit=1000&compacto=true", "/sorteos/?limit=1000"),
+    ("/sorteos/?limit=1000&campos=numero_sorteo,fecha", "/sorteos/?limit=1000"),
+    ("/sorteos/{numero}/publico", "/sorteos/{numero}/publico"),
+    ("/sorteos/export?format=ndjson", "/sorteos/export?format=ndjson"),
+    ("/sorteos/export?format=csv", "/sorteos/export?format=csv"),
+)
+
+CODIFICACIONES = ("identity", "gzip", "br")
+
+
+async def _medir(numero: str) -> list:
+    import httpx
+    from app.main import app
+
+    filas = []
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for plantilla, referencia in ENDPOINTS:
+                ruta = plantilla.format(numero=numero)
+                fila = {"endpoint": plantilla, "referencia": referencia}
+                for codificacion in CODIFICACIONES:
+                    t0 = time.perf_counter()
+                    r = await client.get(ruta, headers={"Accept-Encoding": codificacion})
+                    r.raise_for_status()
+                    fila[f"{codificacion}_ms"] = round((time.perf_counter() - t0) * 1000, 2)
+                    fila[f"{codificacion}_bytes"] = r.num_bytes_downloaded
+                    fila[f"{codificacion}_aplicada"] = r.headers.get("content-encoding", "identity")
+                filas.append(fila)
+    return filas
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--anios", type=int, default=10)
+    parser.add_argument("--planes", type=int, default=3)
+    parser.add_argument("--secos", type=int, default=40)
+    parser.add_argument("--salida", help="Guarda los resultados en este JSON")
+    args = parser.parse_args()
+
+    from app.core.database import engine
+    from benchmarks.datos import sembrar
+
+    print(f"Datos: {sembrar(engine, args.anios, args.planes, args.secos)}")
+    filas = asyncio.run(_medir("4000"))
+
+    base = {f["endpoint"]: f["identity_bytes"] for f in filas}
+    print(f"\n{'endpoint':48} {'sin comprimir':>14} {'gzip':>10} {'br':>10} {'ahorro br':>10}")
+    for fila in filas:
+        original = base[fila["referencia"]]
+        fila["ahorro_bytes"] = original - fila["br_bytes"]
+        fila["ahorro_pct"] = round(fila["ahorro_bytes"] / original * 100, 1) if original else 0.0
+        print(
+            f"{fila['endpoint']:48} {fila['identity_bytes']:>14} {fila['gzip_bytes']:>10} "
+            f"{fila['br_bytes']:>10} {fila['ahorro_pct']:>9}%"
+        )
+        if fila["br_aplicada"] != "br":
+            print(f"{'':48} (br no aplicada: {fila['br_aplicada']})")
+
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            json.dump(filas, archivo, indent=2, ensure_ascii=False)
+        print(f"Resultados en {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+# Latencia de las búsquedas sobre Resultado y Premio con y sin los índices compuestos.
+# Siembra un histórico grande, mide con los índices borrados y vuelve a medir tras crearlos.
+#
+#   python -m benchmarks.bench_indices --sorteos 20000 --premios 20 --consultas 2000
+#
+# Usa una base SQLite temporal salvo que se pase DATABASE_URL (debe estar vacía).
+import argparse
+import os
+import random
+import time
+from datetime import date, timedelta
+
+from benchmarks import sqlite_temporal
+
+if "DATABASE_URL" not in os.environ:
+    os.environ["DATABASE_URL"] = sqlite_temporal()
+
+from sqlmodel import Session, insert, select
+
+from app import models
+from app.core.database import engine
+from app.core.esquema import migrar
+
+INDICES = (
+    models.Resultado.__table__.indexes | models.Premio.__table__.indexes
+)
+
+
+def _sembrar(n_sorteos: int, n_premios: int):
+    migrar(engine)
+    with Session(engine) as session:
+        plan = models.PlanPremios(nombre="Bench")
+        session.add(plan)
+        session.flush()
+        premio_ids = session.scalars(
+            insert(models.Premio).returning(models.Premio.id),
+            [
+                {"plan_id": plan.id, "titulo": f"PREMIO {i}", "valor": "1", "cantidad_balotas": 4}
+                for i in range(n_premios)
+            ],
+        ).all()
+        inicio = date(1990, 1, 1)
+        sorteo_ids = session.scalars(
+            insert(models.Sorteo).returning(models.Sorteo.id),
+            [
+                {"numero_sorteo": str(i), "fecha": inicio + timedelta(days=i), "plan_id": plan.id}
+                for i in range(n_sorteos)
+            ],
+        ).all()
+        filas = [
+            {"sorteo_id": s, "premio_id": p, "numeros_ganadores": f"{random.randrange(10000):04d}"}
+            for s in sorteo_ids for p in premio_ids
+        ]
+        for i in range(0, len(filas), 50000):
+            session.execute(insert(models.Resultado), filas[i:i + 50000])
+        session.commit()
+        return plan.id, list(sorteo_ids), list(premio_ids)
+
+
+def _medir(consultas) -> dict:
+    latencias = []
+    with Session(engine) as session:
+        for statement in consultas:
+            t0 = time.perf_counter()
+            session.exec(statement).all()
+            latencias.append(time.perf_counter() - t0)
+    latencias.sort()
+    return {
+        "p50_ms": round(latencias[len(latencias) // 2] * 1000, 3),
+        "p99_ms": round(latencias[int(len(latencias) * 0.99) - 1] * 1000, 3),
+    }
+
+
+def _escenarios(plan_id, sorteo_ids, premio_ids, n: int) -> dict:
+    titulos = [f"PREMIO {i}" for i in range(len(premio_ids))]
+    return {
+        # eliminar_resultado / actualizar_resultado
+        "resultado_por_sorteo_y_premio": [
+            select(models.Resultado).where(
+                models.Resultado.sorteo_id == random.choice(sorteo_ids),
+                models.Resultado.premio_id == random.choice(premio_ids),
+            )
+            for _ in range(n)
+        ],
+        # JOIN de la consulta pública
+        "publico_por_sorteo": [
+            select(models.Resultado, models.Premio)
+            .where(models.Resultado.sorteo_id == random.choice(sorteo_ids))
+            .join(models.Premio)
+            for _ in range(n)
+        ],
+        # crear_resultado
+        "premio_por_plan_y_titulo": [
+            select(models.Premio).where(
+                models.Premio.plan_id == plan_id, models.Premio.titulo == random.choice(titulos)
+            )
+            for _ in range(n)
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sorteos", type=int, default=20000)
+    parser.add_argument("--premios", type=int, default=20)
+    parser.add_argument("--consultas", type=int, default=2000)
+    args = parser.parse_args()
+
+    random.seed(0)
+    plan_id, sorteo_ids, premio_ids = _sembrar(args.sorteos, args.premios)
+    print(f"{len(sorteo_ids)} sorteos, {len(sorteo_ids) * len(premio_ids)} resultados")
+    escenarios = _escenarios(plan_id, sorteo_ids, premio_ids, args.consultas)
+
+    for indice in INDICES:
+        indice.drop(engine)
+    sin_indices = {nombre: _medir(consultas) for nombre, consultas in escenarios.items()}
+    for indice in INDICES:
+        indice.create(engine)
+    con_indices = {nombre: _medir(consultas) for nombre, consultas in escenarios.items()}
+
+    for nombre in escenarios:
+        print(f"{nombre:32} sin índices {sin_indices[nombre]}  con índices {con_indices[nombre]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# Costo de serializar una respuesta según su tamaño: ruta por defecto (validación contra el
+# response_model + json estándar, como hace FastAPI) frente a la ruta rápida (JSON_RAPIDO=1).
+# No toca la BD: mide solo la conversión de filas ya leídas a bytes. En /publico ambas rutas
+# parten de lo que guarda cache_publico: el modelo ya parseado (por defecto) o el JSON crudo
+# (rápida); el parseo del resumen ocurre una vez por carga y no se cuenta.
+#
+# Referencia (200 repeticiones): listados 35-70x más baratos (1000 sorteos: 9.8 ms -> 0.2 ms).
+# /publico ahorra de 25 µs (10 resultados) a 0.4 ms (200 resultados) por respuesta; la razón
+# sale alta solo porque la ruta rápida se reduce a codificar el str a bytes.
+#
+#   python -m benchmarks.bench_serializacion --repeticiones 200
+import argparse
+import json
+import time
+from datetime import date, timedelta
+from typing import List
+
+import orjson
+from pydantic import TypeAdapter
+
+from app import schemas
+
+
+def _por_defecto(adaptador: TypeAdapter):
+    # Lo que hace FastAPI con response_model: validar, volcar a tipos JSON y codificar con json
+    def serializar(datos):
+        validado = adaptador.validate_python(datos, from_attributes=True)
+        return json.dumps(
+            adaptador.dump_python(validado, mode="json"), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        ).encode("utf-8")
+    return serializar
+
+
+def _sorteos(n: int) -> List[dict]:
+    inicio = date(2000, 1, 1)
+    return [
+        {"numero_sorteo": str(4000 + i), "fecha": inicio + timedelta(weeks=i), "plan_id": 1, "id": i + 1}
+        for i in range(n)
+    ]
+
+
+def _planes(n: int, premios: int) -> List[dict]:
+    return [
+        {
+            "nombre": f"Plan {p}",
+            "descripcion": None,
+            "id": p,
+            "premios": [
+                {"titulo": f"SECO {i}", "valor": "1000000", "cantidad_balotas": 7, "id": p * premios + i, "plan_id": p}
+                for i in range(premios)
+            ],
+        }
+        for p in range(n)
+    ]
+
+
+def _publico(resultados: int) -> str:
+    return schemas.SorteoPublicoRead(
+        numero_sorteo="4000",
+        fecha=date(2024, 1, 3),
+        resultados=[
+            {"id": i, "premio_id": i, "premio": f"SECO {i}", "valor": "1000000", "numero_ganador": f"{i:07d}"}
+            for i in range(resultados)
+        ],
+    ).model_dump_json()
+
+
+def _medir(funcion, datos, repeticiones: int) -> tuple:
+    funcion(datos)
+    t0 = time.perf_counter()
+    for _ in range(repeticiones):
+        salida = funcion(datos)
+    return (time.perf_counter() - t0) / repeticiones * 1_000_000, len(salida)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeticiones", type=int, default=200)
+    args = parser.parse_args()
+
+    lista_sorteos = _por_defecto(TypeAdapter(List[schemas.SorteoRead]))
+    lista_planes = _por_defecto(TypeAdapter(List[schemas.PlanRead]))
+    publico = _por_defecto(TypeAdapter(schemas.SorteoPublicoRead))
+
+    # (nombre, datos por defecto, datos de la ruta rápida, serializador por defecto, rápido)
+    casos = []
+    # Hasta LIMITE_MAXIMO (1000): la API no devuelve páginas más grandes
+    for n in (1, 10, 100, 1000):
+        filas = _sorteos(n)
+        casos.append((f"GET /sorteos/ ({n} filas)", filas, filas, lista_sorteos, orjson.dumps))
+    for n in (1, 10, 100):
+        planes = _planes(n, 40)
+        casos.append((f"GET /planes/ ({n} planes x 40 premios)", planes, planes, lista_planes, orjson.dumps))
+    for n in (10, 50, 200):
+        contenido = _publico(n)
+        casos.append((
+            f"GET /sorteos/{{n}}/publico ({n} resultados)",
+            schemas.SorteoPublicoRead.model_validate_json(contenido),
+            contenido,
+            publico,
+            lambda c: c.encode("utf-8"),
+        ))
+
+    print(f"{'respuesta':44} {'bytes':>9} {'por defecto':>13} {'rápida':>10} {'aceleración':>12}")
+    for nombre, datos_defecto, datos_rapida, defecto, rapida in casos:
+        t_defecto, tamano = _medir(defecto, datos_defecto, args.repeticiones)
+        t_rapida, _ = _medir(rapida, datos_rapida, args.repeticiones)
+        print(f"{nombre:44} {tamano:>9} {t_defecto:>10.1f} µs {t_rapida:>7.1f} µs {t_defecto / t_rapida:>11.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# Generador de datos sintéticos con volúmenes realistas: años de sorteos semanales,
+# planes de premios completos (mayor + secos) y un resultado por premio en cada sorteo.
+#
+#   python -m benchmarks.datos --anios 10 --planes 3 --secos 40
+#
+# Escribe en DATABASE_URL (SQLite o Postgres); la base debe estar vacía. Es reproducible con --semilla.
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+from sqlmodel import Session, insert, select
+
+from app import models
+from app.core.esquema import migrar
+from app.crud import crud_resumen
+
+CIFRAS_NUMERO = 4
+CIFRAS_SERIE = 3
+LOTE_INSERCION = 20000
+
+
+def _catalogo(secos: int) -> list:
+    # El mayor y los secos se juegan con número y serie (7 cifras); las aproximaciones solo con el número
+    premios = [{"titulo": "MAYOR", "valor": "2000000000", "cantidad_balotas": CIFRAS_NUMERO + CIFRAS_SERIE}]
+    premios += [
+        {"titulo": f"SECO {i + 1}", "valor": str(50000000 // (i + 1)), "cantidad_balotas": CIFRAS_NUMERO + CIFRAS_SERIE}
+        for i in range(secos)
+    ]
+    premios += [
+        {"titulo": "APROXIMACION 3 CIFRAS", "valor": "100000", "cantidad_balotas": 3},
+        {"titulo": "APROXIMACION 2 CIFRAS", "valor": "20000", "cantidad_balotas": 2},
+    ]
+    return premios
+
+
+def sembrar(engine, anios: int = 10, planes: int = 3, secos: int = 40, semilla: int = 0) -> dict:
+    aleatorio = random.Random(semilla)
+    migrar(engine)
+    t0 = time.perf_counter()
+    with Session(engine) as session:
+        catalogos = {}
+        for i in range(planes):
+            plan = models.PlanPremios(nombre=f"Plan {i + 1}", descripcion="Generado para benchmarks")
+            session.add(plan)
+            session.flush()
+            premios = session.scalars(
+                insert(models.Premio).returning(models.Premio),
+                [dict(p, plan_id=plan.id) for p in _catalogo(secos)],
+            ).all()
+            catalogos[plan.id] = [(p.id, p.cantidad_balotas) for p in premios]
+
+        # Un sorteo por semana; cada plan rige un tramo consecutivo del histórico
+        total_sorteos = anios * 52
+        inicio = date.today() - timedelta(weeks=total_sorteos)
+        plan_ids = list(catalogos)
+        filas_sorteo = [
+            {
+                "numero_sorteo": str(4000 + i),
+                "fecha": inicio + timedelta(weeks=i),
+                "plan_id": plan_ids[i * len(plan_ids) // total_sorteos],
+            }
+            for i in range(total_sorteos)
+        ]
+        sorteos = session.execute(
+            insert(models.Sorteo).returning(models.Sorteo.id, models.Sorteo.plan_id), filas_sorteo
+        ).all()
+
+        filas = []
+        for sorteo_id, plan_id in sorteos:
+            for premio_id, cifras in catalogos[plan_id]:
+                numero = "".join(aleatorio.choice("0123456789") for _ in range(cifras))
+                filas.append({"sorteo_id": sorteo_id, "premio_id": premio_id, "numeros_ganadores": numero})
+        for i in range(0, len(filas), LOTE_INSERCION):
+            session.execute(insert(models.Resultado), filas[i:i + LOTE_INSERCION])
+
+        # Resúmenes públicos, igual que los mantendrían los handlers de mutación
+        todos = session.exec(select(models.Sorteo).order_by(models.Sorteo.id)).all()
+        for i in range(0, len(todos), 500):
+            crud_resumen.reconstruir(session, todos[i:i + 500])
+        session.commit()
+
+    return {
+        "planes": planes,
+        "premios": sum(len(c) for c in catalogos.values()),
+        "sorteos": total_sorteos,
+        "resultados": len(filas),
+        "segundos": round(time.perf_counter() - t0, 2),
+    }
+
+
+def main():
+    from app.core.database import engine
+
+    parser = argparse.ArgumentParser(description="Siembra la base con datos sintéticos")
+    parser.add_argument("--anios", type=int, default=10)
+    parser.add_argument("--planes", type=int, default=3)
+    parser.add_argument("--secos", type=int, default=40)
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args()
+    print(sembrar(engine, args.anios, args.planes, args.secos, args.semilla))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import os
+
+# Antes de importar la app: el motor se crea al importar app.core.database
+os.environ["DATABASE_URL"] = "sqlite://"
+os.environ["DB_MIGRAR_AL_INICIAR"] = "1"
+os.environ.pop("DATABASE_READ_URL", None)
+os.environ.pop("SNAPSHOT_DIR", None)
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import SQLModel
+
+from app.core.cache import CACHES
+from app.core.database import engine
+from app.core.esquema import TABLA_VERSION
+from app.main import app
+
+
+@pytest.fixture
+def client():
+    # Base SQLite en memoria (una sola conexión, ver _opciones_pool); el lifespan la migra
+    with TestClient(app) as c:
+        yield c
+    with engine.begin() as conexion:
+        for tabla in reversed(SQLModel.metadata.sorted_tables):
+            if tabla.name != TABLA_VERSION:
+                conexion.execute(tabla.delete())
+    for cache in CACHES.values():
+        cache.limpiar()
+
+
+@pytest.fixture
+def contar_sentencias():
+    # Devuelve una función que ejecuta `accion` y cuenta las sentencias SQL que emitió
+    def contar(accion):
+        sentencias = []
+
+        def registrar(conn, cursor, statement, parameters, context, executemany):
+            sentencias.append(statement)
+
+        event.listen(engine, "before_cursor_execute", registrar)
+        try:
+            resultado = accion()
+        finally:
+            event.remove(engine, "before_cursor_execute", registrar)
+        return resultado, len(sentencias)
+
+    return contar
+
+
+def crear_plan(client, nombre: str, premios=("MAYOR", "SECO", "Aprox")) -> dict:
+    cuerpo = {
+        "nombre": nombre,
+        "premios": [{"titulo": t, "valor": "1000", "cantidad_balotas": 4} for t in premios],
+    }
+    respuesta = client.post("/planes/", json=cuerpo)
+    assert respuesta.status_code == 200, respuesta.text
+    return respuesta.json()
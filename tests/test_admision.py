@@ -0,0 +1,18 @@
+from app.core import admision, config
+
+
+def test_rechazo_lleva_encabezados_cors(client, monkeypatch):
+    monkeypatch.setattr(config, "ADMISION_MAX_COLA_DB", 1)
+    monkeypatch.setattr(admision, "cola_pools", lambda: 5)
+
+    respuesta = client.get("/planes/", headers={"Origin": "https://frontend-loteria.vercel.app"})
+    assert respuesta.status_code == 503
+    assert respuesta.headers["retry-after"] == str(config.ADMISION_RETRY_AFTER_SECONDS)
+    assert respuesta.headers["access-control-allow-origin"] in ("*", "https://frontend-loteria.vercel.app")
+    assert "retry-after" in respuesta.headers["access-control-expose-headers"].lower()
+
+
+def test_rutas_de_operacion_exentas(client, monkeypatch):
+    monkeypatch.setattr(config, "ADMISION_MAX_COLA_DB", 1)
+    monkeypatch.setattr(admision, "cola_pools", lambda: 5)
+    assert client.get("/sistema/carga").status_code == 200
@@ -0,0 +1,46 @@
+from app.core import cache
+from app.core.cache import CANAL_INVALIDACION, ORIGEN, cache_catalogos, cache_publico, invalidar_sorteos
+from app.core.difusion import CANAL_RECONEXION, hub
+
+
+def test_invalidacion_de_otro_worker_se_aplica():
+    cache_publico.guardar("100", "viejo", etiqueta=1)
+    cache_publico.guardar("200", "vigente", etiqueta=2)
+    generacion = cache_publico.generacion
+
+    hub._entregar(CANAL_INVALIDACION, {"origen": "otro-worker", "accion": "sorteos", "claves": ["100"]})
+    assert cache_publico.obtener("100") is None
+    assert cache_publico.obtener("200") == "vigente"
+    # Una carga que empezó antes de la invalidación ya no puede guardar su resultado
+    assert cache_publico.generacion != generacion
+
+    hub._entregar(CANAL_INVALIDACION, {"origen": "otro-worker", "accion": "planes", "claves": [2]})
+    assert cache_publico.obtener("200") is None
+
+
+def test_invalidacion_propia_se_difunde_una_vez(monkeypatch):
+    difundidos = []
+    monkeypatch.setattr(hub.backend, "publicar", lambda canal, lote: difundidos.append((canal, lote)))
+    cache_publico.guardar("100", "viejo")
+
+    invalidar_sorteos("100")
+    assert cache_publico.obtener("100") is None
+    assert difundidos == [(CANAL_INVALIDACION, [{"origen": ORIGEN, "accion": "sorteos", "claves": ["100"]}])]
+
+
+def test_demasiadas_claves_vacian_la_cache(monkeypatch):
+    difundidos = []
+    monkeypatch.setattr(hub.backend, "publicar", lambda canal, lote: difundidos.extend(lote))
+    cache_catalogos.guardar(1, "premios")
+
+    cache.invalidar_catalogo(*range(2, cache.MAX_CLAVES_MENSAJE + 3))
+    assert cache_catalogos.obtener(1) is None
+    assert difundidos == [{"origen": ORIGEN, "accion": "catalogos:todo", "claves": []}]
+
+
+def test_reconexion_del_backend_vacia_las_caches():
+    cache_publico.guardar("100", "quizás viejo")
+    cache_catalogos.guardar(1, "premios")
+    hub._entregar(CANAL_RECONEXION, {})
+    assert cache_publico.obtener("100") is None
+    assert cache_catalogos.obtener(1) is None
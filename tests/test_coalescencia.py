@@ -0,0 +1,64 @@
+import asyncio
+from datetime import date
+
+from app import schemas
+from app.api import routes_sorteos
+from app.core.cache import cache_publico
+from app.core.coalescencia import vuelos
+
+
+def _contenido(numero_ganador: str) -> str:
+    return schemas.SorteoPublicoRead(
+        numero_sorteo="100",
+        fecha=date(2024, 1, 1),
+        resultados=[{"id": 1, "premio_id": 1, "premio": "MAYOR", "valor": "1000", "numero_ganador": numero_ganador}],
+    ).model_dump_json()
+
+
+def test_carga_descartada_si_se_invalida_mientras_lee(monkeypatch):
+    lecturas = []
+
+    async def leer(funcion, numero_sorteo):
+        lecturas.append(numero_sorteo)
+        if len(lecturas) == 1:
+            # La escritura se confirma mientras esta lectura vuelve con el dato anterior
+            cache_publico.invalidar(numero_sorteo)
+            return _contenido("1111111"), date(2024, 1, 1), 1
+        return _contenido("2222222"), date(2024, 1, 1), 1
+
+    monkeypatch.setattr(routes_sorteos, "run_db_aislado", leer)
+    cache_publico.limpiar()
+    (_, publico, _), _ = asyncio.run(routes_sorteos._cargar_publico("100"))
+
+    assert len(lecturas) == 2
+    assert publico.resultados[0].numero_ganador == "2222222"
+    assert cache_publico.obtener("100")[1].resultados[0].numero_ganador == "2222222"
+    cache_publico.limpiar()
+
+
+def test_request_posterior_a_invalidacion_no_se_une_al_vuelo_anterior(monkeypatch):
+    liberar = None
+    lecturas = []
+
+    async def leer(funcion, numero_sorteo):
+        lecturas.append(numero_sorteo)
+        await liberar.wait()
+        return _contenido("1234567"), date(2024, 1, 1), 1
+
+    async def escenario():
+        nonlocal liberar
+        liberar = asyncio.Event()
+        ejecutadas = vuelos.ejecutadas
+        primero = asyncio.ensure_future(routes_sorteos._vuelo_publico("100"))
+        await asyncio.sleep(0)
+        cache_publico.invalidar("100")
+        segundo = asyncio.ensure_future(routes_sorteos._vuelo_publico("100"))
+        await asyncio.sleep(0)
+        liberar.set()
+        await asyncio.gather(primero, segundo)
+        return vuelos.ejecutadas - ejecutadas
+
+    monkeypatch.setattr(routes_sorteos, "run_db_aislado", leer)
+    cache_publico.limpiar()
+    assert asyncio.run(escenario()) == 2
+    cache_publico.limpiar()
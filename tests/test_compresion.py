@@ -0,0 +1,60 @@
+import asyncio
+import zlib
+
+from app.core.compresion import CompresionMiddleware, brotli
+from tests.conftest import crear_plan
+
+
+def test_304_lleva_el_mismo_etag_que_el_200(client):
+    for i in range(10):
+        crear_plan(client, f"Plan {i}")
+
+    comprimida = client.get("/planes/", headers={"Accept-Encoding": "gzip"})
+    assert comprimida.headers["content-encoding"] == "gzip"
+    etag = comprimida.headers["etag"]
+    assert etag.startswith('W/"')
+    no_modificada = client.get("/planes/", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert no_modificada.status_code == 304
+    assert no_modificada.headers["etag"] == etag
+
+    # Sin compresión el ETag sigue siendo fuerte en el 200 y en el 304
+    plana = client.get("/planes/", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plana.headers
+    assert plana.headers["etag"] == etag.removeprefix("W/")
+    no_modificada = client.get("/planes/", headers={"Accept-Encoding": "identity", "If-None-Match": plana.headers["etag"]})
+    assert no_modificada.status_code == 304
+    assert no_modificada.headers["etag"] == plana.headers["etag"]
+
+
+def _enviados_por(app, accept_encoding: str):
+    enviados = []
+
+    async def recibir():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def enviar(mensaje):
+        enviados.append(mensaje)
+
+    scope = {"type": "http", "headers": [(b"accept-encoding", accept_encoding.encode())]}
+    asyncio.run(CompresionMiddleware(app)(scope, recibir, enviar))
+    return [m["body"] for m in enviados if m["type"] == "http.response.body"]
+
+
+def test_streaming_envia_el_primer_bloque_sin_esperar_la_ventana():
+    bloques = [b'{"numero_sorteo":"1"}\n' * 10, b'{"numero_sorteo":"2"}\n' * 10]
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/x-ndjson")]})
+        for bloque in bloques:
+            await send({"type": "http.response.body", "body": bloque, "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    for codificacion in ("gzip", "br") if brotli is not None else ("gzip",):
+        cuerpos = _enviados_por(app, codificacion)
+        # El primer bloque comprimido ya se puede descomprimir por completo
+        if codificacion == "gzip":
+            assert zlib.decompressobj(31).decompress(cuerpos[0]) == bloques[0]
+            assert zlib.decompress(b"".join(cuerpos), 31) == b"".join(bloques)
+        else:
+            assert brotli.Decompressor().process(cuerpos[0]) == bloques[0]
+            assert brotli.decompress(b"".join(cuerpos)) == b"".join(bloques)
@@ -0,0 +1,46 @@
+import json
+
+from app.core import config
+from app.core.difusion import CANAL_RECONEXION, BackendPostgres
+
+
+def test_lote_en_pocos_notify_bajo_el_limite():
+    lote = [{"premio": f"SECO {i}", "numero_ganador": f"{i:07d}", "valor": "1000000"} for i in range(500)]
+    mensajes = BackendPostgres.mensajes("sorteo:100", lote)
+
+    assert 1 < len(mensajes) < len(lote) // 10
+    assert all(len(m.encode("utf-8")) <= BackendPostgres.MAX_BYTES_MENSAJE for m in mensajes)
+    recibidos = [json.loads(m) for m in mensajes]
+    assert {r["canal"] for r in recibidos} == {"sorteo:100"}
+    assert [datos for r in recibidos for datos in r["lote"]] == lote
+
+
+def test_listener_reintenta_y_avisa_la_reconexion(monkeypatch):
+    monkeypatch.setattr(BackendPostgres, "ESPERA_INICIAL", 0.001)
+    monkeypatch.setattr(config, "DIFUSION_REINTENTO_MAX_SECONDS", 0.004)
+    backend = BackendPostgres(engine=None)
+    entregados, intentos = [], []
+
+    class Conexion:
+        def close(self):
+            pass
+
+    def conectar():
+        intentos.append(1)
+        if len(intentos) in (1, 2):
+            raise OSError("sin conexión")
+        return Conexion()
+
+    def recibir(conexion):
+        # La primera conexión se corta; en la segunda se detiene el listener
+        if len(intentos) == 3:
+            raise OSError("conexión perdida")
+        backend._detener.set()
+
+    backend.entregar = lambda canal, datos: entregados.append(canal)
+    backend._conectar = conectar
+    backend._recibir = recibir
+    backend._escuchar()
+
+    assert len(intentos) == 4
+    assert entregados == [CANAL_RECONEXION]
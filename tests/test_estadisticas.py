@@ -0,0 +1,56 @@
+from sqlmodel import Session, delete, select
+
+from app import models
+from app.core.database import engine
+from app.core.estadisticas import MotorEstadisticas
+from tests.conftest import crear_plan
+
+
+def _sorteo(client, plan_id: int, numero: str, fecha: str, resultados: dict) -> dict:
+    sorteo = client.post("/sorteos/", json={"numero_sorteo": numero, "fecha": fecha, "plan_id": plan_id}).json()
+    filas = [{"premio_titulo": titulo, "numeros_ganadores": numero} for titulo, numero in resultados.items()]
+    respuesta = client.post(f"/sorteos/{sorteo['id']}/resultados:bulk", json={"resultados": filas})
+    assert respuesta.status_code == 200, respuesta.text
+    return sorteo
+
+
+def _motor() -> MotorEstadisticas:
+    motor = MotorEstadisticas()
+    with Session(engine) as session:
+        motor.refrescar(session)
+    return motor
+
+
+def test_repeticion_consecutiva_por_premio(client):
+    plan = crear_plan(client, "A", premios=["MAYOR", "SECO"])
+    # MAYOR repite su terminación en cada sorteo; SECO nunca
+    _sorteo(client, plan["id"], "1", "2024-01-01", {"MAYOR": "1234511", "SECO": "0033"})
+    _sorteo(client, plan["id"], "2", "2024-01-08", {"MAYOR": "7654311", "SECO": "0044"})
+    _sorteo(client, plan["id"], "3", "2024-01-15", {"MAYOR": "0000011", "SECO": "0055"})
+
+    motor = _motor()
+    assert motor.calcular(premio="MAYOR")["tasa_repeticion_consecutiva"] == 1.0
+    assert motor.calcular(premio="SECO")["tasa_repeticion_consecutiva"] == 0.0
+    # Sin filtro: 2 de las 4 transiciones (premio, sorteo) repiten
+    assert motor.calcular()["tasa_repeticion_consecutiva"] == 0.5
+
+
+def test_carga_incremental_ve_ids_confirmados_fuera_de_orden(client):
+    plan = crear_plan(client, "A", premios=["MAYOR"])
+    for i in range(3):
+        _sorteo(client, plan["id"], str(i), f"2024-01-0{i + 1}", {"MAYOR": f"000000{i}"})
+    with Session(engine) as session:
+        tardio = session.exec(select(models.Resultado).order_by(models.Resultado.id)).all()[1].model_dump()
+        session.exec(delete(models.Resultado).where(models.Resultado.id == tardio["id"]))
+        session.commit()
+
+    motor = _motor()
+    assert motor.calcular()["resultados"] == 2
+
+    # Un id menor que el último cargado que se confirma después
+    with Session(engine) as session:
+        session.add(models.Resultado(**tardio))
+        session.commit()
+        motor.marcar_nuevos()
+        motor.refrescar(session)
+    assert motor.calcular()["resultados"] == 3
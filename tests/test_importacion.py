@@ -0,0 +1,85 @@
+import json
+
+from app.core import config
+from app.core.importacion import COLUMNAS_CSV
+from app.crud import crud_plan
+
+
+def _csv(filas) -> bytes:
+    lineas = [",".join(COLUMNAS_CSV)] + [",".join(fila) for fila in filas]
+    return ("\n".join(lineas) + "\n").encode("utf-8")
+
+
+def _importar(client, contenido: bytes, tipo: str):
+    return client.post("/planes/import", content=contenido, headers={"Content-Type": tipo})
+
+
+def test_importa_json_con_clave_planes(client):
+    cuerpo = {"planes": [
+        {"nombre": "A", "premios": [{"titulo": "MAYOR", "valor": "1000", "cantidad_balotas": 7}]},
+        {"nombre": "B", "descripcion": "Sin premios", "premios": []},
+    ]}
+    respuesta = _importar(client, json.dumps(cuerpo).encode(), "application/json")
+    assert respuesta.status_code == 200, respuesta.text
+    assert respuesta.json()["planes"] == 2
+    assert respuesta.json()["premios"] == 1
+
+    planes = client.get("/planes/").json()
+    assert [(p["nombre"], len(p["premios"])) for p in planes] == [("A", 1), ("B", 0)]
+
+
+def test_csv_con_una_fila_mala_no_inserta_nada(client):
+    contenido = _csv([
+        ("A", "", "MAYOR", "1000", "7"),
+        ("A", "", "SECO", "10", "cuatro"),
+        ("B", "", "MAYOR", "500", "7"),
+    ])
+    respuesta = _importar(client, contenido, "text/csv")
+
+    assert respuesta.status_code == 400
+    # La fila 1 es el encabezado: la mala es la 3
+    assert respuesta.json()["detail"]["errores"] == [{"fila": 3, "error": "cantidad_balotas inválida: 'cuatro'"}]
+    assert client.get("/planes/").json() == []
+
+
+def test_json_con_un_plan_malo_no_inserta_nada(client):
+    planes = [
+        {"nombre": "A", "premios": [{"titulo": "MAYOR", "valor": "1000", "cantidad_balotas": 7}]},
+        {"nombre": "B", "premios": [
+            {"titulo": "SECO", "valor": "10", "cantidad_balotas": 4},
+            {"titulo": "SECO", "valor": "20", "cantidad_balotas": 4},
+        ]},
+        {"nombre": "C", "premios": []},
+    ]
+    respuesta = _importar(client, json.dumps(planes).encode(), "application/json")
+
+    assert respuesta.status_code == 400
+    errores = respuesta.json()["detail"]["errores"]
+    assert [(e["indice"], e["plan"]) for e in errores] == [(1, "B")]
+    assert client.get("/planes/").json() == []
+
+    # Un error de validación apunta a la posición dentro del archivo
+    planes[1] = {"nombre": "B", "premios": [{"titulo": "SECO", "valor": "10"}]}
+    respuesta = _importar(client, json.dumps({"planes": planes}).encode(), "application/json")
+    assert respuesta.status_code == 400
+    assert respuesta.json()["detail"]["errores"][0]["ubicacion"] == [1, "premios", 0, "cantidad_balotas"]
+    assert client.get("/planes/").json() == []
+
+
+def test_fallo_al_insertar_revierte_todo(client, monkeypatch):
+    # Si la base falla a mitad de los lotes, tampoco quedan los lotes ya insertados
+    monkeypatch.setattr(config, "IMPORTACION_TAMANO_LOTE", 1)
+    crear = crud_plan.crear
+    llamadas = []
+
+    def crear_que_falla(session, planes):
+        llamadas.append(1)
+        if len(llamadas) == 2:
+            raise RuntimeError("falla simulada")
+        return crear(session, planes)
+
+    monkeypatch.setattr(crud_plan, "crear", crear_que_falla)
+    planes = [{"nombre": n, "premios": []} for n in ("A", "B", "C")]
+    respuesta = _importar(client, json.dumps(planes).encode(), "application/json")
+    assert respuesta.status_code == 500
+    assert client.get("/planes/").json() == []
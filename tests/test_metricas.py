@@ -0,0 +1,23 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.core.database import engine
+from app.core.metricas import EstadoRequest, _estado_request
+
+
+def test_sentencia_fallida_no_deja_estado_en_la_conexion():
+    estado = EstadoRequest(guardar_sentencias=False)
+    token = _estado_request.set(estado)
+    try:
+        with engine.connect() as conexion:
+            for _ in range(3):
+                with pytest.raises(OperationalError):
+                    conexion.execute(text("SELECT * FROM tabla_que_no_existe"))
+                conexion.rollback()
+            conexion.execute(text("SELECT 1"))
+            assert "inicio_consulta" not in conexion.info
+    finally:
+        _estado_request.reset(token)
+    # Solo la sentencia exitosa se mide
+    assert estado.consultas == 1
@@ -0,0 +1,102 @@
+from app.core import config
+from app.core.paginacion import ENCABEZADO_CURSOR, codificar_cursor
+from tests.conftest import crear_plan
+
+
+def test_listar_planes_sentencias_constantes(client, contar_sentencias):
+    # Los premios se cargan con una sola consulta IN para toda la página, no una por plan
+    crear_plan(client, "Plan 0")
+    respuesta, con_uno = contar_sentencias(lambda: client.get("/planes/"))
+    assert respuesta.status_code == 200
+    assert len(respuesta.json()) == 1
+
+    for i in range(1, 25):
+        crear_plan(client, f"Plan {i}")
+    respuesta, con_muchos = contar_sentencias(lambda: client.get("/planes/"))
+    assert respuesta.status_code == 200
+    assert len(respuesta.json()) == 25
+    assert all(len(plan["premios"]) == 3 for plan in respuesta.json())
+
+    assert con_muchos == con_uno
+
+
+def test_obtener_plan_sentencias_constantes(client, contar_sentencias):
+    chico = crear_plan(client, "Chico", premios=["MAYOR"])
+    grande = crear_plan(client, "Grande", premios=[f"SECO {i}" for i in range(40)])
+
+    _, con_chico = contar_sentencias(lambda: client.get(f"/planes/{chico['id']}"))
+    respuesta, con_grande = contar_sentencias(lambda: client.get(f"/planes/{grande['id']}"))
+    assert len(respuesta.json()["premios"]) == 40
+    assert con_grande == con_chico
+
+
+def test_premios_en_orden_de_creacion(client):
+    # Con el índice único (plan_id, titulo) SQLite los devolvería en orden alfabético
+    titulos = ["SECO", "MAYOR", "Aprox", "ANTICIPADO"]
+    plan = crear_plan(client, "Orden", premios=titulos)
+
+    assert [p["titulo"] for p in client.get(f"/planes/{plan['id']}").json()["premios"]] == titulos
+    assert [p["titulo"] for p in client.get("/planes/").json()[0]["premios"]] == titulos
+
+
+def test_ruta_rapida_igual_a_la_por_defecto(client, monkeypatch):
+    # JSON_RAPIDO solo cambia cómo se serializa: el cuerpo debe ser idéntico byte a byte
+    crear_plan(client, "Añejo", premios=["SECO", "MAYOR", "Aprox"])
+    crear_plan(client, "Sin premios", premios=[])
+    consultas = [
+        "/planes/", "/planes/?limit=1", "/planes/?premios=false", "/planes/?campos=id,premios", "/planes/?compacto=true",
+    ]
+
+    monkeypatch.setattr(config, "JSON_RAPIDO", False)
+    por_defecto = [client.get(url) for url in consultas]
+    monkeypatch.setattr(config, "JSON_RAPIDO", True)
+    rapidas = [client.get(url) for url in consultas]
+
+    for url, defecto, rapida in zip(consultas, por_defecto, rapidas):
+        assert rapida.content == defecto.content, url
+        assert rapida.headers.get("x-next-cursor") == defecto.headers.get("x-next-cursor"), url
+
+
+def test_listado_304_y_etag_que_cambia_con_mutaciones(client):
+    crear_plan(client, "A")
+    primera = client.get("/planes/")
+    etag = primera.headers["etag"]
+
+    no_modificada = client.get("/planes/", headers={"If-None-Match": etag})
+    assert no_modificada.status_code == 304
+    assert no_modificada.content == b""
+    assert no_modificada.headers["etag"] == etag
+    assert no_modificada.headers["cache-control"] == primera.headers["cache-control"]
+
+    # Los parámetros forman parte del ETag: otra página u otra proyección no valida con este
+    assert client.get("/planes/?premios=false", headers={"If-None-Match": etag}).status_code == 200
+
+    # Cualquier mutación del catálogo (plan o premio) cambia el ETag
+    plan = crear_plan(client, "B")
+    despues_de_crear = client.get("/planes/", headers={"If-None-Match": etag})
+    assert despues_de_crear.status_code == 200
+    assert despues_de_crear.headers["etag"] != etag
+
+    etag = despues_de_crear.headers["etag"]
+    client.post(f"/planes/{plan['id']}/premios", json={"titulo": "NUEVO", "valor": "5", "cantidad_balotas": 4})
+    assert client.get("/planes/", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_paginacion_por_id(client, monkeypatch):
+    ids = [crear_plan(client, f"Plan {i}", premios=["MAYOR"])["id"] for i in range(5)]
+    for rapido in (False, True):
+        monkeypatch.setattr(config, "JSON_RAPIDO", rapido)
+        vistos, cursor = [], None
+        while True:
+            respuesta = client.get("/planes/", params={"limit": 2, **({"cursor": cursor} if cursor else {})})
+            assert respuesta.status_code == 200, respuesta.text
+            pagina = respuesta.json()
+            assert len(pagina) <= 2 and all(p["premios"] for p in pagina)
+            vistos += [p["id"] for p in pagina]
+            cursor = respuesta.headers.get(ENCABEZADO_CURSOR)
+            if not cursor:
+                break
+        assert vistos == sorted(ids)
+
+    # El cursor de /planes/ es solo el id: uno de /sorteos/ (fecha, id) se rechaza
+    assert client.get("/planes/", params={"cursor": codificar_cursor("2024-01-01", 1)}).status_code == 400
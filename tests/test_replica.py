@@ -0,0 +1,62 @@
+import pytest
+from sqlmodel import create_engine
+
+from app import models
+from app.core import config, database
+from app.core.database import COOKIE_ESCRITURA, SesionLectura, engine
+from app.core.esquema import migrar
+from tests.conftest import crear_plan
+
+
+@pytest.fixture
+def replica(monkeypatch, tmp_path):
+    # Segunda base SQLite como DATABASE_READ_URL; nunca recibe lo escrito en la principal,
+    # así que una lectura que la usa se distingue porque no ve los datos
+    motor = create_engine(f"sqlite:///{tmp_path / 'replica.db'}", connect_args={"check_same_thread": False})
+    migrar(motor)
+    monkeypatch.setattr(database, "read_engine", motor)
+    monkeypatch.setattr(config, "DB_LECTURA_PRIMARIO_SECONDS", 5)
+    yield motor
+    motor.dispose()
+
+
+def _ventana_del_worker_vencida(monkeypatch):
+    monkeypatch.setattr(database, "_ultima_escritura", float("-inf"))
+
+
+def test_lectura_tras_escritura_va_al_primario(client, replica, monkeypatch):
+    respuesta = client.post("/planes/", json={"nombre": "A", "premios": []})
+    assert COOKIE_ESCRITURA in respuesta.cookies
+
+    # Dentro de la ventana del worker, aun sin la cookie
+    client.cookies.clear()
+    assert [p["nombre"] for p in client.get("/planes/").json()] == ["A"]
+
+    # Vencida la ventana del worker, la cookie del cliente que escribió sigue mandando al primario
+    _ventana_del_worker_vencida(monkeypatch)
+    client.cookies.set(COOKIE_ESCRITURA, "1")
+    assert [p["nombre"] for p in client.get("/planes/").json()] == ["A"]
+
+    # Sin cookie ni ventana, la lectura va a la réplica (que aquí no tiene el plan)
+    client.cookies.clear()
+    assert client.get("/planes/").json() == []
+
+
+def test_sin_replica_no_hay_cookie(client):
+    assert COOKIE_ESCRITURA not in client.post("/planes/", json={"nombre": "A", "premios": []}).cookies
+    assert database.motor_lectura() is engine
+
+
+def test_sesion_de_lectura_rechaza_escrituras(client):
+    plan = crear_plan(client, "A")
+    with SesionLectura(engine) as session:
+        session.add(models.PlanPremios(nombre="B"))
+        with pytest.raises(RuntimeError, match="solo lectura"):
+            session.flush()
+
+    with SesionLectura(engine) as session:
+        existente = session.get(models.PlanPremios, plan["id"])
+        existente.nombre = "Cambiado"
+        with pytest.raises(RuntimeError):
+            session.commit()
+    assert client.get(f"/planes/{plan['id']}").json()["nombre"] == "A"
@@ -0,0 +1,56 @@
+import json
+
+from sqlmodel import Session
+
+from app.core import config
+from app.core import snapshots
+from app.core.database import engine
+from app.core.snapshots import MANIFIESTO, publicar
+from tests.conftest import crear_plan
+
+
+def _publicar(**kwargs) -> dict:
+    with Session(engine) as session:
+        return publicar(session, **kwargs)
+
+
+def test_retira_archivos_sin_resumen_aunque_no_esten_en_el_manifiesto(client, monkeypatch, tmp_path):
+    monkeypatch.setattr(config, "SNAPSHOT_DIR", str(tmp_path))
+    plan = crear_plan(client, "A")
+    client.post("/sorteos/", json={"numero_sorteo": "100", "fecha": "2024-01-01", "plan_id": plan["id"]})
+    _publicar()
+    assert (tmp_path / "sorteos" / "100" / "publico.json").exists()
+
+    # Un archivo que quedó de una corrida anterior y que el manifiesto ya no recuerda
+    huerfano = tmp_path / "sorteos" / "999" / "publico.json"
+    huerfano.parent.mkdir(parents=True)
+    huerfano.write_text("{}")
+    (huerfano.parent / "publico.json.gz").write_bytes(b"")
+    (tmp_path / MANIFIESTO).unlink()
+
+    conteo = _publicar()
+    assert conteo["retirados"] == 1
+    assert not huerfano.parent.exists()
+    assert (tmp_path / "sorteos" / "100" / "publico.json").exists()
+    indice = json.loads((tmp_path / "sorteos" / "index.json").read_text())
+    assert [s["numero_sorteo"] for s in indice["sorteos"]] == ["100"]
+
+
+def test_no_deja_temporales(client, monkeypatch, tmp_path):
+    monkeypatch.setattr(config, "SNAPSHOT_DIR", str(tmp_path))
+    plan = crear_plan(client, "A")
+    client.post("/sorteos/", json={"numero_sorteo": "100", "fecha": "2024-01-01", "plan_id": plan["id"]})
+    _publicar(forzar=True)
+    _publicar(forzar=True)
+    assert not list(tmp_path.rglob("*.tmp"))
+    assert (tmp_path / "sorteos" / "100" / "publico.json").stat().st_mode & 0o777 == 0o644
+
+
+def test_sin_fcntl_publica_con_bloqueo_local(client, monkeypatch, tmp_path):
+    # En plataformas sin fcntl (Windows) el módulo se importa igual y publica
+    monkeypatch.setattr(snapshots, "fcntl", None)
+    monkeypatch.setattr(config, "SNAPSHOT_DIR", str(tmp_path))
+    plan = crear_plan(client, "A")
+    client.post("/sorteos/", json={"numero_sorteo": "100", "fecha": "2024-01-01", "plan_id": plan["id"]})
+    assert _publicar()["escritos"] == 1
+    assert not (tmp_path / ".publicador.lock").exists()
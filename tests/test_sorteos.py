@@ -0,0 +1,183 @@
+from sqlmodel import Session, select
+
+from app import models
+from app.api import routes_sorteos
+from app.core.database import engine
+from app.core.paginacion import ENCABEZADO_CURSOR, LIMITE_MAXIMO
+from tests.conftest import crear_plan
+
+
+def test_verificar_reusa_el_resumen_cacheado(client, contar_sentencias):
+    plan = crear_plan(client, "A", premios=["MAYOR"])
+    sorteo = client.post("/sorteos/", json={"numero_sorteo": "100", "fecha": "2024-01-01", "plan_id": plan["id"]}).json()
+    client.post(f"/sorteos/{sorteo['id']}/resultados:bulk", json={
+        "resultados": [{"premio_titulo": "MAYOR", "numeros_ganadores": "1234567"}]
+    })
+    assert client.get("/sorteos/100/publico").status_code == 200
+
+    # El índice de ganadores se arma con el resumen que ya está en cache_publico, sin ir a la BD
+    respuesta, sentencias = contar_sentencias(lambda: client.get("/sorteos/100/verificar", params={"numero": "1234567"}))
+    assert respuesta.status_code == 200, respuesta.text
+    assert sentencias == 0
+
+
+def _sorteo_con_plan(client, numero="100", fecha="2024-01-01", premios=("MAYOR", "SECO")):
+    plan = crear_plan(client, f"Plan {numero}", premios=premios)
+    sorteo = client.post("/sorteos/", json={"numero_sorteo": numero, "fecha": fecha, "plan_id": plan["id"]})
+    assert sorteo.status_code == 200, sorteo.text
+    return plan, sorteo.json()
+
+
+def test_lote_vacio_se_rechaza_sin_tocar_nada(client, monkeypatch):
+    _, sorteo = _sorteo_con_plan(client)
+    publicado = []
+    monkeypatch.setattr(routes_sorteos.hub, "publicar_lote", lambda *args: publicado.append(args))
+    etag = client.get("/sorteos/").headers["etag"]
+
+    respuesta = client.post(f"/sorteos/{sorteo['id']}/resultados:bulk", json={"resultados": []})
+    assert respuesta.status_code == 400
+    assert publicado == []
+    assert client.get("/sorteos/").headers["etag"] == etag
+
+
+def test_lote_con_un_error_se_rechaza_completo(client):
+    _, sorteo = _sorteo_con_plan(client)
+    lote = {"resultados": [
+        {"premio_titulo": "MAYOR", "numeros_ganadores": "1234567"},
+        {"premio_titulo": "NO EXISTE", "numeros_ganadores": "1234"},
+        {"premio_titulo": "SECO", "numeros_ganadores": "12"},
+    ]}
+    respuesta = client.post(f"/sorteos/{sorteo['id']}/resultados:bulk", json=lote)
+
+    assert respuesta.status_code == 400
+    errores = respuesta.json()["detail"]["errores"]
+    assert [(e["indice"], e["premio_titulo"]) for e in errores] == [(1, "NO EXISTE"), (2, "SECO")]
+    # Nada del lote quedó guardado, tampoco el item válido
+    assert client.get("/sorteos/100/publico").json()["resultados"] == []
+
+
+def test_listado_304_y_etag_que_cambia_con_mutaciones(client):
+    plan, sorteo = _sorteo_con_plan(client)
+    primera = client.get("/sorteos/")
+    etag = primera.headers["etag"]
+
+    no_modificada = client.get("/sorteos/", headers={"If-None-Match": etag})
+    assert no_modificada.status_code == 304
+    assert no_modificada.content == b""
+    assert no_modificada.headers["etag"] == etag
+    assert client.get("/sorteos/?orden=desc", headers={"If-None-Match": etag}).status_code == 200
+
+    # Publicar resultados no cambia el listado de sorteos: el ETag se mantiene
+    client.post(f"/sorteos/{sorteo['id']}/resultados:bulk", json={
+        "resultados": [{"premio_titulo": "MAYOR", "numeros_ganadores": "1234567"}]
+    })
+    assert client.get("/sorteos/", headers={"If-None-Match": etag}).status_code == 304
+
+    # Crear o editar un sorteo sí
+    client.post("/sorteos/", json={"numero_sorteo": "101", "fecha": "2024-01-08", "plan_id": plan["id"]})
+    respuesta = client.get("/sorteos/", headers={"If-None-Match": etag})
+    assert respuesta.status_code == 200
+    assert [s["numero_sorteo"] for s in respuesta.json()] == ["100", "101"]
+
+    etag = respuesta.headers["etag"]
+    client.put(f"/sorteos/{sorteo['id']}", json={"fecha": "2024-01-02"})
+    assert client.get("/sorteos/", headers={"If-None-Match": etag}).status_code == 200
+
+
+def _filas(modelo, **filtros) -> list:
+    with Session(engine) as session:
+        statement = select(modelo)
+        for campo, valor in filtros.items():
+            statement = statement.where(getattr(modelo, campo).in_(valor))
+        return session.exec(statement).all()
+
+
+def test_purga_por_lotes_borra_solo_lo_anterior(client):
+    plan = crear_plan(client, "A", premios=["MAYOR"])
+    ids = {}
+    for dia in range(1, 8):
+        numero = f"S{dia}"
+        sorteo = client.post("/sorteos/", json={"numero_sorteo": numero, "fecha": f"2024-01-0{dia}", "plan_id": plan["id"]})
+        ids[numero] = sorteo.json()["id"]
+        client.post(f"/sorteos/{ids[numero]}/resultados:bulk", json={
+            "resultados": [{"premio_titulo": "MAYOR", "numeros_ganadores": f"000000{dia}"}]
+        })
+    viejos = [ids[f"S{dia}"] for dia in range(1, 6)]
+    nuevos = [ids["S6"], ids["S7"]]
+
+    # 5 sorteos anteriores con lotes de 2: tres transacciones
+    respuesta = client.delete("/sorteos/", params={"antes_de": "2024-01-06", "lote": 2})
+    assert respuesta.json() == {"ok": True, "eliminados": 5, "lotes": 3}
+
+    assert _filas(models.Sorteo, id=viejos) == []
+    assert _filas(models.Resultado, sorteo_id=viejos) == []
+    assert _filas(models.ResumenSorteo, sorteo_id=viejos) == []
+    assert len(_filas(models.Sorteo, id=nuevos)) == 2
+    assert len(_filas(models.Resultado, sorteo_id=nuevos)) == 2
+    assert len(_filas(models.ResumenSorteo, sorteo_id=nuevos)) == 2
+    assert client.get("/sorteos/S6/publico").json()["resultados"][0]["numero_ganador"] == "0000006"
+    assert client.get("/sorteos/S1/publico").status_code == 404
+
+
+def test_eliminar_sorteo_borra_resultados_y_resumen(client):
+    _, sorteo = _sorteo_con_plan(client)
+    client.post(f"/sorteos/{sorteo['id']}/resultados:bulk", json={
+        "resultados": [{"premio_titulo": "MAYOR", "numeros_ganadores": "1234567"}]
+    })
+    assert client.delete(f"/sorteos/{sorteo['id']}").status_code == 200
+    assert _filas(models.Resultado, sorteo_id=[sorteo["id"]]) == []
+    assert _filas(models.ResumenSorteo, sorteo_id=[sorteo["id"]]) == []
+    assert client.get("/sorteos/100/publico").status_code == 404
+
+
+def test_eliminar_plan(client):
+    con_sorteo, _ = _sorteo_con_plan(client)
+    assert client.delete(f"/planes/{con_sorteo['id']}").status_code == 400
+
+    libre = crear_plan(client, "Libre")
+    assert client.delete(f"/planes/{libre['id']}").status_code == 200
+    assert _filas(models.Premio, plan_id=[libre["id"]]) == []
+    assert client.get(f"/planes/{libre['id']}").status_code == 404
+    assert len(_filas(models.Premio, plan_id=[con_sorteo["id"]])) == 2
+
+
+def _paginar(client, ruta, **params):
+    paginas, cursor = [], None
+    while True:
+        respuesta = client.get(ruta, params={**params, **({"cursor": cursor} if cursor else {})})
+        assert respuesta.status_code == 200, respuesta.text
+        paginas.append(respuesta.json())
+        cursor = respuesta.headers.get(ENCABEZADO_CURSOR)
+        if not cursor:
+            return paginas
+
+
+def test_filtros_combinados_con_cursor(client):
+    plan_a = crear_plan(client, "A")
+    plan_b = crear_plan(client, "B")
+    # Fechas repetidas para que el desempate por id del cursor importe
+    for numero, fecha, plan in [
+        ("1", "2024-01-01", plan_a), ("2", "2024-01-05", plan_a), ("3", "2024-01-05", plan_b),
+        ("4", "2024-01-05", plan_a), ("5", "2024-01-10", plan_a), ("6", "2024-01-10", plan_b),
+        ("7", "2024-01-15", plan_a), ("8", "2024-01-20", plan_a),
+    ]:
+        client.post("/sorteos/", json={"numero_sorteo": numero, "fecha": fecha, "plan_id": plan["id"]})
+
+    filtros = {"desde": "2024-01-05", "hasta": "2024-01-15", "plan_id": plan_a["id"]}
+    for orden, esperado in [("asc", ["2", "4", "5", "7"]), ("desc", ["7", "5", "4", "2"])]:
+        paginas = _paginar(client, "/sorteos/", limit=1, orden=orden, **filtros)
+        assert [len(p) for p in paginas] == [1, 1, 1, 1]
+        assert [s["numero_sorteo"] for p in paginas for s in p] == esperado
+
+    # Sin cursor, una sola página con lo mismo
+    respuesta = client.get("/sorteos/", params=filtros)
+    assert ENCABEZADO_CURSOR not in respuesta.headers
+    assert [s["numero_sorteo"] for s in respuesta.json()] == ["2", "4", "5", "7"]
+
+
+def test_limite_fuera_de_rango(client):
+    assert client.get("/sorteos/", params={"limit": LIMITE_MAXIMO}).status_code == 200
+    for limite in (0, LIMITE_MAXIMO + 1):
+        assert client.get("/sorteos/", params={"limit": limite}).status_code == 422
+        assert client.get("/planes/", params={"limit": limite}).status_code == 422
+    assert client.get("/sorteos/", params={"cursor": "no-es-un-cursor"}).status_code == 400